@@ -0,0 +1,20 @@
+from app.core.model_config import BaseConfig
+
+
+class AnswersSettings(BaseConfig):
+    # Buffer answers in a Redis stream and let the job worker write them to Postgres.
+    ANSWERS_WRITE_BEHIND: bool = False
+    ANSWERS_STREAM: str = "answers"
+    ANSWERS_GROUP: str = "answer-flushers"
+    # Once this many answers wait in the stream, new ones are written directly.
+    ANSWERS_MAX_BUFFERED: int = 100_000
+    # Answers per multi-row insert (7 bind parameters a row, 32767 at most).
+    ANSWERS_FLUSH_BATCH: int = 1000
+    ANSWERS_FLUSH_BLOCK_MS: int = 200
+    # Answers read but not flushed for this long (a crashed flusher) are taken over.
+    ANSWERS_CLAIM_IDLE_MS: int = 30_000
+    # Marks a buffered (user, question) so a repeat is rejected before it is flushed.
+    ANSWERS_SEEN_TTL: int = 24 * 60 * 60
+
+
+answers_settings = AnswersSettings()
@@ -5,3 +5,12 @@ class AppConfig(BaseConfig):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     ORIGINS: list[str] = ["http://localhost:3000"]
+    WORKERS: int | None = None
+    BACKLOG: int = 2048
+    KEEP_ALIVE_TIMEOUT: int = 5
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    WARMUP_TIMEOUT: float = 10.0
+    HEALTH_PROBE_INTERVAL: float = 5.0
+    HEALTH_PROBE_TIMEOUT: float = 2.0
+    HEALTH_STALE_AFTER: float = 15.0
@@ -56,3 +56,8 @@ class UserAlreadyOwnerException(BaseServiceError):
         super().__init__(
             "This user is owner and cannot become an admin", status_code=400
         )
+
+
+class InvalidRoleActionError(BaseServiceError):
+    def __init__(self):
+        super().__init__("Action must be add or remove", status_code=400)
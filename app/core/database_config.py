@@ -6,6 +6,9 @@ class DBSettings(BaseConfig):
     POSTGRES_DB: str
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PREFILL: int = 2
 
     @property
     def url(self) -> str:
@@ -14,3 +17,8 @@ class DBSettings(BaseConfig):
             f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/"
             f"{self.POSTGRES_DB}"
         )
+
+    @property
+    def dsn(self) -> str:
+        """Plain libpq/asyncpg DSN, for connections made outside SQLAlchemy."""
+        return self.url.replace("postgresql+asyncpg://", "postgresql://", 1)
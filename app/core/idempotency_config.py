@@ -0,0 +1,13 @@
+from app.core.model_config import BaseConfig
+
+
+class IdempotencySettings(BaseConfig):
+    # How long a stored response can be replayed.
+    IDEMPOTENCY_TTL: int = 24 * 60 * 60
+    # How long a key stays locked by a request that never finishes (e.g. a crash).
+    IDEMPOTENCY_LOCK_TTL: int = 60
+    # How long a duplicate waits for the original to finish before getting 409.
+    IDEMPOTENCY_WAIT: float = 10.0
+
+
+idempotency_settings = IdempotencySettings()
@@ -0,0 +1,193 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+from urllib.parse import urlencode
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.routing import Match
+
+from app.core.idempotency_config import idempotency_settings
+from app.db.session import redis_client
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# POST routes that clients retry on timeouts.
+IDEMPOTENT_ROUTES = {
+    "/users/me/answer/{quiz_id}/{question_id}",
+    "/users/me/request",
+    "/companies/invite",
+    "/companies/quiz/{company_id}",
+}
+# Set per request by the outer middlewares, never replayed.
+_VOLATILE_HEADERS = {"content-length", "server-timing", "x-request-id"}
+_POLL_INTERVAL = 0.05
+# Client errors that a later retry can get past (timeout, conflict, rate limit).
+_TRANSIENT_STATUSES = {408, 409, 425, 429}
+
+
+class IdempotencyStore:
+    """One Redis key per (route, caller, Idempotency-Key).
+
+    The key holds ``pending`` while the first request runs, then its response.
+    """
+
+    def __init__(self, redis: Redis, prefix: str = "idempotency"):
+        self.redis = redis
+        self.prefix = prefix
+
+    def key(self, route: str, authorization: str, idempotency_key: str) -> str:
+        caller = hashlib.sha256(authorization.encode()).hexdigest()[:32]
+        return f"{self.prefix}:{route}:{caller}:{idempotency_key}"
+
+    async def acquire(self, key: str, fingerprint: str) -> bool:
+        value = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        return bool(
+            await self.redis.set(
+                key, value, nx=True, ex=idempotency_settings.IDEMPOTENCY_LOCK_TTL
+            )
+        )
+
+    async def get(self, key: str) -> dict | None:
+        value = await self.redis.get(key)
+        return json.loads(value) if value else None
+
+    async def complete(self, key: str, fingerprint: str, response: Response):
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in _VOLATILE_HEADERS
+        }
+        value = {
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(response.body).decode(),
+        }
+        await self.redis.set(
+            key, json.dumps(value), ex=idempotency_settings.IDEMPOTENCY_TTL
+        )
+
+    async def release(self, key: str):
+        await self.redis.delete(key)
+
+
+idempotency_store = IdempotencyStore(redis_client)
+
+
+def _route_path(request: Request) -> str | None:
+    for route in request.app.router.routes:
+        if getattr(route, "path", None) in IDEMPOTENT_ROUTES:
+            match, _ = route.matches(request.scope)
+            if match == Match.FULL:
+                return route.path
+    return None
+
+
+def _replay(stored: dict) -> Response:
+    response = Response(
+        content=base64.b64decode(stored["body"]), status_code=stored["status"]
+    )
+    response.headers.update(stored["headers"])
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _fingerprint(request: Request, body: bytes) -> str:
+    """Hash of what makes two requests the same: path, query and body."""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    target = f"{request.url.path}?{query}".encode()
+    return hashlib.sha256(target + b"\n" + body).hexdigest()
+
+
+def _conflict(detail: str, status_code: int) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"detail": detail})
+
+
+async def _finish(key: str, fingerprint: str, response: Response | None):
+    try:
+        # Server errors and transient client errors are not final: let the
+        # client's retry run the request again.
+        if (
+            response is None
+            or response.status_code >= 500
+            or response.status_code in _TRANSIENT_STATUSES
+        ):
+            await idempotency_store.release(key)
+        else:
+            await idempotency_store.complete(key, fingerprint, response)
+    except RedisError as exc:
+        logger.warning(f"Could not store idempotent response: {exc!r}")
+
+
+async def _run_and_store(
+    request: Request, call_next, key: str, fingerprint: str
+) -> Response:
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    except BaseException:
+        await _finish(key, fingerprint, None)
+        raise
+    response = Response(
+        content=body,
+        status_code=response.status_code,
+        headers={
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        },
+    )
+    await _finish(key, fingerprint, response)
+    return response
+
+
+async def idempotency_middleware(request: Request, call_next):
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+    if request.method != "POST" or not idempotency_key:
+        return await call_next(request)
+    route = _route_path(request)
+    if route is None:
+        return await call_next(request)
+    if len(idempotency_key) > 255:
+        return _conflict("Idempotency-Key is too long", 400)
+
+    body = await request.body()
+    fingerprint = _fingerprint(request, body)
+    key = idempotency_store.key(
+        route, request.headers.get("authorization", ""), idempotency_key
+    )
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + idempotency_settings.IDEMPOTENCY_WAIT
+    try:
+        while True:
+            if await idempotency_store.acquire(key, fingerprint):
+                break
+            stored = await idempotency_store.get(key)
+            if stored is None:
+                # The first request failed and released the key; run this one.
+                continue
+            if stored["fingerprint"] != fingerprint:
+                return _conflict(
+                    "Idempotency-Key was already used with a different request", 422
+                )
+            if stored["state"] == "done":
+                return _replay(stored)
+            if loop.time() >= deadline:
+                return _conflict(
+                    "A request with this Idempotency-Key is still in progress", 409
+                )
+            await asyncio.sleep(_POLL_INTERVAL)
+    except RedisError as exc:
+        logger.warning(f"Idempotency store unavailable, running request: {exc!r}")
+        return await call_next(request)
+
+    return await _run_and_store(request, call_next, key, fingerprint)
@@ -0,0 +1,13 @@
+from app.core.model_config import BaseConfig
+
+
+class ImportSettings(BaseConfig):
+    # Valid rows buffered before each COPY into Postgres.
+    IMPORT_CHUNK_SIZE: int = 5000
+    # Row errors listed in an import report; any beyond this are only counted.
+    IMPORT_MAX_ERRORS: int = 100
+    # A longer line is reported as a row error instead of being buffered.
+    IMPORT_MAX_LINE_BYTES: int = 64 * 1024
+
+
+import_settings = ImportSettings()
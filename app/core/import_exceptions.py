@@ -0,0 +1,9 @@
+from app.core.base_exception import BaseServiceError
+
+
+class UnsupportedImportFormatError(BaseServiceError):
+    def __init__(self, content_type: str):
+        super().__init__(
+            f"Cannot import '{content_type}'; send application/x-ndjson or text/csv.",
+            status_code=415,
+        )
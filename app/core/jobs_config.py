@@ -0,0 +1,22 @@
+from app.core.model_config import BaseConfig
+
+
+class JobsSettings(BaseConfig):
+    JOBS_STREAM: str = "jobs"
+    JOBS_GROUP: str = "workers"
+    JOBS_CONCURRENCY: int = 8
+    JOBS_MAX_ATTEMPTS: int = 5
+    JOBS_TIMEOUT: float = 60.0
+    # Retry n waits about JOBS_BACKOFF_BASE * 2**n seconds, capped at JOBS_BACKOFF_MAX.
+    JOBS_BACKOFF_BASE: float = 1.0
+    JOBS_BACKOFF_MAX: float = 300.0
+    # A delivered job not acknowledged for this long is handed to another worker.
+    JOBS_CLAIM_IDLE_MS: int = 300_000
+    JOBS_METRICS_PORT: int = 9100
+    # Deleted companies are purged PURGE_CHUNK_SIZE rows per transaction, and one
+    # job run stops after PURGE_CHUNKS_PER_JOB chunks and enqueues the rest.
+    PURGE_CHUNK_SIZE: int = 1000
+    PURGE_CHUNKS_PER_JOB: int = 50
+
+
+jobs_settings = JobsSettings()
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import CONCURRENCY_LIMIT, SHED_REQUESTS
+from app.core.rate_limit_config import rate_limit_settings
+from app.db.instrumentation import MovingAverage, pool_wait
+
+# Probes and scrapes must keep working while the app sheds load.
+EXEMPT_PREFIXES = ("/health", "/metrics")
+
+
+@dataclass
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests driven by DB pool checkout wait.
+
+    Every finished request grows the limit by about one per window while the
+    pool wait stays under ``wait_threshold`` and shrinks it by 10% otherwise.
+    """
+
+    min_limit: int
+    max_limit: int
+    wait_threshold: float
+    pool_wait: MovingAverage
+    enabled: bool = True
+    limit: float = field(init=False)
+    in_flight: int = 0
+
+    def __post_init__(self):
+        self.limit = float(self.max_limit)
+        CONCURRENCY_LIMIT.inc(self.limit)
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        previous = self.limit
+        if self.pool_wait.value > self.wait_threshold:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.inc(self.limit - previous)
+
+
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    min_limit=rate_limit_settings.SHED_MIN_CONCURRENCY,
+    max_limit=rate_limit_settings.SHED_MAX_CONCURRENCY,
+    wait_threshold=rate_limit_settings.SHED_POOL_WAIT_THRESHOLD,
+    pool_wait=pool_wait,
+    enabled=rate_limit_settings.LOAD_SHEDDING_ENABLED,
+)
+
+
+async def load_shedding_middleware(request: Request, call_next):
+    if not concurrency_limiter.enabled or request.url.path.startswith(EXEMPT_PREFIXES):
+        return await call_next(request)
+    if not concurrency_limiter.try_acquire():
+        SHED_REQUESTS.inc()
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server is overloaded, try again later"},
+            headers={"Retry-After": str(rate_limit_settings.SHED_RETRY_AFTER)},
+        )
+    try:
+        return await call_next(request)
+    finally:
+        concurrency_limiter.release()
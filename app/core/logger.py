@@ -1,10 +1,134 @@
 # app/core/logger.py
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
 
-logging.basicConfig(
-    filename="app.log",
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+from app.core.logging_config import LoggingSettings, logging_settings
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Listeners started by configure_logging and not stopped yet.
+_running: set[logging.handlers.QueueListener] = set()
+
+# Attributes every LogRecord has; anything else came in through ``extra=``.
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO-and-below records; warnings always pass."""
+
+    def __init__(self, rate: float, per_logger: dict[str, float] | None = None):
+        super().__init__()
+        self.rate = rate
+        self.per_logger = per_logger or {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.per_logger.get(record.name, self.rate)
+        return rate >= 1 or random.random() < rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread and drops them when the queue is full.
+
+    Only the cheap parts happen on the caller's thread: rendering the message,
+    the traceback and capturing the request id from the current context.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    config: LoggingSettings = logging_settings,
+) -> logging.handlers.QueueListener:
+    formatter = JsonFormatter()
+    handlers: list[logging.Handler] = []
+    if config.LOG_FILE:
+        handlers.append(
+            logging.handlers.RotatingFileHandler(
+                config.LOG_FILE,
+                maxBytes=config.LOG_MAX_BYTES,
+                backupCount=config.LOG_BACKUP_COUNT,
+                encoding="utf-8",
+            )
+        )
+    if config.LOG_STDOUT or not config.LOG_FILE:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(
+        SamplingFilter(config.LOG_INFO_SAMPLE_RATE, config.LOG_SAMPLE_RATES)
+    )
+
+    root = logging.getLogger()
+    root.setLevel(config.LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    _running.add(listener)
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Flush queued records and stop the writer thread; safe to call twice."""
+    if listener in _running:
+        _running.discard(listener)
+        listener.stop()
+
+
+log_listener = configure_logging()
 
 logger = logging.getLogger(__name__)
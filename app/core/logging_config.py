@@ -0,0 +1,17 @@
+from app.core.model_config import BaseConfig
+
+
+class LoggingSettings(BaseConfig):
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = "app.log"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    LOG_STDOUT: bool = False
+    LOG_QUEUE_SIZE: int = 10_000
+    # Fraction of INFO-and-below records kept; warnings and errors are never sampled.
+    LOG_INFO_SAMPLE_RATE: float = 1.0
+    # Per-logger overrides, e.g. {"app.access": 0.1}.
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+
+logging_settings = LoggingSettings()
@@ -0,0 +1,119 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With several uvicorn workers every process writes its samples to mmap'd
+# files under PROMETHEUS_MULTIPROC_DIR and /metrics merges them on scrape.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests served.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify calls waiting for or running in the worker threads.",
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+RATE_LIMITED_REQUESTS = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by a token bucket.",
+    ["route"],
+)
+SHED_REQUESTS = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 by the adaptive concurrency limiter.",
+)
+CONCURRENCY_LIMIT = Gauge(
+    "http_concurrency_limit",
+    "Current adaptive concurrency limit.",
+    multiprocess_mode="livesum",
+)
+JOB_QUEUE_LATENCY = Histogram(
+    "job_queue_latency_seconds",
+    "Time from enqueue (or retry due time) until a worker starts the job.",
+    ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Job run time by outcome (ok, retry or dead).",
+    ["job", "outcome"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+ANSWER_BUFFER_DEPTH = Gauge(
+    "answer_buffer_depth",
+    "Answers acknowledged but not yet written to Postgres.",
+    multiprocess_mode="livemax",
+)
+ANSWER_BUFFER_LAG = Gauge(
+    "answer_buffer_lag_seconds",
+    "Age of the oldest answer not yet written to Postgres.",
+    multiprocess_mode="livemax",
+)
+ANSWERS_FLUSHED = Counter(
+    "answers_flushed_total",
+    "Buffered answers by outcome (written, duplicate or dead).",
+    ["outcome"],
+)
+
+PURGED_ROWS = Counter(
+    "purged_rows_total",
+    "Rows deleted by background purges of deleted companies and users.",
+    ["kind", "table"],
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int | None = None):
+    """Drop a stopped worker's live gauges so in-flight counts don't leak into the sum."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -20,6 +20,19 @@ class QuizNotFoundException(BaseServiceError):
         )
 
 
+class QuizVersionNotFoundException(BaseServiceError):
+    def __init__(self, number: int):
+        super().__init__(f"Quiz version {number} does not exist", status_code=404)
+
+
+class QuizVersionConflictException(BaseServiceError):
+    def __init__(self):
+        super().__init__(
+            "The quiz was changed by another edit, reload it and try again",
+            status_code=409,
+        )
+
+
 class NotEnoughOptionsException(BaseServiceError):
     def __init__(self):
         super().__init__("Question must include at least 2 options", status_code=400)
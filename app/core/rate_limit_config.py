@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+from app.core.model_config import BaseConfig
+
+
+class RateLimitRule(BaseModel):
+    capacity: int
+    refill_per_second: float
+
+
+class RateLimitSettings(BaseConfig):
+    RATE_LIMIT_ENABLED: bool = True
+    # One token bucket per "<route>:user" and "<route>:ip"; a request must fit in both.
+    RATE_LIMITS: dict[str, RateLimitRule] = {
+        "login:user": RateLimitRule(capacity=5, refill_per_second=5 / 60),
+        "login:ip": RateLimitRule(capacity=30, refill_per_second=30 / 60),
+        "answer:user": RateLimitRule(capacity=30, refill_per_second=1),
+        "answer:ip": RateLimitRule(capacity=120, refill_per_second=4),
+        "quiz_create:user": RateLimitRule(capacity=5, refill_per_second=5 / 60),
+        "quiz_create:ip": RateLimitRule(capacity=20, refill_per_second=20 / 60),
+    }
+    # Adaptive concurrency limit per worker: shrinks while DB pool checkouts
+    # wait longer than the threshold, grows back while they don't.
+    LOAD_SHEDDING_ENABLED: bool = True
+    SHED_MIN_CONCURRENCY: int = 4
+    SHED_MAX_CONCURRENCY: int = 256
+    SHED_POOL_WAIT_THRESHOLD: float = 0.1
+    SHED_RETRY_AFTER: int = 1
+
+
+rate_limit_settings = RateLimitSettings()
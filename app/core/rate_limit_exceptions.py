@@ -0,0 +1,7 @@
+from app.core.base_exception import BaseServiceError
+
+
+class TooManyRequestsError(BaseServiceError):
+    def __init__(self, retry_after: int):
+        super().__init__("Too many requests, try again later", status_code=429)
+        self.headers = {"Retry-After": str(retry_after)}
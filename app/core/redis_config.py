@@ -6,6 +6,7 @@ class RedisSettings(BaseConfig):
     REDIS_SCHEME: str
     REDIS_PORT: str = "6379"
     REDIS_DB: str
+    REDIS_POOL_PREFILL: int = 2
 
     @property
     def url(self) -> str:
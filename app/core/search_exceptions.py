@@ -0,0 +1,9 @@
+from app.core.base_exception import BaseServiceError
+
+
+class InvalidCursorError(BaseServiceError):
+    def __init__(self):
+        super().__init__(
+            "Invalid cursor; pass next_cursor from the previous page.",
+            status_code=400,
+        )
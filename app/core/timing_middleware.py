@@ -0,0 +1,66 @@
+import logging
+import time
+import uuid
+
+from fastapi import Request
+
+from app.core.logger import request_id_var
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+from app.db.instrumentation import begin_query_stats, end_query_stats
+
+access_logger = logging.getLogger("app.access")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+def _route_label(request: Request) -> str:
+    # The route template keeps label cardinality bounded, unlike the raw path.
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def _request_id(request: Request) -> str:
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    if 0 < len(incoming) <= 128 and incoming.isprintable():
+        return incoming
+    return uuid.uuid4().hex
+
+
+async def timing_middleware(request: Request, call_next):
+    request_id = _request_id(request)
+    request_id_token = request_id_var.set(request_id)
+    stats, token = begin_query_stats()
+    started_at = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        end_query_stats(token)
+        request_id_var.reset(request_id_token)
+    elapsed = time.perf_counter() - started_at
+    total_ms = elapsed * 1000
+    db_ms = stats.duration * 1000
+
+    route = _route_label(request)
+    HTTP_REQUESTS.labels(request.method, route, response.status_code).inc()
+    HTTP_LATENCY.labels(request.method, route).observe(elapsed)
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+    )
+    response.headers[REQUEST_ID_HEADER] = request_id
+    access_logger.info(
+        f"{request.method} {request.url.path} {response.status_code}",
+        extra={
+            "request_id": request_id,
+            "method": request.method,
+            "path": request.url.path,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 1),
+            "db_ms": round(db_ms, 1),
+            "queries": stats.count,
+        },
+    )
+    return response
@@ -0,0 +1,124 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, REDIS_COMMAND_LATENCY
+
+_PARAM_LIST = re.compile(
+    r"\(\s*(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*\s*\)"
+)
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in parameters match."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _PARAM.sub("?", shape)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (shape, times)
+            for shape, times in self.shapes.most_common()
+            if times >= threshold
+        ]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def begin_query_stats() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _query_stats.set(stats)
+
+
+def end_query_stats(token: Token):
+    _query_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+def install_query_hooks(engine: Engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@dataclass
+class MovingAverage:
+    """Exponentially weighted moving average of recent samples."""
+
+    alpha: float = 0.2
+    value: float = 0.0
+
+    def observe(self, sample: float):
+        self.value += self.alpha * (sample - self.value)
+
+
+# Recent pool checkout wait of this process, read by the load shedder.
+pool_wait = MovingAverage()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started_at
+            DB_POOL_CHECKOUT_WAIT.observe(elapsed)
+            pool_wait.observe(elapsed)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(str(args[0]).upper()).observe(
+                time.perf_counter() - started_at
+            )
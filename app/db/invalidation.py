@@ -0,0 +1,149 @@
+import asyncio
+import json
+from typing import Hashable, Iterable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.utils.local_cache import LocalCache
+
+CHANNEL = "cache_invalidation"
+EVERYTHING = "*"
+# NOTIFY payloads are limited to 8000 bytes; bigger key sets flush the namespace.
+MAX_PAYLOAD = 7000
+
+
+class InvalidationBus:
+    """Evicts entries from this process's registered caches."""
+
+    def __init__(self):
+        self.caches: dict[str, LocalCache] = {}
+
+    def register(self, cache: LocalCache) -> LocalCache:
+        self.caches[cache.name] = cache
+        return cache
+
+    def evict(self, namespace: str, keys: Iterable[Hashable]):
+        cache = self.caches.get(namespace)
+        if cache is None:
+            return
+        for key in keys:
+            if key == EVERYTHING:
+                cache.clear()
+                return
+            cache.evict(key)
+
+    def flush_all(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    def apply(self, payload: str):
+        try:
+            message = json.loads(payload)
+            self.evict(message["ns"], message["keys"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Bad invalidation payload, flushing caches: {payload!r}")
+            self.flush_all()
+
+
+invalidation_bus = InvalidationBus()
+
+
+def invalidation_payload(namespace: str, keys: Iterable[Hashable]) -> str:
+    payload = json.dumps({"ns": namespace, "keys": [str(key) for key in keys]})
+    if len(payload) > MAX_PAYLOAD:
+        payload = json.dumps({"ns": namespace, "keys": [EVERYTHING]})
+    return payload
+
+
+async def publish_invalidation(session: AsyncSession, namespace: str, *keys: Hashable):
+    """Queue a NOTIFY in the session's transaction; Postgres sends it on commit.
+
+    Call it before the write commits: a rolled back write notifies nobody.
+    This process's entries are evicted right away.
+    """
+    await session.execute(
+        select(func.pg_notify(CHANNEL, invalidation_payload(namespace, keys)))
+    )
+    invalidation_bus.evict(namespace, keys)
+
+
+class InvalidationListener:
+    """LISTENs on its own connection and applies notifications to the bus.
+
+    After every (re)connect all caches are flushed, because notifications sent
+    while nobody was listening are lost.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        bus: InvalidationBus,
+        channel: str = CHANNEL,
+        keepalive: float = 30.0,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.bus = bus
+        self.channel = channel
+        self.keepalive = keepalive
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.bus.apply(payload)
+
+    async def _listen_once(self):
+        conn = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+            self.bus.flush_all()
+            self.connected = True
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), self.keepalive)
+                except asyncio.TimeoutError:
+                    # Catches half-open connections that never report closing.
+                    await asyncio.wait_for(conn.execute("SELECT 1"), self.keepalive)
+        finally:
+            self.connected = False
+            if not conn.is_closed():
+                await conn.close()
+
+    async def _run(self):
+        delay = self.retry_delay
+        while True:
+            try:
+                await self._listen_once()
+                delay = self.retry_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Invalidation listener disconnected: {exc!r}")
+            self.bus.flush_all()
+            await asyncio.sleep(delay)
+            delay = min(self.max_retry_delay, delay * 2)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_listener = InvalidationListener(settings.db.dsn, invalidation_bus)
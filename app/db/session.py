@@ -3,10 +3,19 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import (
+    InstrumentedRedis,
+    TimedQueuePool,
+    install_query_hooks,
+)
 
 engine = create_async_engine(
     settings.db.url,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db.DB_POOL_SIZE,
+    max_overflow=settings.db.DB_MAX_OVERFLOW,
 )
+install_query_hooks(engine.sync_engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
@@ -18,8 +27,14 @@ async def get_session():
         yield session
 
 
-redis_client = Redis.from_url(settings.redis.url, decode_responses=True)
+redis_client = InstrumentedRedis.from_url(settings.redis.url, decode_responses=True)
 
 
 async def get_redis() -> Redis:
     return redis_client
+
+
+async def close_pools():
+    """Close every pooled Postgres and Redis connection; both reconnect on next use."""
+    await engine.dispose()
+    await redis_client.aclose()
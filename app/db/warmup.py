@@ -0,0 +1,88 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from fastapi import FastAPI
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.session import engine, redis_client
+from app.repository.users_repository import UserRepository
+
+NIL_ID = uuid.UUID(int=0)
+
+
+async def warm_statements(conn: AsyncConnection):
+    """Run the statements every authenticated request issues, on this connection.
+
+    That fills SQLAlchemy's compiled cache and asyncpg's per-connection
+    prepared statement cache; the lookups themselves match nothing.
+    """
+    repo = UserRepository()
+    async with AsyncSession(bind=conn) as session:
+        await repo.get_by_email(session, "")
+        await repo.get(session, NIL_ID)
+        await repo.get_user_role(session, NIL_ID, NIL_ID)
+        await repo.get_company(session, NIL_ID)
+
+
+async def prefill_db_pool(
+    db_engine: AsyncEngine,
+    size: int,
+    warm: Callable[[AsyncConnection], Awaitable[object]] | None = None,
+):
+    """Open ``size`` connections at once so the pool keeps that many warm."""
+    opened = 0
+    all_open = asyncio.Event()
+
+    async def hold():
+        nonlocal opened
+        try:
+            async with db_engine.connect() as conn:
+                if warm is not None:
+                    await warm(conn)
+                opened += 1
+                if opened == size:
+                    all_open.set()
+                await all_open.wait()
+        finally:
+            all_open.set()
+
+    await asyncio.gather(*(hold() for _ in range(size)))
+
+
+async def prefill_redis_pool(client: Redis, size: int):
+    await asyncio.gather(*(client.ping() for _ in range(size)))
+
+
+def warm_schemas(app: FastAPI):
+    configure_mappers()
+    app.openapi()
+
+
+async def warm_up(app: FastAPI):
+    """Pay first-request costs at startup; a failure only costs the warm start."""
+    started_at = time.perf_counter()
+    warm_schemas(app)
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                prefill_db_pool(
+                    engine,
+                    min(settings.db.DB_POOL_PREFILL, settings.db.DB_POOL_SIZE),
+                    warm_statements,
+                ),
+                prefill_redis_pool(redis_client, settings.redis.REDIS_POOL_PREFILL),
+            ),
+            settings.app.WARMUP_TIMEOUT,
+        )
+    except Exception as exc:
+        logger.warning(f"Warmup incomplete: {exc!r}")
+    logger.info(
+        "Warmup finished",
+        extra={"duration_ms": round((time.perf_counter() - started_at) * 1000, 2)},
+    )
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import signal
+
+from prometheus_client import start_http_server
+
+import app.jobs.tasks  # noqa: F401  registers the jobs
+from app.core.answers_config import answers_settings
+from app.core.jobs_config import jobs_settings
+from app.jobs.answer_buffer import answer_buffer
+from app.jobs.answer_flusher import AnswerFlusher
+from app.jobs.queue import job_queue
+from app.jobs.worker import JobWorker
+
+
+async def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.jobs", description="Run background jobs from Redis."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=jobs_settings.JOBS_CONCURRENCY
+    )
+    parser.add_argument("--consumer", default=None, help="unique name of this worker")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=jobs_settings.JOBS_METRICS_PORT,
+        help="serve Prometheus metrics on this port (0 disables)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = JobWorker(job_queue, consumer=args.consumer, concurrency=args.concurrency)
+    runners = [worker.run(stop)]
+    if answers_settings.ANSWERS_WRITE_BEHIND:
+        flusher = AnswerFlusher(answer_buffer, consumer=args.consumer)
+        runners.append(flusher.run(stop))
+    await asyncio.gather(*runners)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
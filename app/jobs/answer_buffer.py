@@ -0,0 +1,203 @@
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from enum import IntEnum
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.answers_config import answers_settings
+from app.db.session import redis_client
+
+# KEYS: stream, seen marker. ARGV: max buffered, marker ttl, answer json.
+APPEND_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+if redis.call('XLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return -1
+end
+redis.call('SET', KEYS[2], '1', 'EX', ARGV[2])
+redis.call('XADD', KEYS[1], '*', 'answer', ARGV[3])
+return 1
+"""
+
+
+class AppendOutcome(IntEnum):
+    BUFFERED = 1
+    DUPLICATE = 0
+    FULL = -1
+
+
+@dataclass(frozen=True)
+class BufferedAnswer:
+    """A validated answer waiting to be written; ids are fixed when it is given,
+    so writing it twice after a redelivery is a no-op."""
+
+    user_id: UUID
+    company_id: UUID
+    quiz_id: UUID
+    version_id: UUID
+    question_id: UUID
+    selected_answers: list[int]
+    is_correct: bool
+    result_id: UUID = field(default_factory=uuid.uuid4)
+    answer_id: UUID = field(default_factory=uuid.uuid4)
+    answered_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BufferedAnswer":
+        data = json.loads(raw)
+        for key in (
+            "user_id",
+            "company_id",
+            "quiz_id",
+            "version_id",
+            "question_id",
+            "result_id",
+            "answer_id",
+        ):
+            data[key] = UUID(data[key])
+        return cls(**data)
+
+    def result_row(self) -> dict:
+        answered_at = datetime.fromtimestamp(self.answered_at, timezone.utc)
+        return {
+            "id": self.result_id,
+            "user_id": self.user_id,
+            "quiz_id": self.quiz_id,
+            "version_id": self.version_id,
+            "is_done": True,
+            "created_at": answered_at,
+            "updated_at": answered_at,
+        }
+
+    def answer_row(self) -> dict:
+        answered_at = datetime.fromtimestamp(self.answered_at, timezone.utc)
+        return {
+            "id": self.answer_id,
+            "quiz_result_id": self.result_id,
+            "question_id": self.question_id,
+            "selected_answers": self.selected_answers,
+            "created_at": answered_at,
+            "updated_at": answered_at,
+        }
+
+    def cache_payload(self) -> dict:
+        """Keyword arguments for RedisQuizService.save_quiz_answer."""
+        return {
+            "user_id": self.user_id,
+            "company_id": self.company_id,
+            "quiz_id": self.quiz_id,
+            "question_id": self.question_id,
+            "selected_answers": self.selected_answers,
+            "is_correct": self.is_correct,
+        }
+
+
+BufferedEntry = tuple[str, BufferedAnswer]
+
+
+class AnswerBuffer:
+    """Answers acknowledged to the user but not yet in Postgres, as a Redis stream.
+
+    Like the job queue, entries are deleted once flushed, so the stream length is
+    the backlog and its first entry is the oldest unflushed answer.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str = answers_settings.ANSWERS_STREAM,
+        group: str = answers_settings.ANSWERS_GROUP,
+        max_buffered: int = answers_settings.ANSWERS_MAX_BUFFERED,
+        seen_ttl: int = answers_settings.ANSWERS_SEEN_TTL,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.dead = f"{stream}:dead"
+        self.max_buffered = max_buffered
+        self.seen_ttl = seen_ttl
+        self.append_script = redis.register_script(APPEND_LUA)
+
+    def seen_key(self, user_id: UUID, question_id: UUID) -> str:
+        return f"{self.stream}:seen:{user_id}:{question_id}"
+
+    async def append(self, answer: BufferedAnswer) -> AppendOutcome:
+        outcome = await self.append_script(
+            keys=[self.stream, self.seen_key(answer.user_id, answer.question_id)],
+            args=[self.max_buffered, self.seen_ttl, answer.to_json()],
+        )
+        return AppendOutcome(int(outcome))
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def read(
+        self, consumer: str, count: int, block_ms: int
+    ) -> list[BufferedEntry]:
+        entries = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return [
+            (entry_id, BufferedAnswer.from_json(fields["answer"]))
+            for _, stream_entries in entries or []
+            for entry_id, fields in stream_entries
+        ]
+
+    async def claim_stale(
+        self, consumer: str, idle_ms: int, count: int
+    ) -> list[BufferedEntry]:
+        """Take over answers a crashed flusher read but never flushed."""
+        _, entries, _ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer, idle_ms, count=count
+        )
+        return [
+            (entry_id, BufferedAnswer.from_json(fields["answer"]))
+            for entry_id, fields in entries
+        ]
+
+    async def ack(self, entry_ids: list[str]):
+        if not entry_ids:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, *entry_ids)
+            pipe.xdel(self.stream, *entry_ids)
+            await pipe.execute()
+
+    async def dead_letter(self, entry_id: str, answer: BufferedAnswer, error: str):
+        """Park an answer that can't be written; the user may answer again."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(self.dead, {"answer": answer.to_json(), "error": error[:1000]})
+            pipe.delete(self.seen_key(answer.user_id, answer.question_id))
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+
+    async def lag(self) -> tuple[int, float]:
+        """Unflushed answers and the age in seconds of the oldest one."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.stream)
+            pipe.xrange(self.stream, count=1)
+            depth, oldest = await pipe.execute()
+        if not oldest:
+            return depth, 0.0
+        entry_id, _ = oldest[0]
+        appended_at = int(entry_id.split("-")[0]) / 1000
+        return depth, max(0.0, time.time() - appended_at)
+
+
+answer_buffer = AnswerBuffer(redis_client)
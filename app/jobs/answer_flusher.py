@@ -0,0 +1,122 @@
+import asyncio
+import os
+import socket
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.answers_config import answers_settings
+from app.core.logger import logger
+from app.core.metrics import ANSWER_BUFFER_DEPTH, ANSWER_BUFFER_LAG, ANSWERS_FLUSHED
+from app.db.session import AsyncSessionLocal
+from app.jobs.answer_buffer import AnswerBuffer, BufferedAnswer, BufferedEntry
+from app.repository.users_repository import UserRepository
+from app.services.redis_service import RedisQuizService
+
+
+class AnswerFlusher:
+    """Writes buffered answers to Postgres in batches of up to ``batch_size``.
+
+    Entries are acknowledged only after their batch commits, so a crash between
+    the two replays the batch; the fixed row ids make the replay a no-op.
+    """
+
+    def __init__(
+        self,
+        buffer: AnswerBuffer,
+        repo: UserRepository | None = None,
+        session_factory=AsyncSessionLocal,
+        consumer: str | None = None,
+        batch_size: int = answers_settings.ANSWERS_FLUSH_BATCH,
+        block_ms: int = answers_settings.ANSWERS_FLUSH_BLOCK_MS,
+        claim_idle_ms: int = answers_settings.ANSWERS_CLAIM_IDLE_MS,
+        claim_interval: float = 10.0,
+    ):
+        self.buffer = buffer
+        self.repo = repo or UserRepository()
+        self.session_factory = session_factory
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self._next_claim_at = 0.0
+
+    async def _write(self, answers: list[BufferedAnswer]) -> int:
+        async with self.session_factory() as session:
+            written = await self.repo.insert_answers(
+                session,
+                [answer.result_row() for answer in answers],
+                [answer.answer_row() for answer in answers],
+            )
+        return len(written)
+
+    async def flush(self, entries: list[BufferedEntry]):
+        if not entries:
+            return
+        # The seen marker stops repeats at the API; this catches the rest.
+        unique: dict[tuple, BufferedEntry] = {}
+        for entry_id, answer in entries:
+            unique.setdefault((answer.user_id, answer.question_id), (entry_id, answer))
+        batch = list(unique.values())
+
+        written = 0
+        dead: set[str] = set()
+        try:
+            written = await self._write([answer for _, answer in batch])
+        except IntegrityError:
+            # Usually the quiz or user was deleted meanwhile; one such row fails
+            # the whole insert, so write the batch row by row to isolate it.
+            for entry_id, answer in batch:
+                try:
+                    written += await self._write([answer])
+                except IntegrityError as exc:
+                    dead.add(entry_id)
+                    await self.buffer.dead_letter(entry_id, answer, repr(exc))
+
+        await RedisQuizService.save_quiz_answers(
+            [
+                answer.cache_payload()
+                for entry_id, answer in batch
+                if entry_id not in dead
+            ]
+        )
+        await self.buffer.ack(
+            [entry_id for entry_id, _ in entries if entry_id not in dead]
+        )
+        ANSWERS_FLUSHED.labels("written").inc(written)
+        ANSWERS_FLUSHED.labels("duplicate").inc(len(entries) - written - len(dead))
+        ANSWERS_FLUSHED.labels("dead").inc(len(dead))
+
+    async def report_lag(self):
+        depth, lag = await self.buffer.lag()
+        ANSWER_BUFFER_DEPTH.set(depth)
+        ANSWER_BUFFER_LAG.set(lag)
+
+    async def poll(self) -> int:
+        """Flush one batch; returns how many entries it held."""
+        entries = []
+        if time.monotonic() >= self._next_claim_at:
+            self._next_claim_at = time.monotonic() + self.claim_interval
+            entries = await self.buffer.claim_stale(
+                self.consumer, self.claim_idle_ms, self.batch_size
+            )
+        if not entries:
+            entries = await self.buffer.read(
+                self.consumer, self.batch_size, self.block_ms
+            )
+        await self.flush(entries)
+        await self.report_lag()
+        return len(entries)
+
+    async def run(self, stop: asyncio.Event):
+        await self.buffer.ensure_group()
+        logger.info(f"Answer flusher {self.consumer} started")
+        while not stop.is_set():
+            try:
+                await self.poll()
+            except Exception as exc:
+                # Unflushed entries stay pending and are claimed again later.
+                logger.warning(f"Answer flush failed: {exc!r}")
+                await asyncio.sleep(1)
+        logger.info(f"Answer flusher {self.consumer} stopped")
@@ -0,0 +1,143 @@
+import json
+import time
+import uuid
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.jobs_config import jobs_settings
+from app.db.session import redis_client
+
+# Moves retries whose backoff has elapsed from the delayed set back onto the stream.
+PROMOTE_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    local job = cjson.decode(member)
+    redis.call(
+        'XADD', KEYS[2], '*',
+        'name', job.name, 'payload', job.payload,
+        'attempt', job.attempt, 'enqueued_at', job.enqueued_at
+    )
+end
+return #due
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    name: str
+    payload: dict
+    attempt: int
+    enqueued_at: float
+
+    @classmethod
+    def from_entry(cls, entry_id: str, fields: dict) -> "Job":
+        return cls(
+            id=entry_id,
+            name=fields["name"],
+            payload=json.loads(fields["payload"]),
+            attempt=int(fields["attempt"]),
+            enqueued_at=float(fields["enqueued_at"]),
+        )
+
+
+def _fields(name: str, payload: str, attempt: int, enqueued_at: float) -> dict:
+    return {
+        "name": name,
+        "payload": payload,
+        "attempt": str(attempt),
+        "enqueued_at": repr(enqueued_at),
+    }
+
+
+class JobQueue:
+    """A Redis stream read through one consumer group, plus retry and dead-letter keys.
+
+    Entries are deleted once acknowledged, so the stream only holds pending work.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str = jobs_settings.JOBS_STREAM,
+        group: str = jobs_settings.JOBS_GROUP,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.delayed = f"{stream}:delayed"
+        self.dead = f"{stream}:dead"
+        self.promote_script = redis.register_script(PROMOTE_DUE_LUA)
+
+    async def enqueue(self, name: str, payload: dict) -> str:
+        fields = _fields(name, json.dumps(payload, default=str), 0, time.time())
+        return await self.redis.xadd(self.stream, fields)
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def read(self, consumer: str, count: int, block_ms: int) -> list[Job]:
+        entries = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return [
+            Job.from_entry(entry_id, fields)
+            for _, stream_entries in entries or []
+            for entry_id, fields in stream_entries
+        ]
+
+    async def claim_stale(self, consumer: str, idle_ms: int, count: int) -> list[Job]:
+        """Take over jobs a crashed or stuck worker received but never acknowledged."""
+        _, entries, _ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer, idle_ms, count=count
+        )
+        return [Job.from_entry(entry_id, fields) for entry_id, fields in entries]
+
+    async def ack(self, job: Job):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, job.id)
+            pipe.xdel(self.stream, job.id)
+            await pipe.execute()
+
+    async def retry(self, job: Job, delay: float):
+        due_at = time.time() + delay
+        member = json.dumps(
+            {
+                "id": uuid.uuid4().hex,
+                **_fields(job.name, json.dumps(job.payload), job.attempt + 1, due_at),
+            }
+        )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.delayed, {member: due_at})
+            pipe.xack(self.stream, self.group, job.id)
+            pipe.xdel(self.stream, job.id)
+            await pipe.execute()
+
+    async def dead_letter(self, job: Job, error: str):
+        fields = _fields(
+            job.name, json.dumps(job.payload), job.attempt, job.enqueued_at
+        )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(self.dead, {**fields, "error": error[:1000]})
+            pipe.xack(self.stream, self.group, job.id)
+            pipe.xdel(self.stream, job.id)
+            await pipe.execute()
+
+    async def promote_due(self, limit: int = 100) -> int:
+        return int(
+            await self.promote_script(
+                keys=[self.delayed, self.stream], args=[time.time(), limit]
+            )
+        )
+
+
+job_queue = JobQueue(redis_client)
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app.core.jobs_config import jobs_settings
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    func: JobFunc
+    max_attempts: int
+    timeout: float
+
+
+JOBS: dict[str, JobSpec] = {}
+
+
+def job(
+    name: str | None = None,
+    max_attempts: int = jobs_settings.JOBS_MAX_ATTEMPTS,
+    timeout: float = jobs_settings.JOBS_TIMEOUT,
+):
+    """Register a coroutine as a job; it receives the enqueued payload as kwargs.
+
+    Jobs are delivered at least once, so they must be safe to run twice.
+    """
+
+    def decorator(func: JobFunc) -> JobFunc:
+        spec = JobSpec(name or func.__name__, func, max_attempts, timeout)
+        JOBS[spec.name] = spec
+        return func
+
+    return decorator
@@ -0,0 +1,24 @@
+from uuid import UUID
+
+from app.db.session import AsyncSessionLocal
+from app.jobs.queue import job_queue
+from app.jobs.registry import job
+from app.services.companies_service import companies_service
+from app.services.users_service import user_service
+
+
+@job()
+async def purge_company(company_id: str):
+    async with AsyncSessionLocal() as session:
+        done = await companies_service.company_purge(UUID(company_id), session)
+    if not done:
+        # Continue in a fresh job so a single run stays inside its timeout.
+        await job_queue.enqueue("purge_company", {"company_id": company_id})
+
+
+@job()
+async def purge_user(user_id: str):
+    async with AsyncSessionLocal() as session:
+        done = await user_service.user_purge(UUID(user_id), session)
+    if not done:
+        await job_queue.enqueue("purge_user", {"user_id": user_id})
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import random
+import socket
+import time
+
+from app.core.jobs_config import jobs_settings
+from app.core.logger import logger
+from app.core.metrics import JOB_DURATION, JOB_QUEUE_LATENCY
+from app.jobs.queue import Job, JobQueue
+from app.jobs.registry import JOBS, JobSpec
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = jobs_settings.JOBS_BACKOFF_BASE,
+    cap: float = jobs_settings.JOBS_BACKOFF_MAX,
+) -> float:
+    """Exponential backoff with jitter, so failed jobs don't retry in lockstep."""
+    return min(cap, base * 2**attempt) * random.uniform(0.5, 1.0)
+
+
+class JobWorker:
+    """Runs up to ``concurrency`` jobs at once from the queue's consumer group."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        registry: dict[str, JobSpec] = JOBS,
+        consumer: str | None = None,
+        concurrency: int = jobs_settings.JOBS_CONCURRENCY,
+        block_ms: int = 1000,
+        claim_idle_ms: int = jobs_settings.JOBS_CLAIM_IDLE_MS,
+        claim_interval: float = 10.0,
+    ):
+        self.queue = queue
+        self.registry = registry
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self._next_claim_at = 0.0
+        self.running: set[asyncio.Task] = set()
+
+    async def handle(self, job: Job):
+        JOB_QUEUE_LATENCY.labels(job.name).observe(
+            max(0.0, time.time() - job.enqueued_at)
+        )
+        spec = self.registry.get(job.name)
+        started_at = time.perf_counter()
+        try:
+            if spec is None:
+                raise LookupError(f"Unknown job {job.name!r}")
+            await asyncio.wait_for(spec.func(**job.payload), spec.timeout)
+        except Exception as exc:
+            max_attempts = spec.max_attempts if spec is not None else 1
+            if job.attempt + 1 < max_attempts:
+                outcome = "retry"
+                await self.queue.retry(job, backoff_delay(job.attempt))
+            else:
+                outcome = "dead"
+                await self.queue.dead_letter(job, repr(exc))
+            logger.warning(
+                f"Job {job.name} {job.id} failed on attempt {job.attempt + 1}: "
+                f"{exc!r} ({outcome})"
+            )
+        else:
+            outcome = "ok"
+            await self.queue.ack(job)
+        JOB_DURATION.labels(job.name, outcome).observe(time.perf_counter() - started_at)
+
+    def _spawn(self, job: Job):
+        task = asyncio.create_task(self.handle(job))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+
+    async def poll(self) -> int:
+        """Start as many jobs as there are free slots; returns how many started."""
+        free = self.concurrency - len(self.running)
+        if free <= 0:
+            await asyncio.wait(self.running, return_when=asyncio.FIRST_COMPLETED)
+            return 0
+        await self.queue.promote_due()
+        jobs = []
+        if time.monotonic() >= self._next_claim_at:
+            self._next_claim_at = time.monotonic() + self.claim_interval
+            jobs = await self.queue.claim_stale(self.consumer, self.claim_idle_ms, free)
+        if not jobs:
+            jobs = await self.queue.read(self.consumer, free, self.block_ms)
+        for job in jobs:
+            self._spawn(job)
+        return len(jobs)
+
+    async def run(self, stop: asyncio.Event):
+        await self.queue.ensure_group()
+        logger.info(
+            f"Job worker {self.consumer} started, concurrency={self.concurrency}"
+        )
+        while not stop.is_set():
+            try:
+                await self.poll()
+            except Exception as exc:
+                logger.warning(f"Job worker poll failed: {exc!r}")
+                await asyncio.sleep(1)
+        # Let running jobs finish; anything left unacknowledged is redelivered.
+        if self.running:
+            await asyncio.wait(self.running)
+        logger.info(f"Job worker {self.consumer} stopped")
@@ -1,4 +1,5 @@
-import uvicorn
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -6,17 +7,45 @@ from fastapi.responses import JSONResponse
 from app.core.base_exception import BaseServiceError
 from app.core.config import settings
 from app.core.error_middleware import error_middleware
+from app.core.idempotency_middleware import idempotency_middleware
+from app.core.load_shedding_middleware import load_shedding_middleware
+from app.core.metrics import mark_worker_dead
+from app.core.timing_middleware import timing_middleware
+from app.db.invalidation import invalidation_listener
+from app.db.session import close_pools
+from app.db.warmup import warm_up
 from app.routers.route_collection import router as api_routes
+from app.services.health_service import health_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up(app)
+    health_monitor.start()
+    invalidation_listener.start()
+    yield
+    await invalidation_listener.stop()
+    await health_monitor.stop()
+    await close_pools()
+    mark_worker_dead()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.exception_handler(BaseServiceError)
 async def base_service_error_handler(request, exc: BaseServiceError):
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.message},
+        headers=getattr(exc, "headers", None),
+    )
 
 
 app.middleware("http")(error_middleware)
+app.middleware("http")(load_shedding_middleware)
+app.middleware("http")(idempotency_middleware)
+app.middleware("http")(timing_middleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.app.ORIGINS,
@@ -28,6 +57,8 @@ app.add_middleware(
 app.include_router(api_routes)
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host=settings.app.HOST,
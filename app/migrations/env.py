@@ -9,6 +9,7 @@ from app.models.company_model import CompanyModel  # noqa
 from app.models.question_model import QuestionModel  # noqa
 from app.models.quiz_answer_model import QuizAnswer  # noqa
 from app.models.quiz_model import QuizModel  # noqa
+from app.models.quiz_version_model import QuizVersionModel  # noqa
 from app.models.results import QuizResults  # noqa
 from app.models.user_model import UserModel  # noqa
 
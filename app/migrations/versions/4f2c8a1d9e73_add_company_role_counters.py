@@ -0,0 +1,50 @@
+"""add company role counters
+
+Revision ID: 4f2c8a1d9e73
+Revises: b66e8953b48c
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2c8a1d9e73"
+down_revision: Union[str, Sequence[str], None] = "b66e8953b48c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ("owners_count", "admins_count", "members_count"):
+        op.add_column(
+            "companies",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+    op.execute(
+        """
+        UPDATE companies c
+        SET owners_count = r.owners,
+            admins_count = r.admins,
+            members_count = r.members
+        FROM (
+            SELECT company_id,
+                   count(*) FILTER (WHERE role = 'owner') AS owners,
+                   count(*) FILTER (WHERE role = 'admin') AS admins,
+                   count(*) FILTER (WHERE role = 'member') AS members
+            FROM company_user_roles
+            GROUP BY company_id
+        ) r
+        WHERE r.company_id = c.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("members_count", "admins_count", "owners_count"):
+        op.drop_column("companies", column)
@@ -0,0 +1,66 @@
+"""deactivate deleted users and index their foreign keys for the purge
+
+Revision ID: 5e8a0c3f7b61
+Revises: c41d7e2b9f08
+Create Date: 2026-10-19 16:20:47.918305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8a0c3f7b61"
+down_revision: Union[str, Sequence[str], None] = "c41d7e2b9f08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, ON DELETE rule) for user FKs the database now resolves itself.
+# Roles stay without a rule: deleting them must also update the company counters.
+USER_FOREIGN_KEYS = (
+    ("results", "user_id", "CASCADE"),
+    ("company_invites", "invited_user_id", "CASCADE"),
+    ("company_invites", "invited_by_id", "SET NULL"),
+)
+
+INDEXES = (
+    ("results", "user_id"),
+    ("company_user_roles", "user_id"),
+    ("company_invites", "invited_user_id"),
+    ("company_invites", "invited_by_id"),
+)
+
+
+def _replace_foreign_keys(upgrade: bool) -> None:
+    for table, column, ondelete in USER_FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name,
+            table,
+            "users",
+            [column],
+            ["id"],
+            ondelete=ondelete if upgrade else None,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("is_active", sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    for table, column in INDEXES:
+        op.create_index(op.f(f"ix_{table}_{column}"), table, [column])
+    _replace_foreign_keys(upgrade=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(upgrade=False)
+    for table, column in INDEXES:
+        op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table)
+    op.drop_column("users", "is_active")
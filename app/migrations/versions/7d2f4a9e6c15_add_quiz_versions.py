@@ -0,0 +1,88 @@
+"""add immutable quiz versions and tie answers to the version they were given on
+
+Revision ID: 7d2f4a9e6c15
+Revises: 5e8a0c3f7b61
+Create Date: 2026-10-19 17:41:05.530826
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2f4a9e6c15"
+down_revision: Union[str, Sequence[str], None] = "5e8a0c3f7b61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "quiz_versions",
+        sa.Column("quiz_id", sa.UUID(), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("question_ids", postgresql.ARRAY(sa.UUID()), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("quiz_id", "number", name="uq_quiz_versions_quiz_number"),
+    )
+    op.add_column(
+        "quizzes",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column("results", sa.Column("version_id", sa.UUID(), nullable=True))
+    op.create_index(op.f("ix_results_version_id"), "results", ["version_id"])
+    op.create_foreign_key(
+        "results_version_id_fkey",
+        "results",
+        "quiz_versions",
+        ["version_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    # Every existing quiz becomes version 1 of itself, and its answers point at it.
+    op.execute(
+        """
+        INSERT INTO quiz_versions (id, quiz_id, number, question_ids)
+        SELECT gen_random_uuid(), quizzes.id, 1,
+               coalesce(array_agg(questions.id) FILTER (WHERE questions.id IS NOT NULL),
+                        '{}')
+        FROM quizzes LEFT JOIN questions ON questions.quiz_id = quizzes.id
+        GROUP BY quizzes.id
+        """
+    )
+    op.execute("UPDATE quizzes SET version = 1")
+    op.execute(
+        """
+        UPDATE results SET version_id = quiz_versions.id
+        FROM quiz_versions
+        WHERE quiz_versions.quiz_id = results.quiz_id AND quiz_versions.number = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("results_version_id_fkey", "results", type_="foreignkey")
+    op.drop_index(op.f("ix_results_version_id"), table_name="results")
+    op.drop_column("results", "version_id")
+    op.drop_column("quizzes", "version")
+    op.drop_table("quiz_versions")
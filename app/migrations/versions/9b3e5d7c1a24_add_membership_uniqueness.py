@@ -0,0 +1,90 @@
+"""add membership uniqueness for bulk operations
+
+Revision ID: 9b3e5d7c1a24
+Revises: 4f2c8a1d9e73
+Create Date: 2026-10-19 12:40:03.551872
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e5d7c1a24"
+down_revision: Union[str, Sequence[str], None] = "4f2c8a1d9e73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the highest role per (company, user) before enforcing uniqueness.
+    op.execute(
+        """
+        DELETE FROM company_user_roles r
+        USING company_user_roles keep
+        WHERE r.company_id = keep.company_id
+          AND r.user_id = keep.user_id
+          AND r.id <> keep.id
+          AND (
+              array_position(ARRAY['member', 'admin', 'owner'], r.role::text),
+              r.id::text
+          ) < (
+              array_position(ARRAY['member', 'admin', 'owner'], keep.role::text),
+              keep.id::text
+          )
+        """
+    )
+    op.execute(
+        """
+        UPDATE companies c
+        SET owners_count = (
+                SELECT count(*) FROM company_user_roles r
+                WHERE r.company_id = c.id AND r.role = 'owner'
+            ),
+            admins_count = (
+                SELECT count(*) FROM company_user_roles r
+                WHERE r.company_id = c.id AND r.role = 'admin'
+            ),
+            members_count = (
+                SELECT count(*) FROM company_user_roles r
+                WHERE r.company_id = c.id AND r.role = 'member'
+            )
+        """
+    )
+    op.create_unique_constraint(
+        "uq_company_user_roles_company_user",
+        "company_user_roles",
+        ["company_id", "user_id"],
+    )
+    # Only the newest pending invite/request per (company, user, type) stays pending.
+    op.execute(
+        """
+        UPDATE company_invites i
+        SET status = 'canceled'
+        FROM company_invites newer
+        WHERE i.status = 'pending'
+          AND newer.status = 'pending'
+          AND i.company_id = newer.company_id
+          AND i.invited_user_id = newer.invited_user_id
+          AND i.type = newer.type
+          AND (i.created_at, i.id::text) < (newer.created_at, newer.id::text)
+        """
+    )
+    op.create_index(
+        "uq_company_invites_pending",
+        "company_invites",
+        ["company_id", "invited_user_id", "type"],
+        unique=True,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_company_invites_pending", table_name="company_invites")
+    op.drop_constraint(
+        "uq_company_user_roles_company_user", "company_user_roles", type_="unique"
+    )
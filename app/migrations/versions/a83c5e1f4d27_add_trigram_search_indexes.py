@@ -0,0 +1,48 @@
+"""add pg_trgm GIN indexes for company and user search
+
+Revision ID: a83c5e1f4d27
+Revises: 7d2f4a9e6c15
+Create Date: 2026-10-19 18:26:39.114072
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a83c5e1f4d27"
+down_revision: Union[str, Sequence[str], None] = "7d2f4a9e6c15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCHABLE_COMPANIES = "is_public IS true AND deleted_at IS NULL"
+ACTIVE_USERS = "is_active IS true"
+
+# (index, table, indexed expression, partial index predicate)
+INDEXES = (
+    ("ix_companies_name_trgm", "companies", "name", SEARCHABLE_COMPANIES),
+    ("ix_companies_description_trgm", "companies", "description", SEARCHABLE_COMPANIES),
+    ("ix_users_name_trgm", "users", "name", ACTIVE_USERS),
+    ("ix_users_email_trgm", "users", "lower(email)", ACTIVE_USERS),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, expression, where in INDEXES:
+        op.create_index(
+            name,
+            table,
+            [sa.text(f"{expression} gin_trgm_ops")],
+            postgresql_using="gin",
+            postgresql_where=sa.text(where),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,72 @@
+"""soft delete companies and cascade their dependents in the database
+
+Revision ID: c41d7e2b9f08
+Revises: 9b3e5d7c1a24
+Create Date: 2026-10-19 15:02:11.204519
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7e2b9f08"
+down_revision: Union[str, Sequence[str], None] = "9b3e5d7c1a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) for every FK that now cascades.
+CASCADES = (
+    ("results", "quiz_id", "quizzes"),
+    ("quiz_answers", "quiz_result_id", "results"),
+    ("quiz_answers", "question_id", "questions"),
+    ("company_user_roles", "company_id", "companies"),
+    ("company_invites", "company_id", "companies"),
+)
+
+# Referencing columns that had no index, so cascades and purges scanned the table.
+INDEXES = (
+    ("quizzes", "company_id"),
+    ("questions", "quiz_id"),
+    ("results", "quiz_id"),
+    ("quiz_answers", "quiz_result_id"),
+    ("quiz_answers", "question_id"),
+    ("company_invites", "company_id"),
+)
+
+
+def _replace_foreign_keys(ondelete: str | None) -> None:
+    for table, column, referred in CASCADES:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referred, [column], ["id"], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "companies",
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_companies_deleted_at",
+        "companies",
+        ["deleted_at"],
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    for table, column in INDEXES:
+        op.create_index(op.f(f"ix_{table}_{column}"), table, [column])
+    _replace_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(None)
+    for table, column in INDEXES:
+        op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table)
+    op.drop_index("ix_companies_deleted_at", table_name="companies")
+    op.drop_column("companies", "deleted_at")
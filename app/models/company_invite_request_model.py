@@ -4,7 +4,7 @@ import enum
 from typing import TYPE_CHECKING
 from uuid import UUID as PyUUID
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -31,14 +31,30 @@ class InviteStatus(str, enum.Enum):
 
 class CompanyInviteRequestModel(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "company_invites"
+    __table_args__ = (
+        Index(
+            "uq_company_invites_pending",
+            "company_id",
+            "invited_user_id",
+            "type",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
     company_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("companies.id")
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), index=True
     )
     invited_by_id: Mapped[PyUUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
     invited_user_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     type: Mapped[InviteType] = mapped_column(
         Enum(
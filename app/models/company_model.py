@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -16,12 +17,43 @@ if TYPE_CHECKING:
 
 class CompanyModel(Base, TimestampMixin, UUIDMixin):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index(
+            "ix_companies_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        # Trigram indexes for search; only listed companies are searchable.
+        *(
+            Index(
+                f"ix_companies_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=text("is_public IS true AND deleted_at IS NULL"),
+            )
+            for column in ("name", "description")
+        ),
+    )
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=True)
     is_public: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    owners_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    admins_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    members_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Set when the owner deletes the company; a background job purges it later.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     roles: Mapped[List["CompanyUserRoleModel"]] = relationship(
-        back_populates="company", cascade="all, delete-orphan"
+        back_populates="company", cascade="all, delete-orphan", passive_deletes=True
     )
     quizzes: Mapped[List["QuizModel"]] = relationship(
-        back_populates="company", cascade="all, delete-orphan"
+        back_populates="company", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -4,7 +4,7 @@ import enum
 from typing import TYPE_CHECKING
 from uuid import UUID as PyUUID
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,9 +24,16 @@ class RoleEnum(str, enum.Enum):
 
 class CompanyUserRoleModel(Base, UUIDMixin):
     __tablename__ = "company_user_roles"
-    user_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
+    __table_args__ = (
+        UniqueConstraint(
+            "company_id", "user_id", name="uq_company_user_roles_company_user"
+        ),
+    )
+    user_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), index=True
+    )
     company_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("companies.id")
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE")
     )
 
     role: Mapped[RoleEnum] = mapped_column(
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 
 class QuestionModel(Base, UUIDMixin):
+    # Never updated once written: edits add a new question to a new quiz version,
+    # so answers keep being scored against what was actually asked.
     __tablename__ = "questions"
     title: Mapped[str] = mapped_column(String, nullable=False)
     options: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
@@ -22,9 +24,13 @@ class QuestionModel(Base, UUIDMixin):
     quiz_id: Mapped[str] = mapped_column(
         ForeignKey("quizzes.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     quiz: Mapped["QuizModel"] = relationship(back_populates="questions")
     quiz_answers: Mapped[List["QuizAnswer"]] = relationship(
-        "QuizAnswer", back_populates="question", cascade="all, delete-orphan"
+        "QuizAnswer",
+        back_populates="question",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -18,10 +18,16 @@ class QuizAnswer(Base, TimestampMixin, UUIDMixin):
     __tablename__ = "quiz_answers"
 
     quiz_result_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("results.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("results.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     question_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("questions.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("questions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     selected_answers: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=True)
 
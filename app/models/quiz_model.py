@@ -10,6 +10,7 @@ from app.models.base import Base
 if TYPE_CHECKING:
     from app.models.question_model import QuestionModel
     from app.models.company_model import CompanyModel
+    from app.models.quiz_version_model import QuizVersionModel
     from app.models.results import QuizResults
 
 from uuid import UUID
@@ -24,14 +25,26 @@ class QuizModel(Base, UUIDMixin):
     title: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     total_participation: Mapped[int] = mapped_column(Integer, default=0)
+    # Number of the current QuizVersionModel; 0 only until the first version
+    # is written in the same transaction as the quiz.
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     questions: Mapped[List["QuestionModel"]] = relationship(
-        back_populates="quiz", cascade="all, delete-orphan"
+        back_populates="quiz", cascade="all, delete-orphan", passive_deletes=True
     )
     company_id: Mapped[UUID] = mapped_column(
         ForeignKey("companies.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     company: Mapped["CompanyModel"] = relationship(back_populates="quizzes")
     quiz_results: Mapped[List["QuizResults"]] = relationship(
-        "QuizResults", back_populates="quiz", cascade="all, delete-orphan"
+        "QuizResults",
+        back_populates="quiz",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    versions: Mapped[List["QuizVersionModel"]] = relationship(
+        back_populates="quiz", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID as PyUUID
+
+from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.timestamp_mixin import TimestampMixin
+from app.models.uuid_mixin import UUIDMixin
+
+if TYPE_CHECKING:
+    from app.models.quiz_model import QuizModel
+
+
+class QuizVersionModel(Base, TimestampMixin, UUIDMixin):
+    """A published, never-modified snapshot of which questions make up a quiz.
+
+    Questions are immutable too, so a version's content can be cached forever;
+    editing the quiz's questions writes a new version instead.
+    """
+
+    __tablename__ = "quiz_versions"
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "number", name="uq_quiz_versions_quiz_number"),
+    )
+    quiz_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("quizzes.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    number: Mapped[int] = mapped_column(Integer, nullable=False)
+    question_ids: Mapped[list[PyUUID]] = mapped_column(
+        ARRAY(UUID(as_uuid=True)), nullable=False
+    )
+
+    quiz: Mapped["QuizModel"] = relationship(back_populates="versions")
@@ -19,14 +19,30 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 class QuizResults(Base, TimestampMixin, UUIDMixin):
     __tablename__ = "results"
     user_id: Mapped[PyUUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
     )
     quiz_id: Mapped[PyUUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("quizzes.id"), nullable=True
+        UUID(as_uuid=True),
+        ForeignKey("quizzes.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    # The quiz version the answer was given against.
+    version_id: Mapped[PyUUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("quiz_versions.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
     )
     is_done: Mapped[bool] = mapped_column(Boolean, default=False)
     user: Mapped["UserModel"] = relationship("UserModel", foreign_keys=[user_id])
     quiz: Mapped["QuizModel"] = relationship("QuizModel", foreign_keys=[quiz_id])
     answers: Mapped[list["QuizAnswer"]] = relationship(
-        "QuizAnswer", back_populates="quiz_result", cascade="all, delete-orphan"
+        "QuizAnswer",
+        back_populates="quiz_result",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Integer, String
+from sqlalchemy import Boolean, Index, Integer, String, text, true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -16,13 +16,36 @@ from app.models.uuid_mixin import UUIDMixin
 
 class UserModel(Base, TimestampMixin, UUIDMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        # Trigram indexes for search over active users by name and email prefix.
+        Index(
+            "ix_users_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("is_active IS true"),
+        ),
+        Index(
+            "ix_users_email_trgm",
+            text("lower(email) gin_trgm_ops"),
+            postgresql_using="gin",
+            postgresql_where=text("is_active IS true"),
+        ),
+    )
     name: Mapped[str] = mapped_column(String, nullable=True)
     password: Mapped[str] = mapped_column(String, nullable=True)
     age: Mapped[int] = mapped_column(Integer, nullable=True)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False, index=True)
+    # Cleared when the account is deleted; a background job purges it later.
+    is_active: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default=true()
+    )
     roles: Mapped[List["CompanyUserRoleModel"]] = relationship(
         "CompanyUserRoleModel", back_populates="user", cascade="all, delete-orphan"
     )
     quiz_results: Mapped[List["QuizResults"]] = relationship(
-        "QuizResults", back_populates="user", cascade="all, delete-orphan"
+        "QuizResults",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -4,6 +4,8 @@ from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import SQLModel, select
 
+from app.db.invalidation import publish_invalidation
+
 T = TypeVar("T", bound=SQLModel)
 
 
@@ -24,6 +26,13 @@ class AsyncBaseRepository(Generic[T]):
     async def get(self, session: AsyncSession, id: uuid.UUID) -> Optional[T]:
         return await session.get(self.model, id)
 
+    async def get_many(self, session: AsyncSession, ids: List[uuid.UUID]) -> List[T]:
+        if not ids:
+            return []
+        statement = select(self.model).where(self.model.id.in_(ids))
+        result = await session.execute(statement)
+        return result.scalars().all()
+
     async def get_all(
         self, session: AsyncSession, limit: int = 10, offset: int = 0
     ) -> List[T]:
@@ -43,3 +52,8 @@ class AsyncBaseRepository(Generic[T]):
         if commit:
             await session.commit()
         return True
+
+    async def publish_invalidation(
+        self, session: AsyncSession, namespace: str, *keys: Any
+    ):
+        await publish_invalidation(session, namespace, *keys)
@@ -1,8 +1,24 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, insert, select
+from sqlalchemy import (
+    and_,
+    any_,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.company_invite_request_model import (
     CompanyInviteRequestModel,
@@ -13,16 +29,204 @@ from app.models.company_model import CompanyModel
 from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
 from app.models.question_model import QuestionModel
 from app.models.quiz_model import QuizModel
+from app.models.quiz_version_model import QuizVersionModel
+from app.models.results import QuizResults
 from app.models.user_model import UserModel
 from app.repository.base_repository import AsyncBaseRepository
+from app.repository.company_access import CompanyAccess
+from app.repository.role_counters import bump_role_counters, bump_role_counters_many
+from app.repository.search import after_keyset
+from app.utils.search_util import SearchCursor
+
+
+def _uuid_array(ids: list[UUID]):
+    return any_(literal(list(ids), ARRAY(PG_UUID(as_uuid=True))))
+
+
+QUESTION_COPY_COLUMNS = ("id", "title", "options", "correct_answers", "quiz_id")
+
+
+def _company_purge_steps(company_id: UUID):
+    """(table, ids of its rows owned by the company), children before parents.
+
+    Deleting a result cascades to its answers in the database.
+    """
+    quiz_ids = select(QuizModel.id).where(QuizModel.company_id == company_id)
+    return (
+        (
+            QuizResults.__table__,
+            select(QuizResults.id).where(QuizResults.quiz_id.in_(quiz_ids)),
+        ),
+        (
+            QuestionModel.__table__,
+            select(QuestionModel.id).where(QuestionModel.quiz_id.in_(quiz_ids)),
+        ),
+        (QuizModel.__table__, quiz_ids),
+        (
+            CompanyUserRoleModel.__table__,
+            select(CompanyUserRoleModel.id).where(
+                CompanyUserRoleModel.company_id == company_id
+            ),
+        ),
+        (
+            CompanyInviteRequestModel.__table__,
+            select(CompanyInviteRequestModel.id).where(
+                CompanyInviteRequestModel.company_id == company_id
+            ),
+        ),
+    )
 
 
 class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
     def __init__(self):
         super().__init__(CompanyModel)
 
-    async def get_owner_company(self, db, company_id, user_id):
-        result = await db.execute(
+    async def get(self, session: AsyncSession, id: UUID):
+        company = await session.get(CompanyModel, id)
+        if company is None or company.deleted_at is not None:
+            return None
+        return company
+
+    async def get_all(self, session: AsyncSession, limit: int = 10, offset: int = 0):
+        result = await session.execute(
+            select(CompanyModel)
+            .where(CompanyModel.deleted_at.is_(None))
+            .limit(limit)
+            .offset(offset)
+        )
+        return result.scalars().all()
+
+    async def search_public_companies(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        after: SearchCursor | None = None,
+    ) -> list[tuple[CompanyModel, float]]:
+        """Listed companies whose name or description contains words like ``query``,
+        best match first; a name match outranks a description match."""
+        rank = func.greatest(
+            func.word_similarity(query, CompanyModel.name),
+            func.word_similarity(query, CompanyModel.description) * 0.5,
+        ).label("rank")
+        stmt = (
+            select(CompanyModel, rank)
+            .where(
+                CompanyModel.is_public.is_(True),
+                CompanyModel.deleted_at.is_(None),
+                or_(
+                    CompanyModel.name.op("%>")(query),
+                    CompanyModel.description.op("%>")(query),
+                ),
+            )
+            .order_by(rank.desc(), CompanyModel.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(after_keyset(rank, CompanyModel.id, after))
+        return (await session.execute(stmt)).tuples().all()
+
+    async def soft_delete_company(self, session: AsyncSession, company: CompanyModel):
+        company.deleted_at = func.now()
+        return await self.update(session, company)
+
+    async def get_deleted_company(self, session: AsyncSession, company_id: UUID):
+        result = await session.execute(
+            select(CompanyModel).where(
+                CompanyModel.id == company_id, CompanyModel.deleted_at.is_not(None)
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def purge_company_chunk(
+        self, session: AsyncSession, company_id: UUID, chunk_size: int
+    ) -> tuple[str, int] | None:
+        """Delete up to ``chunk_size`` rows of the first table still holding any.
+
+        Returns the table and row count, or None once only the company row is left.
+        """
+        for table, ids in _company_purge_steps(company_id):
+            result = await session.execute(
+                delete(table).where(table.c.id.in_(ids.limit(chunk_size)))
+            )
+            if result.rowcount:
+                return table.name, result.rowcount
+        return None
+
+    async def delete_purged_company(self, session: AsyncSession, company_id: UUID):
+        await session.execute(
+            delete(CompanyModel).where(
+                CompanyModel.id == company_id, CompanyModel.deleted_at.is_not(None)
+            )
+        )
+        await session.commit()
+
+    async def get_company_access(
+        self,
+        session: AsyncSession,
+        company_id: UUID,
+        user_id: UUID,
+        quiz_id: UUID | None = None,
+        question_id: UUID | None = None,
+        member_id: UUID | None = None,
+    ) -> CompanyAccess:
+        caller_role = aliased(CompanyUserRoleModel)
+        member_role = aliased(CompanyUserRoleModel)
+        entities = []
+        if quiz_id is not None:
+            entities.append(QuizModel)
+        if question_id is not None:
+            entities.append(QuestionModel)
+        if member_id is not None:
+            entities.append(member_role)
+
+        stmt = (
+            select(literal(True), caller_role.role, *entities)
+            .select_from(CompanyModel)
+            .outerjoin(
+                caller_role,
+                and_(
+                    caller_role.company_id == CompanyModel.id,
+                    caller_role.user_id == user_id,
+                ),
+            )
+            .where(CompanyModel.id == company_id, CompanyModel.deleted_at.is_(None))
+        )
+        if quiz_id is not None:
+            stmt = stmt.outerjoin(
+                QuizModel,
+                and_(QuizModel.id == quiz_id, QuizModel.company_id == CompanyModel.id),
+            )
+        if question_id is not None:
+            stmt = stmt.outerjoin(
+                QuestionModel,
+                and_(
+                    QuestionModel.id == question_id,
+                    QuestionModel.quiz_id == QuizModel.id,
+                ),
+            )
+        if member_id is not None:
+            stmt = stmt.outerjoin(
+                member_role,
+                and_(
+                    member_role.company_id == CompanyModel.id,
+                    member_role.user_id == member_id,
+                ),
+            )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return CompanyAccess(company_exists=False)
+        values = iter(row[2:])
+        return CompanyAccess(
+            company_exists=True,
+            role=row[1],
+            quiz=next(values) if quiz_id is not None else None,
+            question=next(values) if question_id is not None else None,
+            member=next(values) if member_id is not None else None,
+        )
+
+    async def get_owner_company(self, db, company_id, user_id, include_deleted=False):
+        stmt = (
             select(CompanyModel)
             .join(CompanyUserRoleModel)
             .where(
@@ -31,16 +235,39 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
                 CompanyUserRoleModel.role == RoleEnum.OWNER,
             )
         )
+        if not include_deleted:
+            stmt = stmt.where(CompanyModel.deleted_at.is_(None))
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def add_user_role(
-        self, db: AsyncSession, user_id: UUID, company_id: UUID, role: RoleEnum
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        company_id: UUID,
+        role: RoleEnum,
+        commit=True,
     ):
         owner_role = CompanyUserRoleModel(
             user_id=user_id, company_id=company_id, role=role.value
         )
         db.add(owner_role)
-        await db.commit()
+        await bump_role_counters(db, company_id, {role: 1})
+        if commit:
+            await db.commit()
+
+    async def change_user_role(
+        self,
+        db: AsyncSession,
+        user_role: CompanyUserRoleModel,
+        role: RoleEnum,
+        commit=True,
+    ):
+        await bump_role_counters(
+            db, user_role.company_id, {RoleEnum(user_role.role): -1, role: 1}
+        )
+        user_role.role = role
+        return await self.update(db, user_role, commit=commit)
 
     async def get_owner_company_ids(self, db: AsyncSession, user_id):
         result = await db.execute(
@@ -85,11 +312,13 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
 
     async def count_users(self, db: AsyncSession, company_id):
         result = await db.execute(
-            select(func.count(CompanyUserRoleModel.user_id)).where(
-                CompanyUserRoleModel.company_id == company_id
-            )
+            select(
+                CompanyModel.owners_count
+                + CompanyModel.admins_count
+                + CompanyModel.members_count
+            ).where(CompanyModel.id == company_id)
         )
-        return result.scalar()
+        return result.scalar() or 0
 
     async def get_users_with_roles(
         self, db: AsyncSession, company_id, limit: int, offset: int
@@ -97,7 +326,10 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
         result = await db.execute(
             select(UserModel, CompanyUserRoleModel.role)
             .join(CompanyUserRoleModel, CompanyUserRoleModel.user_id == UserModel.id)
-            .where(CompanyUserRoleModel.company_id == company_id)
+            .where(
+                CompanyUserRoleModel.company_id == company_id,
+                UserModel.is_active.is_(True),
+            )
             .offset(offset)
             .limit(limit)
         )
@@ -113,6 +345,9 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
         return result.scalar_one_or_none()
 
     async def delete_user_role(self, db: AsyncSession, user_role: CompanyUserRoleModel):
+        await bump_role_counters(
+            db, user_role.company_id, {RoleEnum(user_role.role): -1}
+        )
         await db.delete(user_role)
         await db.commit()
 
@@ -160,7 +395,7 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
         return await session.get(UserModel, user_id)
 
     async def get_company_by_id(self, session: AsyncSession, company_id: UUID):
-        return await session.get(CompanyModel, company_id)
+        return await self.get(session, company_id)
 
     async def get_company_admins(self, session, company_id):
         admins = (
@@ -201,35 +436,124 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_quiz_version(
+        self, session: AsyncSession, quiz_id: UUID, number: int
+    ) -> QuizVersionModel | None:
+        result = await session.execute(
+            select(QuizVersionModel).where(
+                QuizVersionModel.quiz_id == quiz_id, QuizVersionModel.number == number
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_questions_by_ids(
+        self, session: AsyncSession, question_ids: list[UUID]
+    ) -> list[QuestionModel]:
+        """The questions in ``question_ids`` order."""
+        if not question_ids:
+            return []
+        result = await session.execute(
+            select(QuestionModel).where(QuestionModel.id == _uuid_array(question_ids))
+        )
+        by_id = {question.id: question for question in result.scalars()}
+        return [by_id[question_id] for question_id in question_ids]
+
     async def get_all_quizzes(
         self, company_id: UUID, session: AsyncSession, limit: int = 10, offset: int = 0
-    ):
-        result = await session.execute(
-            select(QuizModel)
-            .options(selectinload(QuizModel.questions))
-            .where(QuizModel.company_id == company_id)
-            .offset(offset)
-            .limit(limit)
+    ) -> list[tuple[QuizModel, list[QuestionModel]]]:
+        """A page of quizzes, each with the questions of its current version."""
+        rows = (
+            await session.execute(
+                select(QuizModel, QuizVersionModel.question_ids)
+                .join(
+                    QuizVersionModel,
+                    and_(
+                        QuizVersionModel.quiz_id == QuizModel.id,
+                        QuizVersionModel.number == QuizModel.version,
+                    ),
+                )
+                .where(QuizModel.company_id == company_id)
+                .offset(offset)
+                .limit(limit)
+            )
+        ).all()
+        questions = await self.get_questions_by_ids(
+            session, [question_id for _, ids in rows for question_id in ids]
         )
-        return result.scalars().all()
+        by_id = {question.id: question for question in questions}
+        return [(quiz, [by_id[id] for id in ids]) for quiz, ids in rows]
 
     async def create_quiz(
-        self, session: AsyncSession, title: str, description: str, company_id: UUID
+        self,
+        session: AsyncSession,
+        title: str,
+        description: str,
+        company_id: UUID,
+        commit=True,
     ) -> QuizModel:
         quiz = QuizModel(title=title, description=description, company_id=company_id)
         session.add(quiz)
-        await session.commit()
-        await session.refresh(quiz)
+        if commit:
+            await session.commit()
+            await session.refresh(quiz)
+        else:
+            await session.flush()
         return quiz
 
     async def create_questions(
         self,
         session: AsyncSession,
         questions_list: list[dict],
+        commit=True,
     ):
         stmt = insert(QuestionModel).values(questions_list)
         await session.execute(stmt)
-        await session.commit()
+        if commit:
+            await session.commit()
+
+    async def add_question(self, session: AsyncSession, **data) -> QuestionModel:
+        question = QuestionModel(id=uuid4(), **data)
+        session.add(question)
+        return question
+
+    async def create_quiz_version(
+        self,
+        session: AsyncSession,
+        quiz: QuizModel,
+        question_ids: list[UUID],
+        commit=True,
+    ) -> QuizVersionModel | None:
+        """Publish ``question_ids`` as the quiz's next version and make it current.
+
+        Returns None if another edit published a version since ``quiz`` was read.
+        """
+        number = await session.scalar(
+            update(QuizModel)
+            .where(QuizModel.id == quiz.id, QuizModel.version == quiz.version)
+            .values(version=QuizModel.version + 1)
+            .returning(QuizModel.version)
+            .execution_options(synchronize_session=False)
+        )
+        if number is None:
+            return None
+        set_committed_value(quiz, "version", number)
+        version = QuizVersionModel(
+            id=uuid4(), quiz_id=quiz.id, number=number, question_ids=question_ids
+        )
+        session.add(version)
+        if commit:
+            await session.commit()
+        else:
+            await session.flush()
+        return version
+
+    async def copy_questions(self, session: AsyncSession, records: list[tuple]):
+        """COPY question rows over the session's connection, inside its transaction."""
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            QuestionModel.__tablename__, records=records, columns=QUESTION_COPY_COLUMNS
+        )
 
     async def get_quiz_by_id_and_company(
         self, session: AsyncSession, quiz_id: UUID, company_id: UUID
@@ -238,3 +562,174 @@ class CompaniesRepository(AsyncBaseRepository[CompanyModel]):
         if quiz and quiz.company_id == company_id:
             return quiz
         return None
+
+    # ===========================BULK MEMBERSHIP===========================
+
+    async def get_bulk_invite_state(
+        self, session: AsyncSession, company_id: UUID, user_ids: list[UUID]
+    ):
+        is_member = exists().where(
+            CompanyUserRoleModel.company_id == company_id,
+            CompanyUserRoleModel.user_id == UserModel.id,
+        )
+        has_pending_invite = exists().where(
+            CompanyInviteRequestModel.company_id == company_id,
+            CompanyInviteRequestModel.invited_user_id == UserModel.id,
+            CompanyInviteRequestModel.type == InviteType.INVITE,
+            CompanyInviteRequestModel.status == InviteStatus.PENDING,
+        )
+        result = await session.execute(
+            select(
+                UserModel.id,
+                is_member.label("is_member"),
+                has_pending_invite.label("has_pending_invite"),
+            ).where(UserModel.id == _uuid_array(user_ids))
+        )
+        return {row.id: row for row in result}
+
+    async def bulk_insert_invites(
+        self,
+        session: AsyncSession,
+        company_id: UUID,
+        invited_by_id: UUID,
+        user_ids: list[UUID],
+    ) -> list[UUID]:
+        if not user_ids:
+            return []
+        invites = CompanyInviteRequestModel.__table__
+        stmt = (
+            pg_insert(invites)
+            .values(
+                [
+                    {
+                        "id": uuid4(),
+                        "company_id": company_id,
+                        "invited_user_id": user_id,
+                        "invited_by_id": invited_by_id,
+                        "type": InviteType.INVITE.value,
+                        "status": InviteStatus.PENDING.value,
+                    }
+                    for user_id in user_ids
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=["company_id", "invited_user_id", "type"],
+                index_where=text("status = 'pending'"),
+            )
+            .returning(invites.c.invited_user_id)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_bulk_requests_state(
+        self, session: AsyncSession, request_ids: list[UUID], owner_id: UUID
+    ):
+        is_owner = exists().where(
+            CompanyUserRoleModel.company_id == CompanyInviteRequestModel.company_id,
+            CompanyUserRoleModel.user_id == owner_id,
+            CompanyUserRoleModel.role == RoleEnum.OWNER,
+        )
+        result = await session.execute(
+            select(
+                CompanyInviteRequestModel.id,
+                CompanyInviteRequestModel.type,
+                CompanyInviteRequestModel.status,
+                is_owner.label("is_owner"),
+            ).where(CompanyInviteRequestModel.id == _uuid_array(request_ids))
+        )
+        return {row.id: row for row in result}
+
+    async def bulk_resolve_requests(
+        self,
+        session: AsyncSession,
+        request_ids: list[UUID],
+        owner_id: UUID,
+        status: InviteStatus,
+    ):
+        invites = CompanyInviteRequestModel.__table__
+        owned_company_ids = select(CompanyUserRoleModel.company_id).where(
+            CompanyUserRoleModel.user_id == owner_id,
+            CompanyUserRoleModel.role == RoleEnum.OWNER,
+        )
+        stmt = (
+            update(invites)
+            .where(
+                invites.c.id == _uuid_array(request_ids),
+                invites.c.type == InviteType.REQUEST.value,
+                invites.c.status == InviteStatus.PENDING.value,
+                invites.c.company_id.in_(owned_company_ids),
+            )
+            .values(status=status.value)
+            .returning(invites.c.id, invites.c.company_id, invites.c.invited_user_id)
+        )
+        result = await session.execute(stmt)
+        return result.all()
+
+    async def bulk_add_members(
+        self, session: AsyncSession, memberships: list[tuple[UUID, UUID]]
+    ):
+        if not memberships:
+            return []
+        roles = CompanyUserRoleModel.__table__
+        stmt = (
+            pg_insert(roles)
+            .values(
+                [
+                    {
+                        "id": uuid4(),
+                        "company_id": company_id,
+                        "user_id": user_id,
+                        "role": RoleEnum.MEMBER.value,
+                    }
+                    for company_id, user_id in memberships
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["company_id", "user_id"])
+            .returning(roles.c.company_id, roles.c.user_id)
+        )
+        added = (await session.execute(stmt)).all()
+        deltas: dict[UUID, dict[RoleEnum, int]] = {}
+        for company_id, _ in added:
+            changes = deltas.setdefault(company_id, {RoleEnum.MEMBER: 0})
+            changes[RoleEnum.MEMBER] += 1
+        await bump_role_counters_many(session, deltas)
+        return added
+
+    async def get_member_roles(
+        self, session: AsyncSession, company_id: UUID, user_ids: list[UUID]
+    ) -> dict[UUID, RoleEnum]:
+        result = await session.execute(
+            select(CompanyUserRoleModel.user_id, CompanyUserRoleModel.role).where(
+                CompanyUserRoleModel.company_id == company_id,
+                CompanyUserRoleModel.user_id == _uuid_array(user_ids),
+            )
+        )
+        return {user_id: RoleEnum(role) for user_id, role in result}
+
+    async def bulk_change_roles(
+        self,
+        session: AsyncSession,
+        company_id: UUID,
+        user_ids: list[UUID],
+        from_role: RoleEnum,
+        to_role: RoleEnum,
+    ) -> list[UUID]:
+        if not user_ids:
+            return []
+        roles = CompanyUserRoleModel.__table__
+        stmt = (
+            update(roles)
+            .where(
+                roles.c.company_id == company_id,
+                roles.c.user_id == _uuid_array(user_ids),
+                roles.c.role == from_role.value,
+            )
+            .values(role=to_role.value)
+            .returning(roles.c.user_id)
+        )
+        changed = (await session.execute(stmt)).scalars().all()
+        if changed:
+            await bump_role_counters(
+                session, company_id, {from_role: -len(changed), to_role: len(changed)}
+            )
+        return changed
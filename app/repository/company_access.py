@@ -0,0 +1,45 @@
+import enum
+from dataclasses import dataclass
+
+from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+from app.models.question_model import QuestionModel
+from app.models.quiz_model import QuizModel
+
+
+class AccessOutcome(str, enum.Enum):
+    OK = "ok"
+    COMPANY_NOT_FOUND = "company_not_found"
+    FORBIDDEN = "forbidden"
+    QUIZ_NOT_FOUND = "quiz_not_found"
+    QUESTION_NOT_FOUND = "question_not_found"
+    MEMBER_NOT_FOUND = "member_not_found"
+
+
+@dataclass
+class CompanyAccess:
+    """Row of one authorize-and-load query: whatever was requested, or None."""
+
+    company_exists: bool
+    role: RoleEnum | None = None
+    quiz: QuizModel | None = None
+    question: QuestionModel | None = None
+    member: CompanyUserRoleModel | None = None
+
+    def outcome(
+        self,
+        allowed_roles: tuple[RoleEnum, ...],
+        quiz_requested: bool = False,
+        question_requested: bool = False,
+        member_requested: bool = False,
+    ) -> AccessOutcome:
+        if not self.company_exists:
+            return AccessOutcome.COMPANY_NOT_FOUND
+        if self.role not in allowed_roles:
+            return AccessOutcome.FORBIDDEN
+        if quiz_requested and self.quiz is None:
+            return AccessOutcome.QUIZ_NOT_FOUND
+        if question_requested and self.question is None:
+            return AccessOutcome.QUESTION_NOT_FOUND
+        if member_requested and self.member is None:
+            return AccessOutcome.MEMBER_NOT_FOUND
+        return AccessOutcome.OK
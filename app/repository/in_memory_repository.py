@@ -0,0 +1,1000 @@
+import uuid
+from collections import defaultdict, namedtuple
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.db.invalidation import invalidation_bus
+from app.models.company_invite_request_model import (
+    CompanyInviteRequestModel,
+    InviteStatus,
+    InviteType,
+)
+from app.models.company_model import CompanyModel
+from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+from app.models.question_model import QuestionModel
+from app.models.quiz_answer_model import QuizAnswer
+from app.models.quiz_model import QuizModel
+from app.models.quiz_version_model import QuizVersionModel
+from app.models.results import QuizResults
+from app.models.user_model import UserModel
+from app.repository.company_access import CompanyAccess
+from app.repository.role_counters import ROLE_COUNTER_COLUMNS
+from app.utils.dataloader import DataLoader, Loaders
+from app.utils.search_util import SearchCursor
+
+BulkInviteState = namedtuple("BulkInviteState", "id is_member has_pending_invite")
+BulkRequestState = namedtuple("BulkRequestState", "id type status is_owner")
+ResolvedRequest = namedtuple("ResolvedRequest", "id company_id invited_user_id")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _integrity_error(statement: str, detail: str) -> IntegrityError:
+    return IntegrityError(statement, {}, Exception(detail))
+
+
+def _match(query: str, text: str | None) -> float:
+    """Stand-in for pg_trgm word_similarity: prefix beats substring."""
+    query, text = query.lower(), (text or "").lower()
+    if text.startswith(query):
+        return 1.0
+    return 0.8 if query in text else 0.0
+
+
+def _search_page(scored, limit: int, after: SearchCursor | None):
+    """Matches ordered like ``ORDER BY rank DESC, id`` and cut after ``after``."""
+    rows = sorted(
+        ((obj, rank) for obj, rank in scored if rank > 0),
+        key=lambda row: (-row[1], row[0].id),
+    )
+    if after is not None:
+        after_rank, after_id = after
+        rows = [
+            (obj, rank)
+            for obj, rank in rows
+            if rank < after_rank or (rank == after_rank and obj.id > after_id)
+        ]
+    return rows[:limit]
+
+
+class InMemorySession:
+    """Stands in for AsyncSession: every write is applied by the repository itself."""
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj: Any):
+        pass
+
+    async def close(self):
+        pass
+
+
+class InMemoryStore:
+    """Tables plus the secondary indexes the repositories look rows up by."""
+
+    def __init__(self):
+        self.users: dict[UUID, UserModel] = {}
+        self.users_by_email: dict[str, UserModel] = {}
+        self.companies: dict[UUID, CompanyModel] = {}
+        self.roles_by_company: dict[UUID, dict[UUID, CompanyUserRoleModel]] = (
+            defaultdict(dict)
+        )
+        self.roles_by_user: dict[UUID, dict[UUID, CompanyUserRoleModel]] = defaultdict(
+            dict
+        )
+        self.invites: dict[UUID, CompanyInviteRequestModel] = {}
+        self.invites_by_company: dict[UUID, list[CompanyInviteRequestModel]] = (
+            defaultdict(list)
+        )
+        self.invites_by_user: dict[UUID, list[CompanyInviteRequestModel]] = defaultdict(
+            list
+        )
+        self.quizzes: dict[UUID, QuizModel] = {}
+        self.quizzes_by_company: dict[UUID, dict[UUID, QuizModel]] = defaultdict(dict)
+        self.questions: dict[UUID, QuestionModel] = {}
+        self.questions_by_quiz: dict[UUID, dict[UUID, QuestionModel]] = defaultdict(
+            dict
+        )
+        self.versions_by_quiz: dict[UUID, dict[int, QuizVersionModel]] = defaultdict(
+            dict
+        )
+        self.invites_by_inviter: dict[UUID, list[CompanyInviteRequestModel]] = (
+            defaultdict(list)
+        )
+        self.results: dict[UUID, QuizResults] = {}
+        self.results_by_quiz: dict[UUID, dict[UUID, QuizResults]] = defaultdict(dict)
+        self.results_by_user: dict[UUID, dict[UUID, QuizResults]] = defaultdict(dict)
+        self.answers: dict[UUID, QuizAnswer] = {}
+        self.answers_by_result: dict[UUID, dict[UUID, QuizAnswer]] = defaultdict(dict)
+        self.answers_by_question: dict[UUID, dict[UUID, QuizAnswer]] = defaultdict(dict)
+        self.answers_by_user: dict[UUID, dict[UUID, QuizAnswer]] = defaultdict(dict)
+
+    def tables(self, model: type) -> dict:
+        return {
+            UserModel: self.users,
+            CompanyModel: self.companies,
+            CompanyInviteRequestModel: self.invites,
+            QuizModel: self.quizzes,
+            QuestionModel: self.questions,
+        }[model]
+
+    def loaders(self) -> Loaders:
+        return InMemoryLoaders(self)
+
+    def live_company(self, company_id: UUID) -> CompanyModel | None:
+        company = self.companies.get(company_id)
+        if company is None or company.deleted_at is not None:
+            return None
+        return company
+
+    # ----------------------------------------------------------------- writes
+
+    def insert_user(self, user: UserModel) -> UserModel:
+        if user.email in self.users_by_email:
+            raise _integrity_error(
+                "INSERT INTO users", "duplicate key value violates ix_users_email"
+            )
+        self.users[user.id] = user
+        self.users_by_email[user.email] = user
+        return user
+
+    def insert_role(self, role: CompanyUserRoleModel) -> CompanyUserRoleModel:
+        if role.user_id in self.roles_by_company[role.company_id]:
+            raise _integrity_error(
+                "INSERT INTO company_user_roles",
+                "duplicate key value violates uq_company_user_roles_company_user",
+            )
+        self.roles_by_company[role.company_id][role.user_id] = role
+        self.roles_by_user[role.user_id][role.company_id] = role
+        self.bump_counters(role.company_id, {RoleEnum(role.role): 1})
+        return role
+
+    def remove_role(self, role: CompanyUserRoleModel):
+        self.roles_by_company[role.company_id].pop(role.user_id, None)
+        self.roles_by_user[role.user_id].pop(role.company_id, None)
+        self.bump_counters(role.company_id, {RoleEnum(role.role): -1})
+
+    def bump_counters(self, company_id: UUID, deltas: dict[RoleEnum, int]):
+        company = self.companies.get(company_id)
+        if company is None:
+            return
+        for role, delta in deltas.items():
+            key = ROLE_COUNTER_COLUMNS[RoleEnum(role)].key
+            setattr(company, key, getattr(company, key) + delta)
+
+    def has_pending(self, company_id: UUID, user_id: UUID, type: InviteType) -> bool:
+        return any(
+            invite.company_id == company_id
+            and invite.type == type
+            and invite.status == InviteStatus.PENDING
+            for invite in self.invites_by_user[user_id]
+        )
+
+    def insert_invite(
+        self, invite: CompanyInviteRequestModel
+    ) -> CompanyInviteRequestModel:
+        if invite.status == InviteStatus.PENDING and self.has_pending(
+            invite.company_id, invite.invited_user_id, invite.type
+        ):
+            raise _integrity_error(
+                "INSERT INTO company_invites",
+                "duplicate key value violates uq_company_invites_pending",
+            )
+        self.invites[invite.id] = invite
+        self.invites_by_company[invite.company_id].append(invite)
+        self.invites_by_user[invite.invited_user_id].append(invite)
+        if invite.invited_by_id is not None:
+            self.invites_by_inviter[invite.invited_by_id].append(invite)
+        return invite
+
+    def insert_quiz(self, quiz: QuizModel) -> QuizModel:
+        self.quizzes[quiz.id] = quiz
+        self.quizzes_by_company[quiz.company_id][quiz.id] = quiz
+        return quiz
+
+    def insert_question(self, question: QuestionModel) -> QuestionModel:
+        self.questions[question.id] = question
+        self.questions_by_quiz[question.quiz_id][question.id] = question
+        return question
+
+    def insert_version(self, version: QuizVersionModel) -> QuizVersionModel:
+        versions = self.versions_by_quiz[version.quiz_id]
+        if version.number in versions:
+            raise _integrity_error(
+                "INSERT INTO quiz_versions",
+                "duplicate key value violates uq_quiz_versions_quiz_number",
+            )
+        versions[version.number] = version
+        return version
+
+    def insert_answer(self, result: QuizResults, answer: QuizAnswer):
+        self.results[result.id] = result
+        self.results_by_quiz[result.quiz_id][result.id] = result
+        self.results_by_user[result.user_id][result.id] = result
+        self.answers[answer.id] = answer
+        self.answers_by_result[result.id][answer.id] = answer
+        self.answers_by_question[answer.question_id][answer.id] = answer
+        self.answers_by_user[result.user_id][answer.question_id] = answer
+
+    def remove_answer(self, answer: QuizAnswer):
+        self.answers.pop(answer.id, None)
+        self.answers_by_result[answer.quiz_result_id].pop(answer.id, None)
+        self.answers_by_question[answer.question_id].pop(answer.id, None)
+        result = self.results.get(answer.quiz_result_id)
+        if result is not None:
+            by_question = self.answers_by_user[result.user_id]
+            if by_question.get(answer.question_id) is answer:
+                del by_question[answer.question_id]
+
+    def remove_result(self, result: QuizResults):
+        for answer in list(self.answers_by_result.pop(result.id, {}).values()):
+            self.remove_answer(answer)
+        self.results.pop(result.id, None)
+        self.results_by_quiz[result.quiz_id].pop(result.id, None)
+        self.results_by_user[result.user_id].pop(result.id, None)
+
+    def remove_question(self, question: QuestionModel):
+        for answer in list(self.answers_by_question.pop(question.id, {}).values()):
+            self.remove_answer(answer)
+        self.questions.pop(question.id, None)
+        self.questions_by_quiz[question.quiz_id].pop(question.id, None)
+
+    def remove_quiz(self, quiz: QuizModel):
+        for result in list(self.results_by_quiz.pop(quiz.id, {}).values()):
+            self.remove_result(result)
+        for question in list(self.questions_by_quiz.pop(quiz.id, {}).values()):
+            self.remove_question(question)
+        self.versions_by_quiz.pop(quiz.id, None)
+        self.quizzes.pop(quiz.id, None)
+        self.quizzes_by_company[quiz.company_id].pop(quiz.id, None)
+
+    def remove_invite(self, invite: CompanyInviteRequestModel):
+        self.invites.pop(invite.id, None)
+        self.invites_by_company[invite.company_id].remove(invite)
+        self.invites_by_user[invite.invited_user_id].remove(invite)
+        if invite.invited_by_id is not None:
+            self.invites_by_inviter[invite.invited_by_id].remove(invite)
+
+    def drop_role(self, role: CompanyUserRoleModel):
+        """Remove a role the way ON DELETE CASCADE does, leaving counters alone."""
+        self.roles_by_company[role.company_id].pop(role.user_id, None)
+        self.roles_by_user[role.user_id].pop(role.company_id, None)
+
+    def remove_company(self, company: CompanyModel):
+        for invite in list(self.invites_by_company[company.id]):
+            self.remove_invite(invite)
+        for role in list(self.roles_by_company.pop(company.id, {}).values()):
+            self.roles_by_user[role.user_id].pop(company.id, None)
+        for quiz in list(self.quizzes_by_company.pop(company.id, {}).values()):
+            self.remove_quiz(quiz)
+        self.companies.pop(company.id, None)
+
+    def detach_invite(self, invite: CompanyInviteRequestModel):
+        """ON DELETE SET NULL of the inviting user."""
+        self.invites_by_inviter[invite.invited_by_id].remove(invite)
+        invite.invited_by_id = None
+
+    def remove_user(self, user: UserModel):
+        for invite in list(self.invites_by_user[user.id]):
+            self.remove_invite(invite)
+        for invite in list(self.invites_by_inviter[user.id]):
+            self.detach_invite(invite)
+        for role in list(self.roles_by_user.pop(user.id, {}).values()):
+            self.roles_by_company[role.company_id].pop(user.id, None)
+            self.bump_counters(role.company_id, {RoleEnum(role.role): -1})
+        for result in list(self.results_by_user.pop(user.id, {}).values()):
+            self.remove_result(result)
+        self.answers_by_user.pop(user.id, None)
+        self.users.pop(user.id, None)
+        self.users_by_email.pop(user.email, None)
+
+    def remove(self, obj: Any):
+        if isinstance(obj, UserModel):
+            self.remove_user(obj)
+        elif isinstance(obj, CompanyModel):
+            self.remove_company(obj)
+        elif isinstance(obj, QuizModel):
+            self.remove_quiz(obj)
+        elif isinstance(obj, QuestionModel):
+            self.remove_question(obj)
+        elif isinstance(obj, CompanyUserRoleModel):
+            self.remove_role(obj)
+        else:
+            raise TypeError(f"Cannot delete {type(obj).__name__} from memory store")
+
+
+class InMemoryLoaders(Loaders):
+    def __init__(self, store: InMemoryStore):
+        def by_id(table: dict) -> DataLoader:
+            async def batch(ids: list) -> dict:
+                return {id: table[id] for id in ids if id in table}
+
+            return DataLoader(batch)
+
+        self.users = by_id(store.users)
+        self.companies = by_id(store.companies)
+
+
+class _InMemoryRepository:
+    """Shared CRUD and membership lookups used by both repositories."""
+
+    model: type
+
+    def __init__(self, store: InMemoryStore | None = None):
+        self.store = store or InMemoryStore()
+
+    def _new(self, **data):
+        now = _now()
+        data.setdefault("id", uuid.uuid4())
+        obj = self.model(**data)
+        if hasattr(obj, "created_at"):
+            obj.created_at = now
+            obj.updated_at = now
+        return obj
+
+    async def create(self, session, data: Dict[str, Any], commit=True):
+        obj = self._new(**data)
+        if isinstance(obj, UserModel):
+            obj.is_active = True
+            return self.store.insert_user(obj)
+        if isinstance(obj, CompanyModel):
+            for column in ROLE_COUNTER_COLUMNS.values():
+                setattr(obj, column.key, 0)
+        self.store.tables(self.model)[obj.id] = obj
+        return obj
+
+    async def get(self, session, id: UUID):
+        return self.store.tables(self.model).get(id)
+
+    async def get_many(self, session, ids: List[UUID]):
+        table = self.store.tables(self.model)
+        return [table[id] for id in dict.fromkeys(ids) if id in table]
+
+    async def get_all(self, session, limit: int = 10, offset: int = 0):
+        return list(self.store.tables(self.model).values())[offset : offset + limit]
+
+    async def update(self, session, obj, commit=True):
+        if hasattr(obj, "updated_at"):
+            obj.updated_at = _now()
+        return obj
+
+    async def delete(self, session, obj, commit=True) -> bool:
+        self.store.remove(obj)
+        return True
+
+    async def publish_invalidation(self, session, namespace: str, *keys):
+        # No other processes share the store, so only local caches need evicting.
+        invalidation_bus.evict(namespace, keys)
+
+    async def get_user_role(self, db, company_id: UUID, user_id: UUID):
+        return self.store.roles_by_company[company_id].get(user_id)
+
+    async def get_users_with_roles(self, db, company_id, limit: int, offset: int):
+        rows = (
+            (self.store.users[role.user_id], role.role)
+            for role in self.store.roles_by_company[company_id].values()
+        )
+        active = ((user, role) for user, role in rows if user.is_active)
+        return list(islice(active, offset, offset + limit))
+
+    async def delete_user_role(self, db, user_role: CompanyUserRoleModel):
+        self.store.remove_role(user_role)
+
+    async def get_invite(self, session, invite_id: UUID):
+        return self.store.invites.get(invite_id)
+
+    async def get_quiz_by_id(
+        self, session, quiz_id: UUID, company_id: UUID | None = None
+    ):
+        quiz = self.store.quizzes.get(quiz_id)
+        if quiz is None or (company_id and quiz.company_id != company_id):
+            return None
+        return quiz
+
+    async def get_question_by_id(self, session, question_id: UUID, quiz_id: UUID):
+        return self.store.questions_by_quiz[quiz_id].get(question_id)
+
+    async def get_quiz_version(self, session, quiz_id: UUID, number: int):
+        return self.store.versions_by_quiz[quiz_id].get(number)
+
+    def _add_role(self, user_id: UUID, company_id: UUID, role: RoleEnum):
+        return self.store.insert_role(
+            CompanyUserRoleModel(
+                id=uuid.uuid4(), user_id=user_id, company_id=company_id, role=role
+            )
+        )
+
+    def _new_invite(self, **data) -> CompanyInviteRequestModel:
+        now = _now()
+        invite = CompanyInviteRequestModel(
+            id=uuid.uuid4(), created_at=now, updated_at=now, **data
+        )
+        return self.store.insert_invite(invite)
+
+
+class InMemoryUserRepository(_InMemoryRepository):
+    """Dict-backed twin of UserRepository with the same method contract."""
+
+    model = UserModel
+
+    async def get_by_email(self, session, email: str) -> Optional[UserModel]:
+        return self.store.users_by_email.get(email)
+
+    async def get(self, session, id: UUID):
+        user = self.store.users.get(id)
+        if user is None or not user.is_active:
+            return None
+        return user
+
+    async def get_all(self, session, limit: int = 10, offset: int = 0):
+        active = (user for user in self.store.users.values() if user.is_active)
+        return list(islice(active, offset, offset + limit))
+
+    async def search_users(
+        self, session, query: str, limit: int, after: SearchCursor | None = None
+    ):
+        scored = (
+            (
+                user,
+                max(
+                    _match(query, user.name),
+                    1.0 if user.email.lower().startswith(query.lower()) else 0.0,
+                ),
+            )
+            for user in self.store.users.values()
+            if user.is_active
+        )
+        return _search_page(scored, limit, after)
+
+    async def deactivate_user(self, session, user: UserModel):
+        user.is_active = False
+        return await self.update(session, user)
+
+    async def get_inactive_user(self, session, user_id: UUID):
+        user = self.store.users.get(user_id)
+        if user is None or user.is_active:
+            return None
+        return user
+
+    async def purge_user_chunk(self, session, user_id: UUID, chunk_size: int):
+        store = self.store
+        for table, rows, remove in (
+            (
+                "company_user_roles",
+                list(store.roles_by_user[user_id].values()),
+                store.remove_role,
+            ),
+            (
+                "results",
+                list(store.results_by_user[user_id].values()),
+                store.remove_result,
+            ),
+            (
+                "company_invites",
+                list(store.invites_by_user[user_id]),
+                store.remove_invite,
+            ),
+            (
+                "company_invites",
+                list(store.invites_by_inviter[user_id]),
+                store.detach_invite,
+            ),
+        ):
+            if rows:
+                for row in rows[:chunk_size]:
+                    remove(row)
+                return table, len(rows[:chunk_size])
+        return None
+
+    async def delete_purged_user(self, session, user_id: UUID):
+        user = await self.get_inactive_user(session, user_id)
+        if user is not None:
+            self.store.remove_user(user)
+
+    async def leave_company(self, db, user_role: CompanyUserRoleModel) -> bool:
+        company = self.store.companies.get(user_role.company_id)
+        if RoleEnum(user_role.role) == RoleEnum.OWNER and company.owners_count <= 1:
+            return False
+        self.store.remove_role(user_role)
+        return True
+
+    async def get_user_requests(self, session, user_id: UUID):
+        return [
+            invite
+            for invite in self.store.invites_by_user[user_id]
+            if invite.type == InviteType.REQUEST
+        ]
+
+    async def get_user_invites(self, session, user_id: UUID):
+        return [
+            invite
+            for invite in self.store.invites_by_user[user_id]
+            if invite.type == InviteType.INVITE
+        ]
+
+    async def get_company(self, session, company_id: UUID):
+        return self.store.live_company(company_id)
+
+    async def get_quiz_by_id(
+        self, session, quiz_id: UUID, company_id: UUID | None = None
+    ):
+        quiz = await super().get_quiz_by_id(session, quiz_id, company_id)
+        if quiz is None or self.store.live_company(quiz.company_id) is None:
+            return None
+        return quiz
+
+    async def add_user_role(self, db, user_id: UUID, company_id: UUID, role: RoleEnum):
+        self._add_role(user_id, company_id, role)
+
+    async def send_request(self, db, company_id: UUID, invited_user_id: UUID):
+        return self._new_invite(
+            company_id=company_id,
+            invited_user_id=invited_user_id,
+            invited_by_id=None,
+            type=InviteType.REQUEST,
+            status=InviteStatus.PENDING,
+        )
+
+    async def get_result_by_user_question(self, session, user_id, question_id):
+        return self.store.answers_by_user[user_id].get(question_id)
+
+    async def create_result_with_answer(
+        self,
+        session,
+        user_id: UUID,
+        quiz_id: UUID,
+        version_id: UUID,
+        question_id: UUID,
+        selected_options: list[int],
+    ):
+        now = _now()
+        quiz_result = QuizResults(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            quiz_id=quiz_id,
+            version_id=version_id,
+            is_done=True,
+            created_at=now,
+            updated_at=now,
+        )
+        quiz_answer = QuizAnswer(
+            id=uuid.uuid4(),
+            quiz_result_id=quiz_result.id,
+            question_id=question_id,
+            selected_answers=selected_options,
+            created_at=now,
+            updated_at=now,
+        )
+        quiz_answer.quiz_result = quiz_result
+        self.store.insert_answer(quiz_result, quiz_answer)
+
+    async def insert_answers(
+        self, session, results: list[dict], answers: list[dict]
+    ) -> set[UUID]:
+        # Checked up front, so a bad row rejects the whole batch like Postgres.
+        if any(
+            row["user_id"] not in self.store.users
+            or row["quiz_id"] not in self.store.quizzes
+            for row in results
+        ) or any(row["question_id"] not in self.store.questions for row in answers):
+            raise _integrity_error("INSERT INTO results", "foreign key violation")
+        new_results = {
+            row["id"]: QuizResults(**row)
+            for row in results
+            if row["id"] not in self.store.results
+        }
+        for row in answers:
+            result = new_results.get(row["quiz_result_id"])
+            if result is not None:
+                quiz_answer = QuizAnswer(**row)
+                quiz_answer.quiz_result = result
+                self.store.insert_answer(result, quiz_answer)
+        return set(new_results)
+
+    async def get_user_average_score(
+        self, session, user_id: UUID, company_id: UUID | None = None
+    ) -> float:
+        total_correct = 0
+        total_answered = 0
+        for answer in self.store.answers_by_user[user_id].values():
+            result = self.store.results[answer.quiz_result_id]
+            if not result.is_done:
+                continue
+            if company_id:
+                quiz = self.store.quizzes.get(result.quiz_id)
+                if quiz is None or quiz.company_id != company_id:
+                    continue
+            question = self.store.questions[answer.question_id]
+            if set(answer.selected_answers) == set(question.correct_answers):
+                total_correct += 1
+            total_answered += 1
+
+        if total_answered == 0:
+            return 0.0
+
+        return total_correct / total_answered * 100
+
+
+class InMemoryCompaniesRepository(_InMemoryRepository):
+    """Dict-backed twin of CompaniesRepository with the same method contract."""
+
+    model = CompanyModel
+
+    async def get(self, session, id: UUID):
+        return self.store.live_company(id)
+
+    async def get_all(self, session, limit: int = 10, offset: int = 0):
+        live = (c for c in self.store.companies.values() if c.deleted_at is None)
+        return list(islice(live, offset, offset + limit))
+
+    async def search_public_companies(
+        self, session, query: str, limit: int, after: SearchCursor | None = None
+    ):
+        scored = (
+            (
+                company,
+                max(
+                    _match(query, company.name),
+                    _match(query, company.description) * 0.5,
+                ),
+            )
+            for company in self.store.companies.values()
+            if company.is_public and company.deleted_at is None
+        )
+        return _search_page(scored, limit, after)
+
+    async def soft_delete_company(self, session, company: CompanyModel):
+        company.deleted_at = _now()
+        return await self.update(session, company)
+
+    async def get_deleted_company(self, session, company_id: UUID):
+        company = self.store.companies.get(company_id)
+        if company is None or company.deleted_at is None:
+            return None
+        return company
+
+    def _company_purge_steps(self, company_id: UUID):
+        store = self.store
+        quizzes = list(store.quizzes_by_company[company_id].values())
+        return (
+            (
+                "results",
+                [r for q in quizzes for r in store.results_by_quiz[q.id].values()],
+                store.remove_result,
+            ),
+            (
+                "questions",
+                [x for q in quizzes for x in store.questions_by_quiz[q.id].values()],
+                store.remove_question,
+            ),
+            ("quizzes", quizzes, store.remove_quiz),
+            (
+                "company_user_roles",
+                list(store.roles_by_company[company_id].values()),
+                store.drop_role,
+            ),
+            (
+                "company_invites",
+                list(store.invites_by_company[company_id]),
+                store.remove_invite,
+            ),
+        )
+
+    async def purge_company_chunk(self, session, company_id: UUID, chunk_size: int):
+        for table, rows, remove in self._company_purge_steps(company_id):
+            if rows:
+                for row in rows[:chunk_size]:
+                    remove(row)
+                return table, len(rows[:chunk_size])
+        return None
+
+    async def delete_purged_company(self, session, company_id: UUID):
+        company = await self.get_deleted_company(session, company_id)
+        if company is not None:
+            self.store.remove_company(company)
+
+    async def get_company_access(
+        self,
+        session,
+        company_id: UUID,
+        user_id: UUID,
+        quiz_id: UUID | None = None,
+        question_id: UUID | None = None,
+        member_id: UUID | None = None,
+    ) -> CompanyAccess:
+        if self.store.live_company(company_id) is None:
+            return CompanyAccess(company_exists=False)
+        roles = self.store.roles_by_company[company_id]
+        caller = roles.get(user_id)
+        quiz = question = member = None
+        if quiz_id is not None:
+            quiz = self.store.quizzes_by_company[company_id].get(quiz_id)
+        if question_id is not None and quiz is not None:
+            question = self.store.questions_by_quiz[quiz.id].get(question_id)
+        if member_id is not None:
+            member = roles.get(member_id)
+        return CompanyAccess(
+            company_exists=True,
+            role=caller.role if caller else None,
+            quiz=quiz,
+            question=question,
+            member=member,
+        )
+
+    async def get_owner_company(self, db, company_id, user_id, include_deleted=False):
+        role = self.store.roles_by_company[company_id].get(user_id)
+        if role is None or role.role != RoleEnum.OWNER:
+            return None
+        if include_deleted:
+            return self.store.companies.get(company_id)
+        return self.store.live_company(company_id)
+
+    async def add_user_role(
+        self, db, user_id: UUID, company_id: UUID, role: RoleEnum, commit=True
+    ):
+        self._add_role(user_id, company_id, role)
+
+    async def change_user_role(
+        self, db, user_role: CompanyUserRoleModel, role: RoleEnum, commit=True
+    ):
+        self.store.bump_counters(
+            user_role.company_id, {RoleEnum(user_role.role): -1, role: 1}
+        )
+        user_role.role = role
+        return user_role
+
+    def _company_ids_with_roles(self, user_id: UUID, roles: tuple[RoleEnum, ...]):
+        return [
+            company_id
+            for company_id, role in self.store.roles_by_user[user_id].items()
+            if role.role in roles
+        ]
+
+    async def get_owner_company_ids(self, db, user_id):
+        return self._company_ids_with_roles(user_id, (RoleEnum.OWNER,))
+
+    async def get_owner_or_admin_company_ids(self, db, user_id):
+        return self._company_ids_with_roles(user_id, (RoleEnum.OWNER, RoleEnum.ADMIN))
+
+    async def get_invited_user_ids(self, db, company_ids: list):
+        return [
+            invite.invited_user_id
+            for company_id in company_ids
+            for invite in self.store.invites_by_company[company_id]
+            if invite.type == InviteType.INVITE
+        ]
+
+    async def get_pending_requests(self, db, company_ids: list):
+        return [
+            invite
+            for company_id in company_ids
+            for invite in self.store.invites_by_company[company_id]
+            if invite.type == InviteType.REQUEST
+            and invite.status == InviteStatus.PENDING
+        ]
+
+    async def get_membership(self, db, company_id, user_id):
+        return self.store.roles_by_company[company_id].get(user_id)
+
+    async def count_users(self, db, company_id):
+        company = self.store.companies.get(company_id)
+        if company is None:
+            return 0
+        return sum(
+            getattr(company, column.key) for column in ROLE_COUNTER_COLUMNS.values()
+        )
+
+    async def cancel_invite(self, session, invite: CompanyInviteRequestModel):
+        invite.status = InviteStatus.CANCELED
+        await self.update(session, invite)
+        return invite
+
+    async def send_invite(
+        self, session, company_id: UUID, invited_user_id: UUID, invited_by_id: UUID
+    ):
+        return self._new_invite(
+            company_id=company_id,
+            invited_user_id=invited_user_id,
+            invited_by_id=invited_by_id,
+            type=InviteType.INVITE,
+            status=InviteStatus.PENDING,
+        )
+
+    async def get_users_by_ids(self, db, user_ids: list[UUID]):
+        return [self.store.users[id] for id in user_ids if id in self.store.users]
+
+    async def get_by_id(self, session, user_id: UUID):
+        return self.store.users.get(user_id)
+
+    async def get_company_by_id(self, session, company_id: UUID):
+        return self.store.live_company(company_id)
+
+    async def get_company_admins(self, session, company_id):
+        return [
+            self.store.users[role.user_id]
+            for role in self.store.roles_by_company[company_id].values()
+            if role.role == RoleEnum.ADMIN
+        ]
+
+    async def get_questions_by_ids(self, session, question_ids: list[UUID]):
+        return [self.store.questions[question_id] for question_id in question_ids]
+
+    async def get_all_quizzes(
+        self, company_id: UUID, session, limit: int = 10, offset: int = 0
+    ):
+        quizzes = list(self.store.quizzes_by_company[company_id].values())
+        return [
+            (
+                quiz,
+                await self.get_questions_by_ids(
+                    session,
+                    self.store.versions_by_quiz[quiz.id][quiz.version].question_ids,
+                ),
+            )
+            for quiz in quizzes[offset : offset + limit]
+        ]
+
+    async def create_quiz(
+        self, session, title: str, description: str, company_id: UUID, commit=True
+    ) -> QuizModel:
+        return self.store.insert_quiz(
+            QuizModel(
+                id=uuid.uuid4(),
+                title=title,
+                description=description,
+                company_id=company_id,
+                total_participation=0,
+                version=0,
+            )
+        )
+
+    async def create_questions(self, session, questions_list: list[dict], commit=True):
+        for data in questions_list:
+            self.store.insert_question(QuestionModel(**data))
+
+    async def add_question(self, session, **data) -> QuestionModel:
+        return self.store.insert_question(QuestionModel(id=uuid.uuid4(), **data))
+
+    async def create_quiz_version(
+        self, session, quiz: QuizModel, question_ids: list[UUID], commit=True
+    ) -> QuizVersionModel | None:
+        if max(self.store.versions_by_quiz[quiz.id], default=0) != quiz.version:
+            return None
+        quiz.version += 1
+        return self.store.insert_version(
+            QuizVersionModel(
+                id=uuid.uuid4(),
+                quiz_id=quiz.id,
+                number=quiz.version,
+                question_ids=list(question_ids),
+                created_at=_now(),
+            )
+        )
+
+    async def copy_questions(self, session, records: list[tuple]):
+        for id, title, options, correct_answers, quiz_id in records:
+            self.store.insert_question(
+                QuestionModel(
+                    id=id,
+                    title=title,
+                    options=options,
+                    correct_answers=correct_answers,
+                    quiz_id=quiz_id,
+                )
+            )
+
+    async def get_quiz_by_id_and_company(self, session, quiz_id, company_id):
+        return await self.get_quiz_by_id(session, quiz_id, company_id)
+
+    # ===========================BULK MEMBERSHIP===========================
+
+    async def get_bulk_invite_state(self, session, company_id, user_ids):
+        roles = self.store.roles_by_company[company_id]
+        return {
+            user_id: BulkInviteState(
+                id=user_id,
+                is_member=user_id in roles,
+                has_pending_invite=self.store.has_pending(
+                    company_id, user_id, InviteType.INVITE
+                ),
+            )
+            for user_id in user_ids
+            if user_id in self.store.users
+        }
+
+    async def bulk_insert_invites(self, session, company_id, invited_by_id, user_ids):
+        inserted = []
+        for user_id in user_ids:
+            if self.store.has_pending(company_id, user_id, InviteType.INVITE):
+                continue
+            self._new_invite(
+                company_id=company_id,
+                invited_user_id=user_id,
+                invited_by_id=invited_by_id,
+                type=InviteType.INVITE,
+                status=InviteStatus.PENDING,
+            )
+            inserted.append(user_id)
+        return inserted
+
+    def _owns(self, owner_id: UUID, company_id: UUID) -> bool:
+        role = self.store.roles_by_user[owner_id].get(company_id)
+        return role is not None and role.role == RoleEnum.OWNER
+
+    async def get_bulk_requests_state(self, session, request_ids, owner_id):
+        state = {}
+        for request_id in request_ids:
+            invite = self.store.invites.get(request_id)
+            if invite is not None:
+                state[request_id] = BulkRequestState(
+                    id=request_id,
+                    type=invite.type,
+                    status=invite.status,
+                    is_owner=self._owns(owner_id, invite.company_id),
+                )
+        return state
+
+    async def bulk_resolve_requests(self, session, request_ids, owner_id, status):
+        resolved = []
+        for request_id in request_ids:
+            invite = self.store.invites.get(request_id)
+            if (
+                invite is not None
+                and invite.type == InviteType.REQUEST
+                and invite.status == InviteStatus.PENDING
+                and self._owns(owner_id, invite.company_id)
+            ):
+                invite.status = status
+                invite.updated_at = _now()
+                resolved.append(
+                    ResolvedRequest(
+                        invite.id, invite.company_id, invite.invited_user_id
+                    )
+                )
+        return resolved
+
+    async def bulk_add_members(self, session, memberships):
+        added = []
+        for company_id, user_id in memberships:
+            if user_id in self.store.roles_by_company[company_id]:
+                continue
+            self._add_role(user_id, company_id, RoleEnum.MEMBER)
+            added.append((company_id, user_id))
+        return added
+
+    async def get_member_roles(self, session, company_id, user_ids):
+        roles = self.store.roles_by_company[company_id]
+        return {
+            user_id: RoleEnum(roles[user_id].role)
+            for user_id in user_ids
+            if user_id in roles
+        }
+
+    async def bulk_change_roles(
+        self, session, company_id, user_ids, from_role, to_role
+    ):
+        roles = self.store.roles_by_company[company_id]
+        changed = []
+        for user_id in user_ids:
+            role = roles.get(user_id)
+            if role is not None and role.role == from_role:
+                role.role = to_role
+                changed.append(user_id)
+        if changed:
+            self.store.bump_counters(
+                company_id, {from_role: -len(changed), to_role: len(changed)}
+            )
+        return changed
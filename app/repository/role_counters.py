@@ -0,0 +1,123 @@
+from uuid import UUID
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.company_model import CompanyModel
+from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+
+ROLE_COUNTER_COLUMNS = {
+    RoleEnum.OWNER: CompanyModel.owners_count,
+    RoleEnum.ADMIN: CompanyModel.admins_count,
+    RoleEnum.MEMBER: CompanyModel.members_count,
+}
+
+
+async def bump_role_counters(
+    db: AsyncSession, company_id: UUID, deltas: dict[RoleEnum, int]
+):
+    values = {}
+    for role, delta in deltas.items():
+        if delta:
+            column = ROLE_COUNTER_COLUMNS[RoleEnum(role)]
+            values[column.key] = column + delta
+    if not values:
+        return
+    await db.execute(
+        update(CompanyModel)
+        .where(CompanyModel.id == company_id)
+        .values(**values, updated_at=CompanyModel.updated_at)
+    )
+
+
+async def bump_role_counters_many(
+    db: AsyncSession, deltas: dict[UUID, dict[RoleEnum, int]]
+):
+    values = {}
+    for role, column in ROLE_COUNTER_COLUMNS.items():
+        per_company = {
+            company_id: changes[role]
+            for company_id, changes in deltas.items()
+            if changes.get(role)
+        }
+        if per_company:
+            values[column.key] = column + case(
+                per_company, value=CompanyModel.id, else_=0
+            )
+    if not values:
+        return
+    await db.execute(
+        update(CompanyModel)
+        .where(CompanyModel.id.in_(list(deltas)))
+        .values(**values, updated_at=CompanyModel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def release_user_counters(db: AsyncSession, user_id: UUID):
+    per_company = (
+        select(
+            CompanyUserRoleModel.company_id.label("company_id"),
+            *[
+                func.count().filter(CompanyUserRoleModel.role == role).label(column.key)
+                for role, column in ROLE_COUNTER_COLUMNS.items()
+            ],
+        )
+        .where(CompanyUserRoleModel.user_id == user_id)
+        .group_by(CompanyUserRoleModel.company_id)
+        .subquery()
+    )
+    await db.execute(
+        update(CompanyModel)
+        .where(CompanyModel.id == per_company.c.company_id)
+        .values(
+            **{
+                column.key: column - per_company.c[column.key]
+                for column in ROLE_COUNTER_COLUMNS.values()
+            },
+            updated_at=CompanyModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _actual_count(role: RoleEnum):
+    return (
+        select(func.count())
+        .where(
+            CompanyUserRoleModel.company_id == CompanyModel.id,
+            CompanyUserRoleModel.role == role,
+        )
+        .correlate(CompanyModel)
+        .scalar_subquery()
+    )
+
+
+async def reconcile_role_counters(
+    db: AsyncSession, company_ids: list[UUID] | None = None
+) -> int:
+    actual = {role: _actual_count(role) for role in ROLE_COUNTER_COLUMNS}
+    stmt = (
+        update(CompanyModel)
+        .where(
+            or_(
+                *[
+                    column != actual[role]
+                    for role, column in ROLE_COUNTER_COLUMNS.items()
+                ]
+            )
+        )
+        .values(
+            **{
+                column.key: actual[role]
+                for role, column in ROLE_COUNTER_COLUMNS.items()
+            },
+            updated_at=CompanyModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if company_ids is not None:
+        stmt = stmt.where(CompanyModel.id.in_(company_ids))
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,9 @@
+from sqlalchemy import and_, or_
+
+from app.utils.search_util import SearchCursor
+
+
+def after_keyset(rank, id_column, after: SearchCursor):
+    """Rows after ``after`` in ``ORDER BY rank DESC, id`` order."""
+    after_rank, after_id = after
+    return or_(rank < after_rank, and_(rank == after_rank, id_column > after_id))
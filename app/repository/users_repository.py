@@ -1,6 +1,7 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -14,9 +15,17 @@ from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
 from app.models.question_model import QuestionModel
 from app.models.quiz_answer_model import QuizAnswer
 from app.models.quiz_model import QuizModel
+from app.models.quiz_version_model import QuizVersionModel
 from app.models.results import QuizResults
 from app.models.user_model import UserModel
 from app.repository.base_repository import AsyncBaseRepository
+from app.repository.role_counters import (
+    bump_role_counters,
+    bump_role_counters_many,
+    release_user_counters,
+)
+from app.repository.search import after_keyset
+from app.utils.search_util import SearchCursor
 
 
 class UserRepository(AsyncBaseRepository[UserModel]):
@@ -27,13 +36,144 @@ class UserRepository(AsyncBaseRepository[UserModel]):
         res = await session.execute(select(UserModel).where(UserModel.email == email))
         return res.scalar_one_or_none()
 
+    async def get(self, session: AsyncSession, id: UUID) -> UserModel | None:
+        user = await session.get(UserModel, id)
+        if user is None or not user.is_active:
+            return None
+        return user
+
+    async def get_all(self, session: AsyncSession, limit: int = 10, offset: int = 0):
+        result = await session.execute(
+            select(UserModel)
+            .where(UserModel.is_active.is_(True))
+            .limit(limit)
+            .offset(offset)
+        )
+        return result.scalars().all()
+
+    async def search_users(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        after: SearchCursor | None = None,
+    ) -> list[tuple[UserModel, float]]:
+        """Active users with a name like ``query`` or an email starting with it,
+        best match first."""
+        email = func.lower(UserModel.email)
+        rank = func.greatest(
+            func.word_similarity(query, UserModel.name),
+            func.similarity(email, query.lower()),
+        ).label("rank")
+        stmt = (
+            select(UserModel, rank)
+            .where(
+                UserModel.is_active.is_(True),
+                or_(
+                    UserModel.name.op("%>")(query),
+                    email.startswith(query.lower(), autoescape=True),
+                ),
+            )
+            .order_by(rank.desc(), UserModel.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(after_keyset(rank, UserModel.id, after))
+        return (await session.execute(stmt)).tuples().all()
+
+    async def deactivate_user(self, session: AsyncSession, user: UserModel):
+        user.is_active = False
+        return await self.update(session, user)
+
+    async def get_inactive_user(self, session: AsyncSession, user_id: UUID):
+        result = await session.execute(
+            select(UserModel).where(
+                UserModel.id == user_id, UserModel.is_active.is_(False)
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def purge_user_chunk(
+        self, session: AsyncSession, user_id: UUID, chunk_size: int
+    ) -> tuple[str, int] | None:
+        """Delete or detach up to ``chunk_size`` rows that still reference the user.
+
+        Roles go first, together with the counters of their companies; deleting
+        a result cascades to its answers. Returns None once only the user is left.
+        """
+        roles = CompanyUserRoleModel.__table__
+        removed = (
+            await session.execute(
+                delete(roles)
+                .where(
+                    roles.c.id.in_(
+                        select(roles.c.id)
+                        .where(roles.c.user_id == user_id)
+                        .limit(chunk_size)
+                    )
+                )
+                .returning(roles.c.company_id, roles.c.role)
+            )
+        ).all()
+        if removed:
+            deltas: dict[UUID, dict[RoleEnum, int]] = {}
+            for company_id, role in removed:
+                changes = deltas.setdefault(company_id, {})
+                changes[RoleEnum(role)] = changes.get(RoleEnum(role), 0) - 1
+            await bump_role_counters_many(session, deltas)
+            return roles.name, len(removed)
+
+        results = QuizResults.__table__
+        invites = CompanyInviteRequestModel.__table__
+        for stmt in (
+            delete(results).where(
+                results.c.id.in_(
+                    select(results.c.id)
+                    .where(results.c.user_id == user_id)
+                    .limit(chunk_size)
+                )
+            ),
+            delete(invites).where(
+                invites.c.id.in_(
+                    select(invites.c.id)
+                    .where(invites.c.invited_user_id == user_id)
+                    .limit(chunk_size)
+                )
+            ),
+            # Invites the user sent belong to their companies; keep them unsigned.
+            update(invites)
+            .where(
+                invites.c.id.in_(
+                    select(invites.c.id)
+                    .where(invites.c.invited_by_id == user_id)
+                    .limit(chunk_size)
+                )
+            )
+            .values(invited_by_id=None),
+        ):
+            result = await session.execute(stmt)
+            if result.rowcount:
+                return stmt.table.name, result.rowcount
+        return None
+
+    async def delete_purged_user(self, session: AsyncSession, user_id: UUID):
+        await session.execute(
+            delete(UserModel).where(
+                UserModel.id == user_id, UserModel.is_active.is_(False)
+            )
+        )
+        await session.commit()
+
     async def get_users_with_roles(
         self, db: AsyncSession, company_id, limit: int, offset: int
     ):
         result = await db.execute(
             select(UserModel, CompanyUserRoleModel.role)
             .join(CompanyUserRoleModel, CompanyUserRoleModel.user_id == UserModel.id)
-            .where(CompanyUserRoleModel.company_id == company_id)
+            .where(
+                CompanyUserRoleModel.company_id == company_id,
+                UserModel.is_active.is_(True),
+            )
             .offset(offset)
             .limit(limit)
         )
@@ -48,9 +188,48 @@ class UserRepository(AsyncBaseRepository[UserModel]):
         )
         return result.scalar_one_or_none()
 
+    async def delete(self, session: AsyncSession, obj: UserModel, commit=True) -> bool:
+        await release_user_counters(session, obj.id)
+        return await super().delete(session, obj, commit=commit)
+
     async def delete_user_role(self, db: AsyncSession, user_role: CompanyUserRoleModel):
+        await bump_role_counters(
+            db, user_role.company_id, {RoleEnum(user_role.role): -1}
+        )
+        await db.delete(user_role)
+        await db.commit()
+
+    async def leave_company(
+        self, db: AsyncSession, user_role: CompanyUserRoleModel
+    ) -> bool:
+        """Delete the user's own role; False if they are the company's last owner.
+
+        An owner's leave decrements owners_count only while it stays above zero,
+        in the same UPDATE that checks it, so two owners leaving at once can't
+        both succeed.
+        """
+        role = RoleEnum(user_role.role)
+        if role == RoleEnum.OWNER:
+            kept = await db.execute(
+                update(CompanyModel)
+                .where(
+                    CompanyModel.id == user_role.company_id,
+                    CompanyModel.owners_count > 1,
+                )
+                .values(
+                    owners_count=CompanyModel.owners_count - 1,
+                    updated_at=CompanyModel.updated_at,
+                )
+                .returning(CompanyModel.id)
+            )
+            if kept.scalar_one_or_none() is None:
+                await db.rollback()
+                return False
+        else:
+            await bump_role_counters(db, user_role.company_id, {role: -1})
         await db.delete(user_role)
         await db.commit()
+        return True
 
     async def get_user_requests(self, session: AsyncSession, user_id: UUID):
         result = await session.execute(
@@ -72,7 +251,9 @@ class UserRepository(AsyncBaseRepository[UserModel]):
 
     async def get_company(self, session: AsyncSession, company_id: UUID):
         seek_company = await session.execute(
-            select(CompanyModel).where(CompanyModel.id == company_id)
+            select(CompanyModel).where(
+                CompanyModel.id == company_id, CompanyModel.deleted_at.is_(None)
+            )
         )
         return seek_company.scalar_one_or_none()
 
@@ -91,6 +272,7 @@ class UserRepository(AsyncBaseRepository[UserModel]):
             user_id=user_id, company_id=company_id, role=role.value
         )
         db.add(owner_role)
+        await bump_role_counters(db, company_id, {role: 1})
         await db.commit()
 
     async def send_request(
@@ -126,7 +308,11 @@ class UserRepository(AsyncBaseRepository[UserModel]):
     async def get_quiz_by_id(
         self, session: AsyncSession, quiz_id: UUID, company_id: UUID | None = None
     ):
-        stmt = select(QuizModel).where(QuizModel.id == quiz_id)
+        stmt = (
+            select(QuizModel)
+            .join(CompanyModel, CompanyModel.id == QuizModel.company_id)
+            .where(QuizModel.id == quiz_id, CompanyModel.deleted_at.is_(None))
+        )
         if company_id:
             stmt = stmt.where(QuizModel.company_id == company_id)
         result = await session.execute(stmt)
@@ -141,15 +327,28 @@ class UserRepository(AsyncBaseRepository[UserModel]):
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_quiz_version(
+        self, session: AsyncSession, quiz_id: UUID, number: int
+    ) -> QuizVersionModel | None:
+        result = await session.execute(
+            select(QuizVersionModel).where(
+                QuizVersionModel.quiz_id == quiz_id, QuizVersionModel.number == number
+            )
+        )
+        return result.scalar_one_or_none()
+
     async def create_result_with_answer(
         self,
         session: AsyncSession,
         user_id: UUID,
         quiz_id: UUID,
+        version_id: UUID,
         question_id: UUID,
         selected_options: list[int],
     ) -> tuple[QuizResults, QuizAnswer]:
-        quiz_result = QuizResults(user_id=user_id, quiz_id=quiz_id, is_done=True)
+        quiz_result = QuizResults(
+            user_id=user_id, quiz_id=quiz_id, version_id=version_id, is_done=True
+        )
 
         quiz_answer = QuizAnswer(
             quiz_result=quiz_result,
@@ -162,6 +361,27 @@ class UserRepository(AsyncBaseRepository[UserModel]):
         await session.refresh(quiz_result)
         await session.refresh(quiz_answer)
 
+    async def insert_answers(
+        self, session: AsyncSession, results: list[dict], answers: list[dict]
+    ) -> set[UUID]:
+        """Write many results and their answers in two multi-row inserts and commit.
+
+        Rows whose id already exists are skipped, so a batch can be written
+        again after a crash; returns the ids of the results actually inserted.
+        """
+        inserted = await session.execute(
+            pg_insert(QuizResults)
+            .values(results)
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(QuizResults.id)
+        )
+        written = set(inserted.scalars().all())
+        new_answers = [row for row in answers if row["quiz_result_id"] in written]
+        if new_answers:
+            await session.execute(pg_insert(QuizAnswer).values(new_answers))
+        await session.commit()
+        return written
+
     async def get_user_average_score(
         self, session: AsyncSession, user_id: UUID, company_id: UUID | None = None
     ) -> float:
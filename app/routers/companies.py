@@ -1,21 +1,36 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.models.user_model import UserModel
 from app.schemas.company_schema import (
+    BulkInviteSchema,
+    BulkMembersSchema,
+    BulkOperationReport,
+    BulkRequestsSchema,
     CompanyCreate,
     CompanySchema,
+    CompanySearchPage,
     CompanyUpdate,
     InviteSentSchema,
     QuestionUpdate,
     QuizCreate,
+    QuizImportReport,
     QuizUpdate,
 )
 from app.services.companies_service import companies_service
+from app.utils.dataloader import Loaders, get_loaders
+from app.utils.import_util import import_format, iter_rows
+from app.utils.rate_limit_util import RateLimit
+from app.utils.search_util import (
+    SEARCH_MAX_LENGTH,
+    SEARCH_MAX_LIMIT,
+    SEARCH_MIN_LENGTH,
+)
 from app.utils.user_util import user_connect
 
 router = APIRouter()
@@ -29,6 +44,16 @@ async def show_all_companies(
     return companies
 
 
+@router.get("/search", response_model=CompanySearchPage)
+async def search_companies(
+    q: str = Query(min_length=SEARCH_MIN_LENGTH, max_length=SEARCH_MAX_LENGTH),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    return await companies_service.search_companies(q, session, limit, cursor)
+
+
 # =========================MANAGING INVITES AND REQUESTS=========
 
 
@@ -36,16 +61,18 @@ async def show_all_companies(
 async def owner_list_invite(
     current_user: UserModel = Depends(user_connect),
     session: AsyncSession = Depends(get_session),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    return await companies_service.invite_owner_list(current_user, session)
+    return await companies_service.invite_owner_list(current_user, session, loaders)
 
 
 @router.get("/requests/pending")
 async def owner_pending_requests(
     current_user: UserModel = Depends(user_connect),
     session: AsyncSession = Depends(get_session),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    return await companies_service.pending_requests_list(current_user, session)
+    return await companies_service.pending_requests_list(current_user, session, loaders)
 
 
 @router.get("/{company_id}/users")
@@ -92,7 +119,7 @@ async def update_company(
     )
 
 
-@router.delete("/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{company_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_company(
     company_id: UUID,
     session: AsyncSession = Depends(get_session),
@@ -122,6 +149,42 @@ async def cancel_invite(
     return await companies_service.invite_cancel(invite_id, current_user, session)
 
 
+# ===============================BULK MEMBERSHIP================================
+
+
+@router.post("/bulk/invite", response_model=BulkOperationReport)
+async def bulk_send_invites(
+    invites: BulkInviteSchema,
+    current_user: UserModel = Depends(user_connect),
+    session: AsyncSession = Depends(get_session),
+):
+    return await companies_service.bulk_invite_send(invites, current_user, session)
+
+
+@router.post("/bulk/requests/{option}", response_model=BulkOperationReport)
+async def bulk_owner_request_switcher(
+    option: str,
+    requests: BulkRequestsSchema,
+    current_user: UserModel = Depends(user_connect),
+    session: AsyncSession = Depends(get_session),
+):
+    return await companies_service.bulk_request_switcher(
+        option, requests, current_user, session
+    )
+
+
+@router.post("/bulk/admins/{action}", response_model=BulkOperationReport)
+async def bulk_admin_change(
+    action: str,
+    members: BulkMembersSchema,
+    current_user: UserModel = Depends(user_connect),
+    session: AsyncSession = Depends(get_session),
+):
+    return await companies_service.bulk_admin_change(
+        action, members, current_user, session
+    )
+
+
 # ===============================REQUESTS=======================================
 
 
@@ -184,7 +247,7 @@ async def remove_admin_role(
 
 
 # ==========================================Quizzes MANAGEMENT=============================
-@router.post("/quiz/{company_id}")
+@router.post("/quiz/{company_id}", dependencies=[Depends(RateLimit("quiz_create"))])
 async def create_company_quiz(
     company_id: UUID,
     quiz_data: QuizCreate,
@@ -196,6 +259,38 @@ async def create_company_quiz(
     )
 
 
+@router.post(
+    "/quiz/{company_id}/import",
+    response_model=QuizImportReport,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("quiz_create"))],
+)
+async def import_company_quiz(
+    company_id: UUID,
+    title: str,
+    request: Request,
+    response: Response,
+    description: str = "",
+    skip_invalid: bool = False,
+    content_type: str = Header(...),
+    current_user: UserModel = Depends(user_connect),
+    session: AsyncSession = Depends(get_session),
+):
+    rows = iter_rows(request.stream(), import_format(content_type))
+    report = await companies_service.company_import_quiz(
+        company_id,
+        title,
+        description,
+        rows,
+        current_user,
+        session,
+        skip_invalid=skip_invalid,
+    )
+    if not report.committed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return report
+
+
 @router.delete("/quiz/{company_id}/{quiz_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_company_quiz(
     company_id: UUID,
@@ -251,6 +346,30 @@ async def edit_quiz_question(
     )
 
 
+# A version's content never changes, so clients and CDNs may keep it forever.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/quiz/{company_id}/{quiz_id}/versions/{version}")
+async def company_quiz_version(
+    company_id: UUID,
+    quiz_id: UUID,
+    version: int,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    content = await companies_service.company_quiz_version(
+        company_id, quiz_id, version, session
+    )
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "ETag": f'"{quiz_id}.{version}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content, headers=headers)
+
+
 @router.get("/quizzes/{company_id}")
 async def company_all_quizzes(
     company_id: UUID,
@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 
+from app.services.health_service import health_monitor
 from app.utils.connection_util import connection_check
 
 router = APIRouter()
@@ -14,3 +15,19 @@ async def health_check():
 async def connection_route():
     connection_res = await connection_check()
     return connection_res
+
+
+@router.get("/health/live")
+async def liveness(response: Response):
+    if not health_monitor.is_live():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "probe loop stopped"}
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness(response: Response):
+    ready, checks = health_monitor.readiness()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "not ready", "checks": checks}
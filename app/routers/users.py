@@ -1,7 +1,7 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
@@ -16,9 +16,17 @@ from app.schemas.user_schema import (
     UpdateUserResponseSchema,
     UserAverageScoreResponse,
     UserSchema,
+    UserSearchPage,
     UserUpdateSchema,
 )
 from app.services.users_service import user_service
+from app.utils.dataloader import Loaders, get_loaders
+from app.utils.rate_limit_util import RateLimit, client_ip, rate_limiter
+from app.utils.search_util import (
+    SEARCH_MAX_LENGTH,
+    SEARCH_MAX_LIMIT,
+    SEARCH_MIN_LENGTH,
+)
 from app.utils.user_util import user_connect
 
 router = APIRouter()
@@ -34,6 +42,16 @@ async def get_users(
     return users
 
 
+@router.get("/search", response_model=UserSearchPage)
+async def search_users(
+    q: str = Query(min_length=SEARCH_MIN_LENGTH, max_length=SEARCH_MAX_LENGTH),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    return await user_service.search_users(q, session, limit, cursor)
+
+
 @router.post("/", response_model=UserSchema)
 async def user_create(
     user: SignUpSchema,
@@ -52,7 +70,7 @@ async def get_current_user(user: UserModel = Depends(user_connect)):
     }
 
 
-@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/me", status_code=status.HTTP_202_ACCEPTED)
 async def user_delete(
     session: AsyncSession = Depends(get_session),
     current_user: UserModel = Depends(user_connect),
@@ -78,7 +96,10 @@ async def user_update(
 
 
 @router.post("/login", response_model=LoginResponseSchema)
-async def user_login(user: SignInSchema, session: AsyncSession = Depends(get_session)):
+async def user_login(
+    user: SignInSchema, request: Request, session: AsyncSession = Depends(get_session)
+):
+    await rate_limiter.hit("login", client_ip(request), user.email.lower())
     return await user_service.login_user(user.model_dump(), session)
 
 
@@ -136,22 +157,26 @@ async def user_leave(
 async def user_show_requests(
     current_user: UserModel = Depends(user_connect),
     session: AsyncSession = Depends(get_session),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    return await user_service.show_user_requests(current_user, session)
+    return await user_service.show_user_requests(current_user, session, loaders)
 
 
 @router.get("/me/invites")
 async def user_show_invites(
     current_user: UserModel = Depends(user_connect),
     session: AsyncSession = Depends(get_session),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    return await user_service.show_user_invites(current_user, session)
+    return await user_service.show_user_invites(current_user, session, loaders)
 
 
 # ======================== ANSWER THE QUESTION ==============================
 
 
-@router.post("/me/answer/{quiz_id}/{question_id}")
+@router.post(
+    "/me/answer/{quiz_id}/{question_id}", dependencies=[Depends(RateLimit("answer"))]
+)
 async def user_answer_question(
     question_id: UUID,
     quiz_id: UUID,
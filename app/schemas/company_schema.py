@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.models.company_invite_request_model import InviteStatus, InviteType
 from app.models.company_user_role_model import RoleEnum
+from app.schemas.import_schema import ImportReport
 
 
 class CompanySchema(BaseModel):
@@ -39,6 +41,11 @@ class CompanyListSchema(BaseModel):
     List[CompanySchema]
 
 
+class CompanySearchPage(BaseModel):
+    items: List[CompanySchema]
+    next_cursor: Optional[str] = None
+
+
 class InviteSentSchema(BaseModel):
     company_id: UUID
     invited_user_id: UUID
@@ -97,13 +104,108 @@ class QuizzesList(BaseModel):
     id: UUID
     title: str
     description: str
+    version: int
     questions: List[QuestionList]
 
     model_config = {"from_attributes": True}
 
 
+class QuizVersionSchema(BaseModel):
+    quiz_id: UUID
+    version: int
+    questions: List[QuestionList]
+
+
 class QuestionCreateSchema(BaseModel):
+    id: UUID = Field(default_factory=uuid4)
     quiz_id: UUID
     title: str
     options: List[str]
     correct_answers: List[int]
+
+
+class QuestionImportRow(BaseModel):
+    """One imported question; CSV cells separate list items with ``|``."""
+
+    title: str = Field(min_length=1)
+    options: List[str] = Field(min_length=2)
+    correct_answers: List[int] = Field(min_length=1)
+
+    @field_validator("options", "correct_answers", mode="before")
+    @classmethod
+    def split_cell(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split("|")]
+        return value
+
+    @model_validator(mode="after")
+    def answers_point_at_options(self):
+        for index in self.correct_answers:
+            if not 0 <= index < len(self.options):
+                raise ValueError(f"correct answer {index} is not an option index")
+        return self
+
+
+class QuizImportReport(ImportReport):
+    quiz_id: Optional[UUID] = None
+    committed: bool = False
+
+
+class UserSummarySchema(BaseModel):
+    id: UUID
+    name: Optional[str] = None
+    email: str
+
+    model_config = {"from_attributes": True}
+
+
+class CompanySummarySchema(BaseModel):
+    id: UUID
+    name: str
+    is_public: bool
+
+    model_config = {"from_attributes": True}
+
+
+class InviteDetailsSchema(BaseModel):
+    id: UUID
+    type: InviteType
+    status: InviteStatus
+    created_at: datetime | None = None
+    company_id: UUID
+    invited_user_id: UUID
+    invited_by_id: UUID | None = None
+    company: CompanySummarySchema | None = None
+    invited_user: UserSummarySchema | None = None
+    invited_by: UserSummarySchema | None = None
+
+    model_config = {"from_attributes": True}
+
+
+BULK_MAX_ITEMS = 500
+
+
+class BulkInviteSchema(BaseModel):
+    company_id: UUID
+    user_ids: List[UUID] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkRequestsSchema(BaseModel):
+    request_ids: List[UUID] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkMembersSchema(BaseModel):
+    company_id: UUID
+    user_ids: List[UUID] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    id: UUID
+    ok: bool
+    status: str
+
+
+class BulkOperationReport(BaseModel):
+    processed: int
+    succeeded: int
+    results: List[BulkItemResult]
@@ -0,0 +1,21 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.core.import_config import import_settings
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < import_settings.IMPORT_MAX_ERRORS:
+            self.errors.append(ImportRowError(row=row, error=error))
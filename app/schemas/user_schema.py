@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from app.schemas.import_schema import ImportReport
+
 
 class UserSchema(BaseModel):
     id: UUID
@@ -37,6 +39,11 @@ class UsersListSchema(BaseModel):
     users: List[UserSchema]
 
 
+class UserSearchPage(BaseModel):
+    items: List[UserSchema]
+    next_cursor: Optional[str] = None
+
+
 class UserDetailsSchema(BaseModel):
     user_info: UserSchema
 
@@ -67,3 +74,8 @@ class AnswerUserSchema(BaseModel):
 class UserAverageScoreResponse(BaseModel):
     average_score: float
     company_id: UUID | None = None
+
+
+class UserImportReport(ImportReport):
+    # Rows whose email was already taken or repeated earlier in the file.
+    skipped: int = 0
@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+DEFAULT_BUDGET_MS = 1500
+# Only needed by rarely used code paths; importing the app must not load them.
+LAZY_MODULES = ("jose", "requests", "pwdlib", "uvicorn")
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(
+    module: str = "app.main", env: dict | None = None, cwd: str | None = None
+) -> tuple[list[ImportTime], set[str]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns every import with its timings, and which LAZY_MODULES got loaded.
+    """
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=True,
+    )
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    loaded = set(filter(None, proc.stdout.strip().split(",")))
+    return timings, loaded
+
+
+def total_ms(timings: list[ImportTime], module: str) -> float:
+    return next(t.cumulative_us for t in timings if t.module == module) / 1000
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.scripts.import_time",
+        description="Measure how long importing the app takes and what is slowest.",
+    )
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    timings, loaded = measure(args.module, env=dict(os.environ))
+    for t in sorted(timings, key=lambda t: t.self_us, reverse=True)[: args.top]:
+        print(
+            f"{t.self_us / 1000:>9.1f} ms self {t.cumulative_us / 1000:>9.1f} ms  {t.module}"
+        )
+    total = total_ms(timings, args.module)
+    print(f"{args.module} imported in {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if loaded:
+        print(f"loaded eagerly, should be lazy: {', '.join(sorted(loaded))}")
+    if total > args.budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
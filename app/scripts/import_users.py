@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator
+
+import asyncpg
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.import_config import import_settings
+from app.models.company_user_role_model import RoleEnum
+from app.repository.role_counters import ROLE_COUNTER_COLUMNS
+from app.schemas.user_schema import SignUpSchema, UserImportReport
+from app.utils.import_util import RowError, iter_rows, row_error_message
+from app.utils.jwt_util import password_hash
+
+READ_CHUNK_BYTES = 64 * 1024
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+IMPORT_ROLES = (RoleEnum.MEMBER, RoleEnum.ADMIN)
+
+USER_COLUMNS = ("id", "name", "email", "password", "age")
+ROLE_COLUMNS = ("id", "user_id", "company_id", "role")
+
+# Each batch is COPYed here first, so the insert into users can skip taken emails.
+STAGING_TABLE = """
+CREATE TEMP TABLE import_users (
+    id uuid, name text, email text, password text, age integer
+) ON COMMIT DELETE ROWS
+"""
+INSERT_USERS = f"""
+INSERT INTO users ({", ".join(USER_COLUMNS)})
+SELECT {", ".join(USER_COLUMNS)} FROM import_users
+ON CONFLICT (email) DO NOTHING
+RETURNING id
+"""
+
+
+def dsn() -> str:
+    return settings.db.dsn
+
+
+async def read_chunks(path: Path, size: int = READ_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+async def valid_rows(
+    rows: AsyncIterator[tuple[int, dict | RowError]], report: UserImportReport
+) -> AsyncIterator[SignUpSchema]:
+    """Validate rows like ``POST /users/`` does and drop repeated emails."""
+    seen: set[str] = set()
+    async for line_no, row in rows:
+        try:
+            if isinstance(row, RowError):
+                raise row
+            user = SignUpSchema.model_validate(row)
+        except (RowError, ValidationError) as exc:
+            report.add_error(line_no, row_error_message(exc))
+            continue
+        if user.email in seen:
+            report.skipped += 1
+            continue
+        seen.add(user.email)
+        yield user
+
+
+async def batches(
+    users: AsyncIterator[SignUpSchema], size: int
+) -> AsyncIterator[list[SignUpSchema]]:
+    batch = []
+    async for user in users:
+        batch.append(user)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def hash_many(passwords: list[str]) -> list[str]:
+    """Process-pool entry point: hash one slice of a batch."""
+    return [password_hash(password) for password in passwords]
+
+
+async def hash_passwords(
+    pool: Executor, passwords: list[str], workers: int
+) -> list[str]:
+    """Hash a batch in ``workers`` slices at once, keeping the input order."""
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    step = -(-len(passwords) // workers)
+    slices = await asyncio.gather(
+        *[
+            loop.run_in_executor(pool, hash_many, passwords[start : start + step])
+            for start in range(0, len(passwords), step)
+        ]
+    )
+    return [hashed for part in slices for hashed in part]
+
+
+async def insert_batch(
+    conn: asyncpg.Connection,
+    records: list[tuple],
+    company_id: uuid.UUID | None,
+    role: RoleEnum,
+) -> int:
+    """Insert one batch of users, and their company roles, in one transaction."""
+    async with conn.transaction():
+        await conn.copy_records_to_table(
+            "import_users", records=records, columns=USER_COLUMNS
+        )
+        inserted = await conn.fetch(INSERT_USERS)
+        if company_id is not None and inserted:
+            await conn.copy_records_to_table(
+                "company_user_roles",
+                records=[
+                    (uuid.uuid4(), row["id"], company_id, role.value)
+                    for row in inserted
+                ],
+                columns=ROLE_COLUMNS,
+            )
+            column = ROLE_COUNTER_COLUMNS[role].key
+            await conn.execute(
+                f"UPDATE companies SET {column} = {column} + $1 WHERE id = $2",
+                len(inserted),
+                company_id,
+            )
+    return len(inserted)
+
+
+async def _check_company(conn: asyncpg.Connection, company_id: uuid.UUID):
+    found = await conn.fetchval(
+        "SELECT 1 FROM companies WHERE id = $1 AND deleted_at IS NULL", company_id
+    )
+    if not found:
+        raise SystemExit(f"company {company_id} does not exist")
+
+
+async def import_users(
+    path: Path,
+    fmt: str,
+    company_id: uuid.UUID | None = None,
+    role: RoleEnum = RoleEnum.MEMBER,
+    batch_size: int = import_settings.IMPORT_CHUNK_SIZE,
+    jobs: int | None = None,
+) -> UserImportReport:
+    """Stream users from ``path`` into Postgres, one committed batch at a time.
+
+    Emails that are already taken are skipped before hashing, so re-running
+    an interrupted import only pays for the users it has not created yet.
+    """
+    workers = jobs or os.cpu_count() or 1
+    report = UserImportReport()
+    conn = await asyncpg.connect(dsn())
+    try:
+        if company_id is not None:
+            await _check_company(conn, company_id)
+        await conn.execute(STAGING_TABLE)
+        users = valid_rows(iter_rows(read_chunks(path), fmt), report)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            async for batch in batches(users, batch_size):
+                taken = set(
+                    await conn.fetchval(
+                        "SELECT coalesce(array_agg(email), '{}') FROM users"
+                        " WHERE email = ANY($1::text[])",
+                        [user.email for user in batch],
+                    )
+                )
+                new = [user for user in batch if user.email not in taken]
+                hashed = await hash_passwords(
+                    pool, [user.password for user in new], workers
+                )
+                records = [
+                    (uuid.uuid4(), user.name, user.email, password, user.age)
+                    for user, password in zip(new, hashed)
+                ]
+                inserted = await insert_batch(conn, records, company_id, role)
+                report.imported += inserted
+                report.skipped += len(batch) - inserted
+    finally:
+        await conn.close()
+    return report
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.scripts.import_users",
+        description="Create users in bulk from a CSV or NDJSON file.",
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--company-id", type=uuid.UUID, default=None)
+    parser.add_argument(
+        "--role", choices=[role.value for role in IMPORT_ROLES], default="member"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=import_settings.IMPORT_CHUNK_SIZE
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="hashing processes")
+    args = parser.parse_args(argv)
+    fmt = args.format or FORMATS.get(args.path.suffix.lower())
+    if fmt is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    started_at = time.perf_counter()
+    report = asyncio.run(
+        import_users(
+            args.path,
+            fmt,
+            args.company_id,
+            RoleEnum(args.role),
+            args.batch_size,
+            args.jobs,
+        )
+    )
+    for error in report.errors:
+        print(f"line {error.row}: {error.error}")
+    print(
+        f"imported {report.imported:,}, skipped {report.skipped:,}, "
+        f"failed {report.failed:,} in {time.perf_counter() - started_at:.0f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.company_model import CompanyModel
+from app.repository.role_counters import reconcile_role_counters
+
+BATCH_SIZE = 1000
+
+
+async def reconcile_all(batch_size: int = BATCH_SIZE) -> int:
+    """Walk companies in id order and repair drifted role counters batch by batch."""
+    repaired = 0
+    last_id = None
+    async with AsyncSessionLocal() as session:
+        while True:
+            stmt = select(CompanyModel.id).order_by(CompanyModel.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(CompanyModel.id > last_id)
+            company_ids = (await session.execute(stmt)).scalars().all()
+            if not company_ids:
+                break
+            repaired += await reconcile_role_counters(session, company_ids)
+            last_id = company_ids[-1]
+    logger.info(f"Role counters reconciled: repaired={repaired}")
+    return repaired
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_all())
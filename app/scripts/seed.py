@@ -0,0 +1,430 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+from app.core.config import settings
+from app.utils.jwt_util import password_hash
+
+SEED_PASSWORD = "seed-password"
+USERS_CHUNK = 50_000
+COMPANIES_CHUNK = 500
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPREAD_SECONDS = 365 * 24 * 60 * 60
+
+TABLES = (
+    "quiz_answers",
+    "results",
+    "questions",
+    "quiz_versions",
+    "quizzes",
+    "company_invites",
+    "company_user_roles",
+    "companies",
+    "users",
+)
+INVITE_STATUSES = ("pending", "accepted", "declined", "canceled")
+INVITE_STATUS_WEIGHTS = (4, 3, 2, 1)
+
+
+@dataclass(frozen=True)
+class Preset:
+    users: int
+    companies: int
+    members_per_company: int
+    invites_per_company: int
+    quizzes_per_company: int
+    questions_per_quiz: int
+    takers_per_quiz: int
+
+
+PRESETS = {
+    "tiny": Preset(1_000, 50, 20, 6, 2, 5, 5),
+    "small": Preset(50_000, 2_500, 40, 10, 2, 8, 5),
+    "medium": Preset(250_000, 12_500, 60, 20, 3, 10, 5),
+    "large": Preset(1_000_000, 50_000, 60, 20, 3, 10, 5),
+}
+
+
+def seeded_uuid(seed: int, kind: str, *parts) -> uuid.UUID:
+    """Stable id for one generated row, so reruns and cross-references agree."""
+    key = ":".join(map(str, (seed, kind, *parts))).encode()
+    return uuid.UUID(bytes=hashlib.md5(key).digest(), version=4)
+
+
+def seeded_time(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPREAD_SECONDS))
+
+
+@dataclass(frozen=True)
+class CompanyPlan:
+    """Which users belong to a company; the members are a contiguous block of users.
+
+    Block position 0 is the owner, then the admins, then the plain members.
+    Users right after the block receive the company's invites and requests,
+    so no user holds two roles in one company or duplicate pending invites.
+    """
+
+    index: int
+    start: int
+    size: int
+    admins: int
+
+    @classmethod
+    def build(cls, seed: int, preset: Preset, index: int) -> "CompanyPlan":
+        rng = random.Random(f"{seed}:plan:{index}")
+        limit = max(1, preset.users - preset.invites_per_company - 1)
+        size = min(limit, rng.randint(1, 2 * preset.members_per_company - 1))
+        return cls(
+            index=index,
+            start=rng.randrange(preset.users),
+            size=size,
+            admins=(size - 1) // 10,
+        )
+
+    def user(self, preset: Preset, offset: int) -> int:
+        return (self.start + offset) % preset.users
+
+
+def user_rows(seed: int, hashed_password: str, start: int, stop: int):
+    for i in range(start, stop):
+        rng = random.Random(f"{seed}:user:{i}")
+        created_at = seeded_time(rng)
+        yield (
+            seeded_uuid(seed, "user", i),
+            f"User {i}",
+            f"user{i}@seed{seed}.example.com",
+            hashed_password,
+            rng.randint(16, 70),
+            created_at,
+            created_at,
+        )
+
+
+def company_rows(seed: int, preset: Preset, start: int, stop: int):
+    for c in range(start, stop):
+        plan = CompanyPlan.build(seed, preset, c)
+        rng = random.Random(f"{seed}:company:{c}")
+        created_at = seeded_time(rng)
+        yield (
+            seeded_uuid(seed, "company", c),
+            f"Company {c}",
+            f"Seeded company number {c}",
+            rng.random() < 0.8,
+            1,
+            plan.admins,
+            plan.size - 1 - plan.admins,
+            created_at,
+            created_at,
+        )
+
+
+def company_children(seed: int, preset: Preset, start: int, stop: int) -> dict:
+    """Roles, invites, quizzes, questions, results and answers of a company range."""
+    rows = {table: [] for table in TABLES[:-2]}
+    for c in range(start, stop):
+        plan = CompanyPlan.build(seed, preset, c)
+        rng = random.Random(f"{seed}:children:{c}")
+        company_id = seeded_uuid(seed, "company", c)
+        owner_id = seeded_uuid(seed, "user", plan.user(preset, 0))
+
+        for offset in range(plan.size):
+            if offset == 0:
+                role = "owner"
+            elif offset <= plan.admins:
+                role = "admin"
+            else:
+                role = "member"
+            rows["company_user_roles"].append(
+                (
+                    seeded_uuid(seed, "role", c, offset),
+                    seeded_uuid(seed, "user", plan.user(preset, offset)),
+                    company_id,
+                    role,
+                )
+            )
+
+        for j in range(preset.invites_per_company):
+            is_invite = j % 2 == 0
+            created_at = seeded_time(rng)
+            rows["company_invites"].append(
+                (
+                    seeded_uuid(seed, "invite", c, j),
+                    company_id,
+                    owner_id if is_invite else None,
+                    seeded_uuid(seed, "user", plan.user(preset, plan.size + j)),
+                    "invite" if is_invite else "request",
+                    rng.choices(INVITE_STATUSES, INVITE_STATUS_WEIGHTS)[0],
+                    created_at,
+                    created_at,
+                )
+            )
+
+        takers = min(preset.takers_per_quiz, plan.size)
+        for k in range(preset.quizzes_per_company):
+            quiz_id = seeded_uuid(seed, "quiz", c, k)
+            version_id = seeded_uuid(seed, "quiz_version", c, k)
+            rows["quizzes"].append(
+                (
+                    quiz_id,
+                    f"Quiz {k} of company {c}",
+                    "Seeded quiz",
+                    takers,
+                    1,
+                    company_id,
+                )
+            )
+            rows["quiz_versions"].append(
+                (
+                    version_id,
+                    quiz_id,
+                    1,
+                    [
+                        seeded_uuid(seed, "question", c, k, q)
+                        for q in range(preset.questions_per_quiz)
+                    ],
+                )
+            )
+            for q in range(preset.questions_per_quiz):
+                question_id = seeded_uuid(seed, "question", c, k, q)
+                correct = [rng.randrange(4)]
+                rows["questions"].append(
+                    (
+                        question_id,
+                        f"Question {q}",
+                        ["Option A", "Option B", "Option C", "Option D"],
+                        correct,
+                        quiz_id,
+                    )
+                )
+                for t in range(takers):
+                    result_id = seeded_uuid(seed, "result", c, k, q, t)
+                    user_id = seeded_uuid(seed, "user", plan.user(preset, t))
+                    answered_at = seeded_time(rng)
+                    selected = correct if rng.random() < 0.6 else [rng.randrange(4)]
+                    rows["results"].append(
+                        (
+                            result_id,
+                            user_id,
+                            quiz_id,
+                            version_id,
+                            True,
+                            answered_at,
+                            answered_at,
+                        )
+                    )
+                    rows["quiz_answers"].append(
+                        (
+                            seeded_uuid(seed, "answer", c, k, q, t),
+                            result_id,
+                            question_id,
+                            selected,
+                            answered_at,
+                            answered_at,
+                        )
+                    )
+    return rows
+
+
+COLUMNS = {
+    "users": ("id", "name", "email", "password", "age", "created_at", "updated_at"),
+    "companies": (
+        "id",
+        "name",
+        "description",
+        "is_public",
+        "owners_count",
+        "admins_count",
+        "members_count",
+        "created_at",
+        "updated_at",
+    ),
+    "company_user_roles": ("id", "user_id", "company_id", "role"),
+    "company_invites": (
+        "id",
+        "company_id",
+        "invited_by_id",
+        "invited_user_id",
+        "type",
+        "status",
+        "created_at",
+        "updated_at",
+    ),
+    "quizzes": (
+        "id",
+        "title",
+        "description",
+        "total_participation",
+        "version",
+        "company_id",
+    ),
+    "quiz_versions": ("id", "quiz_id", "number", "question_ids"),
+    "questions": ("id", "title", "options", "correct_answers", "quiz_id"),
+    "results": (
+        "id",
+        "user_id",
+        "quiz_id",
+        "version_id",
+        "is_done",
+        "created_at",
+        "updated_at",
+    ),
+    "quiz_answers": (
+        "id",
+        "quiz_result_id",
+        "question_id",
+        "selected_answers",
+        "created_at",
+        "updated_at",
+    ),
+}
+
+# Parents first, so every chunk satisfies its foreign keys on its own.
+CHILD_TABLES = (
+    "company_user_roles",
+    "company_invites",
+    "quizzes",
+    "quiz_versions",
+    "questions",
+    "results",
+    "quiz_answers",
+)
+
+
+def dsn() -> str:
+    return settings.db.dsn
+
+
+async def _copy_chunk(
+    kind: str, seed: int, preset: Preset, start: int, stop: int, hashed: str
+):
+    if kind == "users":
+        tables = {"users": user_rows(seed, hashed, start, stop)}
+    elif kind == "companies":
+        tables = {"companies": company_rows(seed, preset, start, stop)}
+    else:
+        children = company_children(seed, preset, start, stop)
+        tables = {table: children[table] for table in CHILD_TABLES}
+
+    counts = {}
+    conn = await asyncpg.connect(dsn())
+    try:
+        async with conn.transaction():
+            for table, records in tables.items():
+                records = list(records)
+                await conn.copy_records_to_table(
+                    table, records=records, columns=COLUMNS[table]
+                )
+                counts[table] = len(records)
+    finally:
+        await conn.close()
+    return counts
+
+
+def load_chunk(
+    kind: str, seed: int, preset: Preset, start: int, stop: int, hashed: str
+):
+    """Process-pool entry point: one chunk, one connection, one COPY stream per table."""
+    return asyncio.run(_copy_chunk(kind, seed, preset, start, stop, hashed))
+
+
+def _chunks(total: int, size: int):
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _run_phase(pool, jobs: list[tuple], totals: dict):
+    futures = [pool.submit(load_chunk, *job) for job in jobs]
+    for future in futures:
+        for table, count in future.result().items():
+            totals[table] = totals.get(table, 0) + count
+
+
+async def _prepare(truncate: bool):
+    conn = await asyncpg.connect(dsn())
+    try:
+        if truncate:
+            await conn.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+    finally:
+        await conn.close()
+
+
+async def _analyze():
+    conn = await asyncpg.connect(dsn())
+    try:
+        for table in TABLES:
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+
+def seed_database(
+    preset: Preset, seed: int = 1, jobs: int | None = None, truncate: bool = False
+) -> dict[str, int]:
+    """Generate ``preset`` deterministically from ``seed`` and COPY it in parallel.
+
+    Users and companies load first; each company chunk then loads all of its
+    dependent rows in one transaction on its own connection.
+    """
+    started_at = time.perf_counter()
+    asyncio.run(_prepare(truncate))
+    hashed = password_hash(SEED_PASSWORD)
+    totals: dict[str, int] = {}
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        _run_phase(
+            pool,
+            [
+                ("users", seed, preset, *chunk, hashed)
+                for chunk in _chunks(preset.users, USERS_CHUNK)
+            ]
+            + [
+                ("companies", seed, preset, *chunk, hashed)
+                for chunk in _chunks(preset.companies, COMPANIES_CHUNK)
+            ],
+            totals,
+        )
+        print(f"users and companies loaded in {time.perf_counter() - started_at:.0f}s")
+        _run_phase(
+            pool,
+            [
+                ("children", seed, preset, *chunk, hashed)
+                for chunk in _chunks(preset.companies, COMPANIES_CHUNK)
+            ],
+            totals,
+        )
+
+    asyncio.run(_analyze())
+    elapsed = time.perf_counter() - started_at
+    for table in reversed(TABLES):
+        print(f"{table:>20}: {totals.get(table, 0):>12,}")
+    print(f"seeded in {elapsed:.0f}s")
+    return totals
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.scripts.seed",
+        description="Load a deterministic synthetic dataset with COPY.",
+    )
+    parser.add_argument("--preset", choices=PRESETS, default="tiny")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=None, help="parallel COPY streams")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="empty every seeded table first (destroys existing data)",
+    )
+    args = parser.parse_args(argv)
+    seed_database(PRESETS[args.preset], args.seed, args.jobs, args.truncate)
+
+
+if __name__ == "__main__":
+    main()
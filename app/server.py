@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import uvicorn
+
+from app.core.app_config import AppConfig
+from app.core.config import settings
+from app.core.metrics import MULTIPROC_DIR_ENV
+
+
+def server_options(config: AppConfig = settings.app) -> dict:
+    """uvicorn options for production: one worker per core, no reloader."""
+    return {
+        "host": config.HOST,
+        "port": config.PORT,
+        "workers": config.WORKERS or os.cpu_count() or 1,
+        "loop": "uvloop",
+        "http": "httptools",
+        "backlog": config.BACKLOG,
+        "timeout_keep_alive": config.KEEP_ALIVE_TIMEOUT,
+        # On SIGTERM workers stop accepting, then wait this long for in-flight
+        # requests before cancelling them.
+        "timeout_graceful_shutdown": config.GRACEFUL_SHUTDOWN_TIMEOUT,
+        "proxy_headers": True,
+        "forwarded_allow_ips": config.FORWARDED_ALLOW_IPS,
+        # Requests are already logged by timing_middleware.
+        "access_log": False,
+    }
+
+
+def worker_environ(workers: int) -> dict[str, str]:
+    """Settings overridden for the worker processes uvicorn spawns."""
+    if workers <= 1:
+        return {}
+    # Several processes rotating one file lose and interleave records.
+    return {"LOG_FILE": "", "LOG_STDOUT": "true"}
+
+
+def main():
+    options = server_options()
+    os.environ.update(worker_environ(options["workers"]))
+    if options["workers"] > 1 and not os.environ.get(MULTIPROC_DIR_ENV):
+        # Without it /metrics would only show the worker that served the scrape.
+        os.environ[MULTIPROC_DIR_ENV] = tempfile.mkdtemp(prefix="prometheus-")
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
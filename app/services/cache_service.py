@@ -0,0 +1,15 @@
+import math
+
+from app.db.invalidation import invalidation_bus
+from app.utils.local_cache import LocalCache
+
+# Read-mostly rows on the answer path, keyed by id. Quiz writes publish
+# invalidations for these names through their repository. Questions are never
+# modified once written, so their entries only go stale when a quiz is deleted.
+quiz_cache = invalidation_bus.register(LocalCache("quiz"))
+question_cache = invalidation_bus.register(LocalCache("question"))
+
+# Published quiz versions never change, so these are never invalidated and only
+# leave through LRU eviction. Keyed by "<quiz id>:<version number>".
+quiz_version_cache = LocalCache("quiz_version", ttl=math.inf)
+quiz_content_cache = LocalCache("quiz_content", max_size=1_000, ttl=math.inf)
@@ -1,51 +1,136 @@
-from uuid import UUID
+from typing import AsyncIterator
+from uuid import UUID, uuid4
 
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.company_exceptions import (
     CompanyNotFoundError,
+    InvalidRoleActionError,
     MemberNotFoundError,
     OwnerAndAdminOnlyActionError,
     OwnerOnlyActionError,
     UserAlreadyAdminException,
     UserAlreadyOwnerException,
 )
+from app.core.import_config import import_settings
 from app.core.invites_exceptions import (
     InvalidInviteStatusError,
     InviteInvalidOptionError,
     InviteNotFoundError,
 )
+from app.core.jobs_config import jobs_settings
 from app.core.quiz_exceptions import (
     FewOptionsException,
     FewQuestionsException,
     NotEnoughOptionsException,
     QuestionNotFoundException,
     QuizNotFoundException,
+    QuizVersionConflictException,
+    QuizVersionNotFoundException,
 )
 from app.core.users_exceptions import PermissionDeniedError, UserNotFoundError
-from app.models.company_invite_request_model import InviteStatus
-from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+from app.db.invalidation import EVERYTHING
+from app.jobs.queue import job_queue
+from app.models.company_invite_request_model import InviteStatus, InviteType
+from app.models.company_user_role_model import RoleEnum
 from app.models.quiz_model import QuizModel
 from app.models.user_model import UserModel
 from app.repository.companies_repository import CompaniesRepository
+from app.repository.company_access import AccessOutcome, CompanyAccess
 from app.schemas.company_schema import (
+    BulkInviteSchema,
+    BulkItemResult,
+    BulkMembersSchema,
+    BulkOperationReport,
+    BulkRequestsSchema,
     CompanyCreate,
     CompanySchema,
+    CompanySearchPage,
     CompanyUpdate,
     InviteSentSchema,
     QuestionCreateSchema,
+    QuestionImportRow,
+    QuestionList,
     QuestionUpdate,
     QuizCreate,
+    QuizImportReport,
     QuizUpdate,
+    QuizVersionSchema,
     QuizzesList,
     UserWithRoleSchema,
 )
+from app.services.cache_service import quiz_cache, quiz_content_cache
+from app.services.purge_service import purge_in_chunks, purge_progress
+from app.utils.dataloader import Loaders
+from app.utils.import_util import RowError, row_error_message
+from app.utils.invite_util import invites_with_details
+from app.utils.search_util import decode_cursor, next_cursor
+
+OWNER_ONLY = (RoleEnum.OWNER,)
+OWNER_OR_ADMIN = (RoleEnum.OWNER, RoleEnum.ADMIN)
+
+
+def _bulk_report(
+    ids: list[UUID], statuses: dict[UUID, str], ok_statuses: set[str]
+) -> BulkOperationReport:
+    results = [
+        BulkItemResult(
+            id=item_id,
+            ok=statuses[item_id] in ok_statuses,
+            status=statuses[item_id],
+        )
+        for item_id in ids
+    ]
+    return BulkOperationReport(
+        processed=len(results),
+        succeeded=sum(result.ok for result in results),
+        results=results,
+    )
 
 
 class CompaniesService:
     def __init__(self, repo: CompaniesRepository):
         self.repo = repo
 
+    async def _authorize(
+        self,
+        session: AsyncSession,
+        company_id: UUID,
+        user: UserModel,
+        allowed_roles: tuple[RoleEnum, ...],
+        quiz_id: UUID | None = None,
+        question_id: UUID | None = None,
+        member_id: UUID | None = None,
+    ) -> CompanyAccess:
+        access = await self.repo.get_company_access(
+            session,
+            company_id,
+            user.id,
+            quiz_id=quiz_id,
+            question_id=question_id,
+            member_id=member_id,
+        )
+        outcome = access.outcome(
+            allowed_roles,
+            quiz_requested=quiz_id is not None,
+            question_requested=question_id is not None,
+            member_requested=member_id is not None,
+        )
+        if outcome == AccessOutcome.COMPANY_NOT_FOUND:
+            raise CompanyNotFoundError(company_id)
+        if outcome == AccessOutcome.FORBIDDEN:
+            if allowed_roles == OWNER_ONLY:
+                raise OwnerOnlyActionError()
+            raise OwnerAndAdminOnlyActionError()
+        if outcome == AccessOutcome.QUIZ_NOT_FOUND:
+            raise QuizNotFoundException()
+        if outcome == AccessOutcome.QUESTION_NOT_FOUND:
+            raise QuestionNotFoundException()
+        if outcome == AccessOutcome.MEMBER_NOT_FOUND:
+            raise MemberNotFoundError(member_id)
+        return access
+
     async def get_all_companies(
         self, session: AsyncSession, limit: int = 10, offset: int = 0
     ):
@@ -57,6 +142,21 @@ class CompaniesService:
             ]
         return company_list or []
 
+    async def search_companies(
+        self,
+        query: str,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> CompanySearchPage:
+        rows = await self.repo.search_public_companies(
+            session, query, limit + 1, decode_cursor(cursor)
+        )
+        return CompanySearchPage(
+            items=[company for company, _ in rows[:limit]],
+            next_cursor=next_cursor(rows, limit),
+        )
+
     async def get_company(self, company_id: UUID, session: AsyncSession):
         company = await self.repo.get(session, company_id)
         if not company:
@@ -99,12 +199,44 @@ class CompaniesService:
         }
 
     async def company_delete(self, company_id: UUID, db: AsyncSession, user: UserModel):
-        company = await self.repo.get_owner_company(db, company_id, user.id)
+        company = await self.repo.get_owner_company(
+            db, company_id, user.id, include_deleted=True
+        )
         if not company:
             raise PermissionDeniedError(
                 "You are not the owner of this company or it does not exist."
             )
-        await self.repo.delete(db, company)
+        # A retried DELETE of a hidden company only schedules the purge again.
+        if company.deleted_at is None:
+            # Its quizzes stop being answerable now, but we don't load their ids.
+            await self.repo.publish_invalidation(db, quiz_cache.name, EVERYTHING)
+            await self.repo.soft_delete_company(db, company)
+        await purge_progress.schedule("company", company.id)
+        await job_queue.enqueue("purge_company", {"company_id": company.id})
+        return {"message": "Company deletion scheduled.", "company_id": company.id}
+
+    async def company_purge(
+        self,
+        company_id: UUID,
+        session: AsyncSession,
+        chunk_size: int = jobs_settings.PURGE_CHUNK_SIZE,
+        max_chunks: int = jobs_settings.PURGE_CHUNKS_PER_JOB,
+    ) -> bool:
+        """Delete a soft-deleted company's rows, one short transaction per chunk.
+
+        Returns False when ``max_chunks`` ran out before the company row was gone.
+        """
+        if await self.repo.get_deleted_company(session, company_id) is None:
+            return True
+        return await purge_in_chunks(
+            session,
+            "company",
+            company_id,
+            lambda: self.repo.purge_company_chunk(session, company_id, chunk_size),
+            lambda: self.repo.delete_purged_company(session, company_id),
+            max_chunks,
+            purge_progress,
+        )
 
     # ========================INVITES====================
 
@@ -173,12 +305,13 @@ class CompaniesService:
             raise InviteInvalidOptionError()
         if option == InviteStatus.ACCEPTED:
             invite.status = InviteStatus.ACCEPTED
-            user_role = CompanyUserRoleModel(
+            await self.repo.add_user_role(
+                session,
                 user_id=invite.invited_user_id,
                 company_id=invite.company_id,
                 role=RoleEnum.MEMBER,
+                commit=False,
             )
-            session.add(user_role)
         elif option == InviteStatus.DECLINED:
             invite.status = InviteStatus.DECLINED
 
@@ -211,7 +344,13 @@ class CompaniesService:
         return {"message": "User deleted successfully!"}
 
     # ========================MANAGING INVITES=========
-    async def invite_owner_list(self, current_user: UserModel, session: AsyncSession):
+    async def invite_owner_list(
+        self,
+        current_user: UserModel,
+        session: AsyncSession,
+        loaders: Loaders | None = None,
+    ):
+        loaders = loaders or Loaders(session)
         owner_company_ids = await self.repo.get_owner_company_ids(
             session, current_user.id
         )
@@ -224,13 +363,20 @@ class CompaniesService:
         if not invited_user_ids:
             return {"message": "No invited users", "users": []}
 
-        users = await self.repo.get_users_by_ids(session, invited_user_ids)
+        users = await loaders.users.load_many(dict.fromkeys(invited_user_ids))
 
-        return {"message": "Successfully found invited users", "users": users}
+        return {
+            "message": "Successfully found invited users",
+            "users": [user for user in users if user is not None],
+        }
 
     async def pending_requests_list(
-        self, current_user: UserModel, session: AsyncSession
+        self,
+        current_user: UserModel,
+        session: AsyncSession,
+        loaders: Loaders | None = None,
     ):
+        loaders = loaders or Loaders(session)
         owner_company_ids = await self.repo.get_owner_company_ids(
             session, current_user.id
         )
@@ -245,7 +391,7 @@ class CompaniesService:
 
         return {
             "message": "Successfully found pending membership requests",
-            "requests": pending_requests,
+            "requests": await invites_with_details(pending_requests, loaders),
         }
 
     async def list_company_users(
@@ -287,19 +433,130 @@ class CompaniesService:
             "users": users,
         }
 
+    # ========================BULK MEMBERSHIP=========
+
+    async def bulk_invite_send(
+        self, invite_data: BulkInviteSchema, user: UserModel, session: AsyncSession
+    ) -> BulkOperationReport:
+        await self._authorize(session, invite_data.company_id, user, OWNER_ONLY)
+        user_ids = list(dict.fromkeys(invite_data.user_ids))
+
+        state = await self.repo.get_bulk_invite_state(
+            session, invite_data.company_id, user_ids
+        )
+        statuses = {}
+        candidates = []
+        for user_id in user_ids:
+            row = state.get(user_id)
+            if row is None:
+                statuses[user_id] = "user_not_found"
+            elif row.is_member:
+                statuses[user_id] = "already_member"
+            elif row.has_pending_invite:
+                statuses[user_id] = "already_invited"
+            else:
+                candidates.append(user_id)
+
+        invited = set(
+            await self.repo.bulk_insert_invites(
+                session, invite_data.company_id, user.id, candidates
+            )
+        )
+        await session.commit()
+
+        for user_id in candidates:
+            statuses[user_id] = "invited" if user_id in invited else "already_invited"
+        return _bulk_report(user_ids, statuses, {"invited"})
+
+    async def bulk_request_switcher(
+        self,
+        option: str,
+        requests_data: BulkRequestsSchema,
+        current_user: UserModel,
+        session: AsyncSession,
+    ) -> BulkOperationReport:
+        if option not in (InviteStatus.ACCEPTED, InviteStatus.DECLINED):
+            raise InviteInvalidOptionError()
+        request_ids = list(dict.fromkeys(requests_data.request_ids))
+
+        state = await self.repo.get_bulk_requests_state(
+            session, request_ids, current_user.id
+        )
+        resolved = await self.repo.bulk_resolve_requests(
+            session, request_ids, current_user.id, InviteStatus(option)
+        )
+        if option == InviteStatus.ACCEPTED:
+            await self.repo.bulk_add_members(
+                session, [(r.company_id, r.invited_user_id) for r in resolved]
+            )
+        await session.commit()
+
+        resolved_ids = {r.id for r in resolved}
+        statuses = {}
+        for request_id in request_ids:
+            row = state.get(request_id)
+            if request_id in resolved_ids:
+                statuses[request_id] = option
+            elif row is None:
+                statuses[request_id] = "not_found"
+            elif not row.is_owner:
+                statuses[request_id] = "forbidden"
+            elif row.type != InviteType.REQUEST:
+                statuses[request_id] = "not_a_request"
+            else:
+                statuses[request_id] = "not_pending"
+        return _bulk_report(request_ids, statuses, {option})
+
+    async def bulk_admin_change(
+        self,
+        action: str,
+        members_data: BulkMembersSchema,
+        current_user: UserModel,
+        session: AsyncSession,
+    ) -> BulkOperationReport:
+        if action == "add":
+            from_role, to_role, done = RoleEnum.MEMBER, RoleEnum.ADMIN, "promoted"
+        elif action == "remove":
+            from_role, to_role, done = RoleEnum.ADMIN, RoleEnum.MEMBER, "demoted"
+        else:
+            raise InvalidRoleActionError()
+        company_id = members_data.company_id
+        await self._authorize(session, company_id, current_user, OWNER_ONLY)
+        user_ids = list(dict.fromkeys(members_data.user_ids))
+
+        roles = await self.repo.get_member_roles(session, company_id, user_ids)
+        changed = set(
+            await self.repo.bulk_change_roles(
+                session,
+                company_id,
+                [user_id for user_id in user_ids if roles.get(user_id) == from_role],
+                from_role,
+                to_role,
+            )
+        )
+        await session.commit()
+
+        statuses = {}
+        for user_id in user_ids:
+            role = roles.get(user_id)
+            if user_id in changed:
+                statuses[user_id] = done
+            elif role is None:
+                statuses[user_id] = "not_member"
+            elif role == RoleEnum.OWNER:
+                statuses[user_id] = "is_owner"
+            elif role == to_role:
+                statuses[user_id] = f"already_{to_role.value}"
+            else:
+                statuses[user_id] = "role_changed_concurrently"
+        return _bulk_report(user_ids, statuses, {done})
+
     # ============================================ADMIN MANAGMENT==================/
 
     async def admin_list(
         self, company_id: UUID, current_user: UserModel, session: AsyncSession
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-        owner_company_ids = await self.repo.get_owner_company_ids(
-            session, current_user.id
-        )
-        if company_id not in owner_company_ids:
-            raise OwnerOnlyActionError()
+        await self._authorize(session, company_id, current_user, OWNER_ONLY)
         admins = await self.repo.get_company_admins(session, company_id)
         return admins or []
 
@@ -310,26 +567,16 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_company_ids = await self.repo.get_owner_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session, company_id, current_user, OWNER_ONLY, member_id=user_id
         )
-        if company_id not in owner_company_ids:
-            raise OwnerOnlyActionError()
-
-        user_role = await self.repo.get_user_role(session, company_id, user_id)
-        if not user_role:
-            raise MemberNotFoundError(user_id)
+        user_role = access.member
         if user_role.role == RoleEnum.ADMIN:
             raise UserAlreadyAdminException()
         if user_role.role == RoleEnum.OWNER:
             raise UserAlreadyOwnerException()
-        user_role.role = RoleEnum.ADMIN
 
-        await self.repo.update(session, user_role)
+        await self.repo.change_user_role(session, user_role, RoleEnum.ADMIN)
         return {"message": f"User with id {user_id} successfully became an admin"}
 
     async def admin_role_remove(
@@ -339,24 +586,14 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_company_ids = await self.repo.get_owner_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session, company_id, current_user, OWNER_ONLY, member_id=user_id
         )
-        if company_id not in owner_company_ids:
-            raise OwnerOnlyActionError()
-
-        user_role = await self.repo.get_user_role(session, company_id, user_id)
-        if not user_role:
-            raise MemberNotFoundError(user_id)
+        user_role = access.member
         if user_role.role != RoleEnum.ADMIN:
             raise InvalidInviteStatusError("User is not admin")
-        user_role.role = RoleEnum.MEMBER
 
-        await self.repo.update(session, user_role)
+        await self.repo.change_user_role(session, user_role, RoleEnum.MEMBER)
         return {"message": f"User with id {user_id} is not admin anymore"}
 
     # =================================QUIZZES MANAGMENT===========================================
@@ -368,15 +605,7 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_admin_company_ids = await self.repo.get_owner_or_admin_company_ids(
-            session, current_user.id
-        )
-        if company_id not in owner_admin_company_ids:
-            raise OwnerAndAdminOnlyActionError()
+        await self._authorize(session, company_id, current_user, OWNER_OR_ADMIN)
 
         if len(quiz_data.questions) < 2:
             raise FewQuestionsException()
@@ -386,7 +615,7 @@ class CompaniesService:
                 raise FewOptionsException()
 
         quiz = await self.repo.create_quiz(
-            session, quiz_data.title, quiz_data.description, company_id
+            session, quiz_data.title, quiz_data.description, company_id, commit=False
         )
 
         questions_list = [
@@ -399,12 +628,81 @@ class CompaniesService:
             for q in quiz_data.questions
         ]
 
-        await self.repo.create_questions(session, questions_list)
+        await self.repo.create_questions(session, questions_list, commit=False)
+        await self.repo.create_quiz_version(
+            session, quiz, [question["id"] for question in questions_list]
+        )
 
-        await self.repo.update(session, quiz)
+        await session.refresh(quiz)
 
         return quiz
 
+    async def company_import_quiz(
+        self,
+        company_id: UUID,
+        title: str,
+        description: str,
+        rows: AsyncIterator[tuple[int, dict | RowError]],
+        current_user: UserModel,
+        session: AsyncSession,
+        skip_invalid: bool = False,
+        chunk_size: int = import_settings.IMPORT_CHUNK_SIZE,
+    ) -> QuizImportReport:
+        """Create a quiz from a stream of question rows in a single transaction.
+
+        Valid rows are COPYed every ``chunk_size`` rows, so memory stays bounded.
+        Any invalid row rolls the whole import back unless ``skip_invalid``.
+        """
+        await self._authorize(session, company_id, current_user, OWNER_OR_ADMIN)
+        quiz = await self.repo.create_quiz(
+            session, title, description, company_id, commit=False
+        )
+        report = QuizImportReport()
+        batch: list[tuple] = []
+        question_ids: list[UUID] = []
+        try:
+            async for line_no, row in rows:
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    question = QuestionImportRow.model_validate(row)
+                except (RowError, ValidationError) as exc:
+                    report.add_error(line_no, row_error_message(exc))
+                    continue
+                question_ids.append(uuid4())
+                batch.append(
+                    (
+                        question_ids[-1],
+                        question.title,
+                        question.options,
+                        question.correct_answers,
+                        quiz.id,
+                    )
+                )
+                if len(batch) >= chunk_size:
+                    await self.repo.copy_questions(session, batch)
+                    report.imported += len(batch)
+                    batch = []
+            if batch:
+                await self.repo.copy_questions(session, batch)
+                report.imported += len(batch)
+        except Exception:
+            await session.rollback()
+            raise
+
+        if report.failed and not skip_invalid:
+            await session.rollback()
+            # Nothing was written, so don't report the valid rows as imported.
+            report.imported = 0
+            return report
+        if report.imported < 2:
+            await session.rollback()
+            raise FewQuestionsException()
+        await self.repo.create_quiz_version(session, quiz, question_ids)
+        report.quiz_id = quiz.id
+        report.committed = True
+        return report
+
     async def company_delete_quiz(
         self,
         company_id: UUID,
@@ -412,21 +710,12 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_admin_company_ids = await self.repo.get_owner_or_admin_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session, company_id, current_user, OWNER_OR_ADMIN, quiz_id=quiz_id
         )
-        if company_id not in owner_admin_company_ids:
-            raise OwnerAndAdminOnlyActionError()
-
-        quiz = await session.get(QuizModel, quiz_id)
-        if not quiz or quiz.company_id != company_id:
-            raise QuizNotFoundException()
 
-        await self.repo.delete(session, quiz)
+        await self.repo.publish_invalidation(session, quiz_cache.name, quiz_id)
+        await self.repo.delete(session, access.quiz)
 
         return {"message": "Quiz deleted successfully"}
 
@@ -438,26 +727,22 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_admin_company_ids = await self.repo.get_owner_or_admin_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session,
+            company_id,
+            current_user,
+            OWNER_OR_ADMIN,
+            quiz_id=quiz_id,
+            question_id=question_id,
         )
-        if company_id not in owner_admin_company_ids:
-            raise OwnerAndAdminOnlyActionError()
-
-        quiz = await self.repo.get_quiz_by_id_and_company(session, quiz_id, company_id)
-        if not quiz or quiz.company_id != company_id:
-            raise QuizNotFoundException()
-
-        question = await self.repo.get_question_by_id(session, question_id, quiz_id)
-        if not question or question.quiz_id != quiz_id:
-            raise QuestionNotFoundException()
 
-        await self.repo.delete(session, question)
-        return {"message": "Question deleted successfully"}
+        question_ids = await self._current_question_ids(session, access)
+        question_ids.remove(question_id)
+        await self._publish_version(session, access.quiz, question_ids)
+        return {
+            "message": "Question deleted successfully",
+            "version": access.quiz.version,
+        }
 
     async def company_edit_quiz(
         self,
@@ -467,19 +752,10 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_admin_company_ids = await self.repo.get_owner_or_admin_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session, company_id, current_user, OWNER_OR_ADMIN, quiz_id=quiz_id
         )
-        if company_id not in owner_admin_company_ids:
-            raise OwnerAndAdminOnlyActionError()
-
-        quiz = await self.repo.get_quiz_by_id(session, quiz_id, company_id)
-        if not quiz or quiz.company_id != company_id:
-            raise QuizNotFoundException()
+        quiz = access.quiz
 
         update_data = quiz_data.model_dump(exclude_unset=True)
         if not update_data:
@@ -488,6 +764,7 @@ class CompaniesService:
         for field, value in update_data.items():
             setattr(quiz, field, value)
 
+        await self.repo.publish_invalidation(session, quiz_cache.name, quiz_id)
         await self.repo.update(session, quiz)
 
         return quiz
@@ -501,23 +778,15 @@ class CompaniesService:
         current_user: UserModel,
         session: AsyncSession,
     ):
-        company = await self.repo.get_company_by_id(session, company_id)
-        if not company:
-            raise CompanyNotFoundError(company_id)
-
-        owner_admin_company_ids = await self.repo.get_owner_or_admin_company_ids(
-            session, current_user.id
+        access = await self._authorize(
+            session,
+            company_id,
+            current_user,
+            OWNER_OR_ADMIN,
+            quiz_id=quiz_id,
+            question_id=question_id,
         )
-        if company_id not in owner_admin_company_ids:
-            raise OwnerAndAdminOnlyActionError()
-
-        quiz = await self.repo.get_quiz_by_id(session, quiz_id, company_id)
-        if not quiz or quiz.company_id != company_id:
-            raise QuizNotFoundException()
-
-        question = await self.repo.get_question_by_id(session, question_id, quiz_id)
-        if not question or question.quiz_id != quiz_id:
-            raise QuestionNotFoundException()
+        question = access.question
 
         update_data = question_data.model_dump(exclude_unset=True)
         if not update_data:
@@ -528,12 +797,25 @@ class CompaniesService:
             if not options or len(options) < 2:
                 raise NotEnoughOptionsException()
 
-        for field, value in update_data.items():
-            setattr(question, field, value)
-
-        await self.repo.update(session, question)
+        question_ids = await self._current_question_ids(session, access)
+        # Questions are immutable: the edit becomes a new question in a new version.
+        edited = await self.repo.add_question(
+            session,
+            quiz_id=quiz_id,
+            title=update_data.get("title", question.title),
+            options=update_data.get("options", question.options),
+            correct_answers=update_data.get(
+                "correct_answers", question.correct_answers
+            ),
+        )
+        question_ids[question_ids.index(question_id)] = edited.id
+        await self._publish_version(session, access.quiz, question_ids)
 
-        return {"message": "Sucessfully updated question"}
+        return {
+            "message": "Sucessfully updated question",
+            "question_id": edited.id,
+            "version": access.quiz.version,
+        }
 
     async def company_all_quizzes(
         self, company_id: UUID, session: AsyncSession, limit: int = 10, offset: int = 0
@@ -545,8 +827,69 @@ class CompaniesService:
         quizzes = await self.repo.get_all_quizzes(company_id, session, limit, offset)
 
         return [
-            QuizzesList.model_validate(quiz).model_dump(mode="json") for quiz in quizzes
+            QuizzesList(
+                id=quiz.id,
+                title=quiz.title,
+                description=quiz.description,
+                version=quiz.version,
+                questions=[QuestionList.model_validate(q) for q in questions],
+            ).model_dump(mode="json")
+            for quiz, questions in quizzes
         ]
 
+    async def company_quiz_version(
+        self, company_id: UUID, quiz_id: UUID, number: int, session: AsyncSession
+    ) -> dict:
+        """The questions of one published quiz version; never changes once found."""
+        quiz = quiz_cache.get(quiz_id)
+        if quiz is None:
+            if not await self.repo.get_company_by_id(session, company_id):
+                raise CompanyNotFoundError(company_id)
+            quiz = await self.repo.get_quiz_by_id(session, quiz_id, company_id)
+            if not quiz:
+                raise QuizNotFoundException()
+            quiz_cache.set(quiz_id, quiz)
+        if quiz.company_id != company_id:
+            raise QuizNotFoundException()
+        if not 1 <= number <= quiz.version:
+            raise QuizVersionNotFoundException(number)
+
+        key = f"{quiz_id}:{number}"
+        content = quiz_content_cache.get(key)
+        if content is None:
+            version = await self.repo.get_quiz_version(session, quiz_id, number)
+            questions = await self.repo.get_questions_by_ids(
+                session, version.question_ids
+            )
+            content = QuizVersionSchema(
+                quiz_id=quiz_id,
+                version=number,
+                questions=[QuestionList.model_validate(q) for q in questions],
+            ).model_dump(mode="json")
+            quiz_content_cache.set(key, content)
+        return content
+
+    async def _current_question_ids(
+        self, session: AsyncSession, access: CompanyAccess
+    ) -> list[UUID]:
+        version = await self.repo.get_quiz_version(
+            session, access.quiz.id, access.quiz.version
+        )
+        if access.question.id not in version.question_ids:
+            # Replaced or removed by an earlier edit; only the current version is editable.
+            raise QuestionNotFoundException()
+        return list(version.question_ids)
+
+    async def _publish_version(
+        self, session: AsyncSession, quiz: QuizModel, question_ids: list[UUID]
+    ):
+        if not await self.repo.create_quiz_version(
+            session, quiz, question_ids, commit=False
+        ):
+            await session.rollback()
+            raise QuizVersionConflictException()
+        await self.repo.publish_invalidation(session, quiz_cache.name, quiz.id)
+        await session.commit()
+
 
 companies_service = CompaniesService(CompaniesRepository())
@@ -1,28 +1,123 @@
-import redis.asyncio as redis
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
 from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.logger import logger
-from app.db.session import AsyncSessionLocal
+from app.db.session import engine, redis_client
+
+Probe = Callable[[], Awaitable[object]]
+
+
+async def postgres_probe():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def redis_probe():
+    if not await redis_client.ping():
+        raise ConnectionError("Redis did not answer PING")
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
 
+@dataclass
+class HealthMonitor:
+    """Probes dependencies in the background and serves the last result instantly.
 
-async def redis_main():
-    async with redis.from_url(
-        settings.redis.url, decode_responses=True
-    ) as redis_connect:
+    Probes run concurrently on the shared engine pool and Redis client, each
+    bounded by ``timeout``; a result older than ``stale_after`` counts as failed.
+    """
+
+    probes: dict[str, Probe]
+    interval: float = 5.0
+    timeout: float = 2.0
+    stale_after: float = 15.0
+    results: dict[str, ProbeResult] = field(default_factory=dict)
+    _task: asyncio.Task | None = None
+
+    async def _run_probe(self, name: str, probe: Probe) -> ProbeResult:
+        started_at = time.perf_counter()
+        error = None
         try:
-            answer = await redis_connect.ping()
-            if answer:
-                logger.info("Redis successfully connected with async")
-                return True
+            await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout}s"
         except Exception as e:
-            logger.info("Failed to connect to the Redis =>", e)
-            return False
+            error = repr(e)
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        if error and (name not in self.results or self.results[name].ok):
+            logger.warning(f"Health probe {name} failed: {error}")
+        return ProbeResult(
+            ok=error is None,
+            latency_ms=round(latency_ms, 1),
+            checked_at=time.monotonic(),
+            error=error,
+        )
+
+    async def probe_once(self) -> dict[str, ProbeResult]:
+        names = list(self.probes)
+        results = await asyncio.gather(
+            *(self._run_probe(name, self.probes[name]) for name in names)
+        )
+        self.results = dict(zip(names, results))
+        return self.results
+
+    async def _loop(self):
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_live(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def readiness(self) -> tuple[bool, dict[str, dict]]:
+        now = time.monotonic()
+        report = {}
+        ready = True
+        for name in self.probes:
+            result = self.results.get(name)
+            if result is None:
+                ready = False
+                report[name] = {"ok": False, "error": "not probed yet"}
+                continue
+            fresh = now - result.checked_at <= self.stale_after
+            ok = result.ok and fresh
+            ready = ready and ok
+            report[name] = {
+                "ok": ok,
+                "latency_ms": result.latency_ms,
+                "age_s": round(now - result.checked_at, 1),
+                "error": result.error if fresh else "stale result",
+            }
+        return ready, report
 
 
-async def posgtres_main():
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(text("SELECT 1"))
-        value = result.scalar()
-        logger.info("Postgres connected successfully:")
-        return True if value else False
+health_monitor = HealthMonitor(
+    probes={"postgres": postgres_probe, "redis": redis_probe},
+    interval=settings.app.HEALTH_PROBE_INTERVAL,
+    timeout=settings.app.HEALTH_PROBE_TIMEOUT,
+    stale_after=settings.app.HEALTH_STALE_AFTER,
+)
@@ -0,0 +1,80 @@
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import PURGED_ROWS
+from app.db.session import redis_client
+
+PurgeChunk = tuple[str, int] | None
+
+
+class PurgeProgress:
+    """State and per-table deleted row counts of each purge, one Redis hash each.
+
+    ``HGETALL purge:<kind>:<id>`` shows ``state`` (scheduled, running or done),
+    the timestamps and one counter per table.
+    """
+
+    EXPIRE_SECONDS = 7 * 24 * 60 * 60
+
+    def __init__(self, redis: Redis, prefix: str = "purge"):
+        self.redis = redis
+        self.prefix = prefix
+
+    def key(self, kind: str, target_id: UUID) -> str:
+        return f"{self.prefix}:{kind}:{target_id}"
+
+    async def _update(self, kind: str, target_id: UUID, counts=None, **fields):
+        key = self.key(kind, target_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={**fields, "updated_at": repr(time.time())})
+            for table, deleted in (counts or {}).items():
+                pipe.hincrby(key, table, deleted)
+            pipe.expire(key, self.EXPIRE_SECONDS)
+            await pipe.execute()
+
+    async def schedule(self, kind: str, target_id: UUID):
+        await self._update(kind, target_id, state="scheduled")
+
+    async def record(self, kind: str, target_id: UUID, table: str, deleted: int):
+        await self._update(kind, target_id, {table: deleted}, state="running")
+
+    async def finish(self, kind: str, target_id: UUID):
+        await self._update(kind, target_id, state="done")
+
+    async def get(self, kind: str, target_id: UUID) -> dict[str, str]:
+        return await self.redis.hgetall(self.key(kind, target_id))
+
+
+purge_progress = PurgeProgress(redis_client)
+
+
+async def purge_in_chunks(
+    session: AsyncSession,
+    kind: str,
+    target_id: UUID,
+    next_chunk: Callable[[], Awaitable[PurgeChunk]],
+    finish: Callable[[], Awaitable[None]],
+    max_chunks: int,
+    progress: PurgeProgress,
+) -> bool:
+    """Run ``next_chunk`` in its own transaction until it reports nothing left.
+
+    ``next_chunk`` deletes one bounded batch and returns (table, rows) or None;
+    ``finish`` then deletes the target row itself. Returns False when
+    ``max_chunks`` ran out first, so the caller can continue in a new job.
+    """
+    for _ in range(max_chunks):
+        chunk = await next_chunk()
+        if chunk is None:
+            await finish()
+            await progress.finish(kind, target_id)
+            return True
+        await session.commit()
+        table, deleted = chunk
+        PURGED_ROWS.labels(kind, table).inc(deleted)
+        await progress.record(kind, target_id, table, deleted)
+    return False
@@ -8,14 +8,14 @@ class RedisQuizService:
     EXPIRE_SECONDS = 48 * 60 * 60
 
     @staticmethod
-    async def save_quiz_answer(
+    def _entry(
         user_id: UUID,
         company_id: UUID,
         quiz_id: UUID,
         question_id: UUID,
         selected_answers: list[int],
         is_correct: bool,
-    ):
+    ) -> tuple[str, str]:
         key = f"quiz:{user_id}:{quiz_id}:{question_id}"
 
         value = {
@@ -26,7 +26,27 @@ class RedisQuizService:
             "selected_answers": selected_answers,
             "is_correct": is_correct,
         }
+        return key, json.dumps(value)
 
-        await redis_client.setex(
-            key, RedisQuizService.EXPIRE_SECONDS, json.dumps(value)
+    @staticmethod
+    async def save_quiz_answer(
+        user_id: UUID,
+        company_id: UUID,
+        quiz_id: UUID,
+        question_id: UUID,
+        selected_answers: list[int],
+        is_correct: bool,
+    ):
+        key, value = RedisQuizService._entry(
+            user_id, company_id, quiz_id, question_id, selected_answers, is_correct
         )
+        await redis_client.setex(key, RedisQuizService.EXPIRE_SECONDS, value)
+
+    @staticmethod
+    async def save_quiz_answers(answers: list[dict]):
+        """Cache many answers (save_quiz_answer's kwargs each) in one round trip."""
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for answer in answers:
+                key, value = RedisQuizService._entry(**answer)
+                pipe.setex(key, RedisQuizService.EXPIRE_SECONDS, value)
+            await pipe.execute()
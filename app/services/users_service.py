@@ -1,8 +1,10 @@
 from uuid import UUID
 
 from fastapi import HTTPException
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.answers_config import answers_settings
 from app.core.answers_exceptions import (
     NoOptionsSelectedError,
     OptionIndexOutOfRangeError,
@@ -20,6 +22,7 @@ from app.core.invites_exceptions import (
     InviteNotFoundError,
     InvitePermissionDeniedError,
 )
+from app.core.jobs_config import jobs_settings
 from app.core.logger import logger
 from app.core.quiz_exceptions import (
     AlreadyAnsweredException,
@@ -38,6 +41,8 @@ from app.core.users_exceptions import (
     InvalidRefreshTokenError,
     UserNotFoundError,
 )
+from app.jobs.answer_buffer import AppendOutcome, BufferedAnswer, answer_buffer
+from app.jobs.queue import job_queue
 from app.models.company_invite_request_model import InviteStatus, InviteType
 from app.models.company_user_role_model import RoleEnum
 from app.models.user_model import UserModel
@@ -47,16 +52,23 @@ from app.schemas.user_schema import (
     AnswerUserSchema,
     SignUpSchema,
     UserSchema,
+    UserSearchPage,
     UserUpdateSchema,
 )
+from app.services.cache_service import question_cache, quiz_cache, quiz_version_cache
+from app.services.purge_service import purge_in_chunks, purge_progress
 from app.services.redis_service import RedisQuizService
+from app.utils.dataloader import Loaders
+from app.utils.invite_util import invites_with_details
 from app.utils.jwt_util import (
     create_access_token,
     create_refresh_token,
     decode_token,
     password_hash,
+    run_password_work,
     verify_password,
 )
+from app.utils.search_util import decode_cursor, next_cursor
 
 
 class UserService:
@@ -74,10 +86,25 @@ class UserService:
             ]
         return user_list or []
 
+    async def search_users(
+        self,
+        query: str,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> UserSearchPage:
+        rows = await self.repo.search_users(
+            session, query, limit + 1, decode_cursor(cursor)
+        )
+        return UserSearchPage(
+            items=[user for user, _ in rows[:limit]],
+            next_cursor=next_cursor(rows, limit),
+        )
+
     async def create_user(self, session: AsyncSession, user_data: SignUpSchema):
         data = user_data.model_dump()
         if "password" in data:
-            data["password"] = password_hash(data["password"])
+            data["password"] = await run_password_work(password_hash, data["password"])
         user = await self.repo.create(session, data)
         logger.info(f"User created: id={user.id}, name={user.name}")
         return user
@@ -87,8 +114,35 @@ class UserService:
         if not user:
             logger.warning(f"Attempted delete — user not found: id={current_user.id}")
             raise UserNotFoundError(current_user.id)
-        await self.repo.delete(session, user)
-        logger.info(f"User deleted: id={current_user.id}, name={user.name}")
+        # Signing in stops working now; the job removes the rows afterwards.
+        await self.repo.deactivate_user(session, user)
+        await purge_progress.schedule("user", user.id)
+        await job_queue.enqueue("purge_user", {"user_id": user.id})
+        logger.info(f"User deactivated, purge scheduled: id={current_user.id}")
+        return {"message": "Account deletion scheduled.", "user_id": user.id}
+
+    async def user_purge(
+        self,
+        user_id: UUID,
+        session: AsyncSession,
+        chunk_size: int = jobs_settings.PURGE_CHUNK_SIZE,
+        max_chunks: int = jobs_settings.PURGE_CHUNKS_PER_JOB,
+    ) -> bool:
+        """Delete a deactivated user's rows, one short transaction per chunk.
+
+        Returns False when ``max_chunks`` ran out before the user row was gone.
+        """
+        if await self.repo.get_inactive_user(session, user_id) is None:
+            return True
+        return await purge_in_chunks(
+            session,
+            "user",
+            user_id,
+            lambda: self.repo.purge_user_chunk(session, user_id, chunk_size),
+            lambda: self.repo.delete_purged_user(session, user_id),
+            max_chunks,
+            purge_progress,
+        )
 
     async def get_user_by_id(self, session: AsyncSession, user_id: UUID):
         user = await self.repo.get(session, user_id)
@@ -109,7 +163,9 @@ class UserService:
         if "email" in filtered_data:
             raise EmailChangeForbiddenError()
         if "password" in filtered_data:
-            filtered_data["password"] = password_hash(filtered_data["password"])
+            filtered_data["password"] = await run_password_work(
+                password_hash, filtered_data["password"]
+            )
 
         for key, value in filtered_data.items():
             setattr(user, key, value)
@@ -126,9 +182,9 @@ class UserService:
         email = user_data.get("email")
         password = user_data.get("password")
         user = await self.repo.get_by_email(session, email)
-        if not user:
+        if not user or not user.is_active:
             raise InvalidCredentialsError()
-        if not verify_password(password, user.password):
+        if not await run_password_work(verify_password, password, user.password):
             raise InvalidCredentialsError()
         access_token = create_access_token({"sub": user.email})
         refresh_token = create_refresh_token({"sub": user.email})
@@ -230,28 +286,43 @@ class UserService:
         user_role = await self.repo.get_user_role(session, company_id, current_user.id)
         if not user_role:
             raise NotCompanyMemberError()
-        if user_role.role == RoleEnum.OWNER:
-            owners = await self.repo.get_users_with_roles(
-                session, company_id, limit=1000, offset=0
-            )
-            if len(owners) == 1:
-                raise OwnerCannotLeaveError()
-        await self.repo.delete_user_role(session, user_role)
+        if not await self.repo.leave_company(session, user_role):
+            raise OwnerCannotLeaveError()
         return {"message": "You have successfully left the company."}
 
     # ========================MANAGING REQUESTS=========
 
-    async def show_user_requests(self, current_user: UserModel, session: AsyncSession):
+    async def show_user_requests(
+        self,
+        current_user: UserModel,
+        session: AsyncSession,
+        loaders: Loaders | None = None,
+    ):
+        loaders = loaders or Loaders(session)
         user_requests = await self.repo.get_user_requests(session, current_user.id)
         if not user_requests:
             return {"message": "No requests from you"}
-        return {"message": "Successfully found requests", "requests": user_requests}
+        loaders.users.prime(current_user.id, current_user)
+        return {
+            "message": "Successfully found requests",
+            "requests": await invites_with_details(user_requests, loaders),
+        }
 
-    async def show_user_invites(self, current_user: UserModel, session: AsyncSession):
+    async def show_user_invites(
+        self,
+        current_user: UserModel,
+        session: AsyncSession,
+        loaders: Loaders | None = None,
+    ):
+        loaders = loaders or Loaders(session)
         user_invites = await self.repo.get_user_invites(session, current_user.id)
         if not user_invites:
             return {"message": "No invites were sent to you"}
-        return {"message": "Successfully found invites", "invites": user_invites}
+        loaders.users.prime(current_user.id, current_user)
+        return {
+            "message": "Successfully found invites",
+            "invites": await invites_with_details(user_invites, loaders),
+        }
 
     # ======================== ANSWER THE QUESTION ==============================
 
@@ -269,9 +340,12 @@ class UserService:
         if len(answers.selected_options) == 0:
             raise NoOptionsSelectedError()
 
-        quiz = await self.repo.get_quiz_by_id(session, quiz_id)
-        if not quiz:
-            raise QuizNotFoundException()
+        quiz = quiz_cache.get(quiz_id)
+        if quiz is None:
+            quiz = await self.repo.get_quiz_by_id(session, quiz_id)
+            if not quiz:
+                raise QuizNotFoundException()
+            quiz_cache.set(quiz_id, quiz)
 
         user_role = await self.repo.get_user_role(
             session, quiz.company_id, current_user.id
@@ -279,7 +353,22 @@ class UserService:
         if not user_role:
             raise NotCompanyMemberError()
 
-        question = await self.repo.get_question_by_id(session, question_id, quiz_id)
+        version_key = f"{quiz_id}:{quiz.version}"
+        version = quiz_version_cache.get(version_key)
+        if version is None:
+            version = await self.repo.get_quiz_version(session, quiz_id, quiz.version)
+            if not version:
+                raise QuizNotFoundException()
+            quiz_version_cache.set(version_key, version)
+        # Only the current version's questions can be answered.
+        if question_id not in version.question_ids:
+            raise QuestionNotFoundException()
+
+        question = question_cache.get(question_id)
+        if question is None:
+            question = await self.repo.get_question_by_id(session, question_id, quiz_id)
+            if question:
+                question_cache.set(question_id, question)
         if not question or question.quiz_id != quiz_id:
             raise QuestionNotFoundException()
 
@@ -299,22 +388,49 @@ class UserService:
         if existing_result and existing_result.quiz_result.is_done:
             raise AlreadyAnsweredException()
 
+        redis_up = True
+        if answers_settings.ANSWERS_WRITE_BEHIND:
+            answer = BufferedAnswer(
+                user_id=current_user.id,
+                company_id=quiz.company_id,
+                quiz_id=quiz_id,
+                version_id=version.id,
+                question_id=question_id,
+                selected_answers=answers.selected_options,
+                is_correct=is_correct,
+            )
+            try:
+                outcome = await answer_buffer.append(answer)
+            except RedisError as exc:
+                logger.warning(f"Answer buffer unavailable, writing directly: {exc!r}")
+                outcome = AppendOutcome.FULL
+                redis_up = False
+            if outcome == AppendOutcome.DUPLICATE:
+                raise AlreadyAnsweredException()
+            if outcome == AppendOutcome.BUFFERED:
+                return {"message": "Your answer was successfully saved."}
+            # The buffer is full (or down): write this answer directly instead.
+
         await self.repo.create_result_with_answer(
             session,
             user_id=current_user.id,
             quiz_id=quiz_id,
+            version_id=version.id,
             question_id=question_id,
             selected_options=answers.selected_options,
         )
 
-        await RedisQuizService.save_quiz_answer(
-            user_id=current_user.id,
-            company_id=quiz.company_id,
-            quiz_id=quiz_id,
-            question_id=question_id,
-            selected_answers=answers.selected_options,
-            is_correct=is_correct,
-        )
+        # One SETEX; queueing it would cost the same round trip as doing it. If the
+        # buffer just found Redis down, skip it so the saved answer doesn't fail.
+        if redis_up:
+            await RedisQuizService.save_quiz_answer(
+                user_id=current_user.id,
+                company_id=quiz.company_id,
+                quiz_id=quiz_id,
+                question_id=question_id,
+                selected_answers=answers.selected_options,
+                is_correct=is_correct,
+            )
 
         return {"message": "Your answer was successfully saved."}
 
@@ -1,9 +1,10 @@
-from app.services.health_service import posgtres_main, redis_main
+from app.services.health_service import health_monitor
 
 
 async def connection_check():
-    psql_ok = await posgtres_main()
-    redis_ok = await redis_main()
+    _, report = health_monitor.readiness()
+    psql_ok = report["postgres"]["ok"]
+    redis_ok = report["redis"]["ok"]
 
     return {
         "postgres": "Postgres connected" if psql_ok else "Postgres connection failed",
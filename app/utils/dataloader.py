@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import CACHE_REQUESTS
+from app.db.session import get_session
+from app.models.company_model import CompanyModel
+from app.models.user_model import UserModel
+from app.repository.base_repository import AsyncBaseRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFn = Callable[[list[K]], Awaitable[dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces every load() issued in one event-loop tick into one batch call.
+
+    Results are memoized for the lifetime of the loader, so a loader must
+    never outlive the request (and session) it was created for.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        lock: asyncio.Lock | None = None,
+        name: str = "dataloader",
+    ):
+        self._batch_fn = batch_fn
+        self._lock = lock or asyncio.Lock()
+        self._hits = CACHE_REQUESTS.labels(name, "hit")
+        self._misses = CACHE_REQUESTS.labels(name, "miss")
+        self._cache: dict[K, asyncio.Future] = {}
+        self._queue: list[tuple[K, asyncio.Future]] = []
+        # The loop only keeps weak references to tasks; a collected dispatch
+        # would leave its futures pending forever.
+        self._dispatches: set[asyncio.Task] = set()
+
+    async def load(self, key: K | None) -> V | None:
+        if key is None:
+            return None
+        future = self._cache.get(key)
+        # A cancelled future means its waiter gave up, not that the key failed.
+        if future is not None and not future.cancelled():
+            self._hits.inc()
+        else:
+            self._misses.inc()
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            self._queue.append((key, future))
+            if len(self._queue) == 1:
+                loop.call_soon(self._schedule_dispatch)
+        return await future
+
+    async def load_many(self, keys: Iterable[K | None]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V):
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def _schedule_dispatch(self):
+        batch, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    def _forget(self, key: K, future: asyncio.Future):
+        if self._cache.get(key) is future:
+            del self._cache[key]
+
+    async def _dispatch(self, batch: list[tuple[K, asyncio.Future]]):
+        keys = list(dict.fromkeys(key for key, _ in batch))
+        try:
+            # A session can run one statement at a time, so loaders sharing a
+            # session also share the lock and their batches run back to back.
+            async with self._lock:
+                results = await self._batch_fn(keys)
+        except Exception as e:
+            for key, future in batch:
+                self._forget(key, future)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch:
+            # Cancelled with its waiter; the next load() fetches the key again.
+            if future.cancelled():
+                self._forget(key, future)
+            elif not future.done():
+                future.set_result(results.get(key))
+
+
+def _by_id_loader(session: AsyncSession, model: Any, lock: asyncio.Lock, name: str):
+    repo = AsyncBaseRepository(model)
+
+    async def batch(ids: list) -> dict:
+        return {obj.id: obj for obj in await repo.get_many(session, ids)}
+
+    return DataLoader(batch, lock, name=f"loader:{name}")
+
+
+class Loaders:
+    def __init__(self, session: AsyncSession):
+        lock = asyncio.Lock()
+        self.users: DataLoader = _by_id_loader(session, UserModel, lock, "users")
+        self.companies: DataLoader = _by_id_loader(
+            session, CompanyModel, lock, "companies"
+        )
+
+
+async def get_loaders(session: AsyncSession = Depends(get_session)) -> Loaders:
+    return Loaders(session)
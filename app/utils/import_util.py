@@ -0,0 +1,111 @@
+import csv
+import json
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+
+from app.core.import_config import import_settings
+from app.core.import_exceptions import UnsupportedImportFormatError
+
+IMPORT_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class RowError(Exception):
+    """A line of an import that cannot become a row; reported, not raised."""
+
+
+def import_format(content_type: str) -> str:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type not in IMPORT_FORMATS:
+        raise UnsupportedImportFormatError(media_type)
+    return IMPORT_FORMATS[media_type]
+
+
+def row_error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+
+def _decode(line: bytes) -> str | RowError:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return RowError("line is not valid UTF-8")
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = import_settings.IMPORT_MAX_LINE_BYTES,
+) -> AsyncIterator[tuple[int, str | RowError]]:
+    """Split a byte stream into numbered lines, holding at most one line in memory.
+
+    Over-long or undecodable lines come out as a RowError in place of the text.
+    """
+    too_long = RowError(f"line is longer than {max_line_bytes} bytes")
+    buffer = bytearray()
+    line_no = 0
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            line_no += 1
+            if skipping or end - start > max_line_bytes:
+                yield line_no, too_long
+            else:
+                yield line_no, _decode(buffer[start:end])
+            skipping = False
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            buffer.clear()
+            skipping = True
+    if buffer or skipping:
+        yield line_no + 1, too_long if skipping else _decode(buffer)
+
+
+async def iter_rows(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    max_line_bytes: int = import_settings.IMPORT_MAX_LINE_BYTES,
+) -> AsyncIterator[tuple[int, dict | RowError]]:
+    """Yield (line number, row) for each non-blank NDJSON line or CSV record.
+
+    A CSV stream starts with a header line naming the columns; records cannot
+    span lines.
+    """
+    header: list[str] | None = None
+    async for line_no, line in iter_lines(chunks, max_line_bytes):
+        if isinstance(line, RowError):
+            yield line_no, line
+            continue
+        if not line.strip():
+            continue
+        if fmt == "ndjson":
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_no, RowError(f"invalid JSON: {exc}")
+                continue
+            if not isinstance(row, dict):
+                row = RowError("each line must be a JSON object")
+            yield line_no, row
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip() for column in values]
+        elif len(values) != len(header):
+            yield (
+                line_no,
+                RowError(f"expected {len(header)} columns, got {len(values)}"),
+            )
+        else:
+            yield line_no, dict(zip(header, values))
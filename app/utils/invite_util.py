@@ -0,0 +1,40 @@
+import asyncio
+
+from app.models.company_invite_request_model import CompanyInviteRequestModel
+from app.schemas.company_schema import (
+    CompanySummarySchema,
+    InviteDetailsSchema,
+    UserSummarySchema,
+)
+from app.utils.dataloader import Loaders
+
+
+def _summary(schema, obj):
+    return schema.model_validate(obj) if obj is not None else None
+
+
+async def invites_with_details(
+    invites: list[CompanyInviteRequestModel], loaders: Loaders
+) -> list[InviteDetailsSchema]:
+    companies, invited_users, invited_by_users = await asyncio.gather(
+        loaders.companies.load_many(i.company_id for i in invites),
+        loaders.users.load_many(i.invited_user_id for i in invites),
+        loaders.users.load_many(i.invited_by_id for i in invites),
+    )
+    return [
+        InviteDetailsSchema(
+            id=invite.id,
+            type=invite.type,
+            status=invite.status,
+            created_at=invite.created_at,
+            company_id=invite.company_id,
+            invited_user_id=invite.invited_user_id,
+            invited_by_id=invite.invited_by_id,
+            company=_summary(CompanySummarySchema, company),
+            invited_user=_summary(UserSummarySchema, invited_user),
+            invited_by=_summary(UserSummarySchema, invited_by),
+        )
+        for invite, company, invited_user, invited_by in zip(
+            invites, companies, invited_users, invited_by_users
+        )
+    ]
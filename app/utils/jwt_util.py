@@ -1,11 +1,14 @@
+import asyncio
+import functools
 from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
 
 import jwt
 from fastapi import HTTPException
 from fastapi.security import HTTPBearer
-from pwdlib import PasswordHash
 
 from app.core.jwt_config import jwt_settings
+from app.core.metrics import PASSWORD_HASH_QUEUE
 
 SECRET_KEY = jwt_settings.SECRET_KEY
 ALGORITHM = jwt_settings.ALGORITHM
@@ -14,7 +17,25 @@ REFRESH_TOKEN_EXPIRE_DAY = jwt_settings.REFRESH_TOKEN_EXPIRE_DAY
 OTHER_SECRET_KEY = jwt_settings.OTHER_SECRET_KEY
 
 security = HTTPBearer()
-pwd_context = PasswordHash.recommended()
+
+
+class LazyPasswordHash:
+    """Builds the hasher, and imports its argon2 backend, on first use."""
+
+    @functools.cached_property
+    def hasher(self):
+        from pwdlib import PasswordHash
+
+        return PasswordHash.recommended()
+
+    def hash(self, password: str) -> str:
+        return self.hasher.hash(password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self.hasher.verify(password, hashed)
+
+
+pwd_context = LazyPasswordHash()
 
 
 def create_access_token(data: dict):
@@ -41,6 +62,15 @@ def password_hash(password: str):
     return pwd_context.hash(password)
 
 
+async def run_password_work(func: Callable[..., Any], *args) -> Any:
+    """Run a CPU-bound hash/verify call off the event loop."""
+    PASSWORD_HASH_QUEUE.inc()
+    try:
+        return await asyncio.to_thread(func, *args)
+    finally:
+        PASSWORD_HASH_QUEUE.dec()
+
+
 def decode_token(token: str, expected_type: str):
     try:
         key_to_use = SECRET_KEY if expected_type == "access" else OTHER_SECRET_KEY
@@ -0,0 +1,123 @@
+import math
+
+from fastapi import Depends, Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.logger import logger
+from app.core.metrics import RATE_LIMITED_REQUESTS
+from app.core.rate_limit_config import RateLimitRule, rate_limit_settings
+from app.core.rate_limit_exceptions import TooManyRequestsError
+from app.db.session import redis_client
+from app.models.user_model import UserModel
+from app.utils.user_util import user_connect
+
+# Refills and takes one token from every bucket in KEYS, or from none of them.
+# ARGV: cost, then capacity and refill-per-second for each key.
+# Returns {1, "0"} when allowed, {0, seconds_until_allowed} otherwise.
+TOKEN_BUCKET_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local tokens = {}
+local wait = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local last = tonumber(bucket[2]) or now
+    available = math.min(capacity, available + math.max(0, now - last) * rate)
+    if available < cost then
+        wait = math.max(wait, (cost - available) / rate)
+    end
+    tokens[i] = available
+end
+
+if wait > 0 then
+    return {0, string.format('%.3f', wait)}
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    redis.call(
+        'HSET', key,
+        'tokens', string.format('%.17g', tokens[i] - cost),
+        'ts', string.format('%.17g', now)
+    )
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return {1, '0'}
+"""
+
+
+class TokenBucketLimiter:
+    """Per-route token buckets in Redis, keyed by user and by client IP.
+
+    A Redis outage lets requests through instead of failing them.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        rules: dict[str, RateLimitRule],
+        enabled: bool = True,
+        prefix: str = "ratelimit",
+    ):
+        self.rules = rules
+        self.enabled = enabled
+        self.prefix = prefix
+        self.script = redis.register_script(TOKEN_BUCKET_LUA)
+
+    def buckets(
+        self, route: str, ip: str | None, identity: str | None
+    ) -> list[tuple[str, RateLimitRule]]:
+        buckets = []
+        for scope, value in (("user", identity), ("ip", ip)):
+            rule = self.rules.get(f"{route}:{scope}")
+            if rule is not None and value:
+                buckets.append((f"{self.prefix}:{route}:{scope}:{value}", rule))
+        return buckets
+
+    async def hit(self, route: str, ip: str | None, identity: str | None = None):
+        buckets = self.buckets(route, ip, identity)
+        if not self.enabled or not buckets:
+            return
+        args = [1]
+        for _, rule in buckets:
+            args += [rule.capacity, rule.refill_per_second]
+        try:
+            allowed, retry_after = await self.script(
+                keys=[key for key, _ in buckets], args=args
+            )
+        except RedisError as exc:
+            logger.warning(f"Rate limiter unavailable, allowing request: {exc!r}")
+            return
+        if not int(allowed):
+            RATE_LIMITED_REQUESTS.labels(route).inc()
+            raise TooManyRequestsError(max(1, math.ceil(float(retry_after))))
+
+
+def client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+
+rate_limiter = TokenBucketLimiter(
+    redis_client,
+    rate_limit_settings.RATE_LIMITS,
+    enabled=rate_limit_settings.RATE_LIMIT_ENABLED,
+)
+
+
+class RateLimit:
+    """Dependency limiting an authenticated route per current user and per IP."""
+
+    def __init__(self, route: str):
+        self.route = route
+
+    async def __call__(
+        self, request: Request, current_user: UserModel = Depends(user_connect)
+    ):
+        await rate_limiter.hit(self.route, client_ip(request), str(current_user.id))
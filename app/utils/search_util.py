@@ -0,0 +1,38 @@
+import base64
+import json
+from uuid import UUID
+
+from app.core.search_exceptions import InvalidCursorError
+
+# Passed to pg_trgm as-is; shorter queries have no trigram to look up.
+SEARCH_MIN_LENGTH = 3
+SEARCH_MAX_LENGTH = 100
+SEARCH_MAX_LIMIT = 50
+
+SearchCursor = tuple[float, UUID]
+
+
+def encode_cursor(rank: float, id: UUID) -> str:
+    """Opaque keyset position after a row ranked ``rank`` with id ``id``."""
+    raw = json.dumps([rank, str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> SearchCursor | None:
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, id = json.loads(raw)
+        return float(rank), UUID(id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError()
+
+
+def next_cursor(rows: list[tuple], limit: int) -> str | None:
+    """Cursor for the page after ``rows``, fetched as up to ``limit + 1`` rows
+    of (object, rank); None on the last page."""
+    if len(rows) <= limit:
+        return None
+    obj, rank = rows[limit - 1]
+    return encode_cursor(rank, obj.id)
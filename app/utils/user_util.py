@@ -1,18 +1,42 @@
 import jwt as pyjwt
-import requests
 from fastapi import Depends, Header, HTTPException
-from jose import jwt as jose_jwt
-from jwt.algorithms import RSAAlgorithm
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth0_config import auth0_settings
+from app.core.logger import logger
 from app.db.session import get_session
 from app.models.user_model import UserModel
 from app.repository.users_repository import UserRepository
 from app.utils.jwt_util import decode_token
 
 
+def auth0_token_email(token: str) -> str | None:
+    """Verify an Auth0 token against the tenant's JWKS and return its email.
+
+    Only Auth0 logins need jose and requests, so they are imported here.
+    """
+    import requests
+    from jose import jwt as jose_jwt
+    from jwt.algorithms import RSAAlgorithm
+
+    kid = pyjwt.get_unverified_header(token).get("kid")
+    jwks = requests.get(
+        f"https://{auth0_settings.AUTH0_DOMAIN}/.well-known/jwks.json"
+    ).json()
+    key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+    if not key:
+        raise HTTPException(status_code=401, detail="Auth0 public key not found")
+    public_key = RSAAlgorithm.from_jwk(key)
+    payload = jose_jwt.decode(
+        token,
+        public_key,
+        audience=auth0_settings.API_AUDIENCE,
+        algorithms=auth0_settings.ALGORITHMS_AUTH0,
+    )
+    return payload.get("email")
+
+
 async def user_connect(
     authorization: str = Header(...), session: AsyncSession = Depends(get_session)
 ):
@@ -24,36 +48,21 @@ async def user_connect(
     token = authorization.split(" ")[1]
 
     try:
-        not_verified_payload = jose_jwt.get_unverified_claims(token)
+        not_verified_payload = pyjwt.decode(token, options={"verify_signature": False})
         iss = not_verified_payload.get("iss")
 
         # =============AUTH0===============================
 
         if iss == f"https://{auth0_settings.AUTH0_DOMAIN}/":
-            headers = jose_jwt.get_unverified_header(token)
-            kid = headers.get("kid")
-            jwks = requests.get(
-                f"https://{auth0_settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-            ).json()
-            key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-            if not key:
-                raise HTTPException(
-                    status_code=401, detail="Auth0 public key not found"
-                )
-            public_key = RSAAlgorithm.from_jwk(key)
-            payload = jose_jwt.decode(
-                token,
-                public_key,
-                audience=auth0_settings.API_AUDIENCE,
-                algorithms=auth0_settings.ALGORITHMS_AUTH0,
-            )
-            email = payload.get("email")
+            email = auth0_token_email(token)
             if not email:
                 raise HTTPException(status_code=400, detail="Email not found in token")
 
             user = await repo.get_by_email(session, email)
             if not user:
                 user = await repo.create(session, {"email": email})
+            if not user.is_active:
+                raise HTTPException(status_code=401, detail="User not found")
             return user
 
         # ===================LOCAL JWT TOKEN==============
@@ -68,11 +77,11 @@ async def user_connect(
                     select(UserModel).where(UserModel.email == user_email)
                 )
                 user = result.scalar_one_or_none()
-                if not user:
+                if not user or not user.is_active:
                     raise HTTPException(status_code=401, detail="User not found")
                 return user
             except pyjwt.ExpiredSignatureError:
                 raise HTTPException(status_code=401, detail="Token expired")
     except Exception as e:
-        print("Decode error:", repr(e))
+        logger.warning(f"Token decode failed: {e!r}")
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+from app.core.load_shedding_middleware import concurrency_limiter
+from app.db.session import engine
+from app.main import app
+from app.utils.rate_limit_util import rate_limiter
+from loadtests.dataset import build_dataset, drop_dataset
+from loadtests.runner import (
+    find_regressions,
+    load_baselines,
+    run_scenario,
+    save_baselines,
+)
+from loadtests.scenarios import SCENARIOS
+
+DEFAULT_BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtests",
+        description="Drive the ASGI app in-process against local Postgres/Redis.",
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"scenarios to run, any of {', '.join(SCENARIOS)} (default: all)",
+    )
+    parser.add_argument("--users", type=int, default=200, help="members / VUs")
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown before a run fails",
+    )
+    parser.add_argument(
+        "--with-limits",
+        action="store_true",
+        help="keep rate limiting and load shedding on",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store this run as the new baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+async def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    names = args.scenarios or list(SCENARIOS)
+    if not args.with_limits:
+        # All virtual users share one client address and one process, so the
+        # per-IP buckets and the concurrency limit would throttle the test itself.
+        rate_limiter.enabled = False
+        concurrency_limiter.enabled = False
+    dataset = await build_dataset(args.users, args.companies, args.questions)
+    summaries = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=60
+        ) as client:
+            for name in names:
+                scenario, users = SCENARIOS[name](dataset)
+                report = await run_scenario(scenario, client, users)
+                summaries[name] = report.summary()
+                print(json.dumps({name: summaries[name]}, indent=2))
+    finally:
+        await drop_dataset(dataset)
+        await engine.dispose()
+
+    if args.save_baseline:
+        save_baselines(args.baselines, summaries)
+        print(f"Baselines saved to {args.baselines}")
+        return 0
+
+    baselines = load_baselines(args.baselines)
+    failed = False
+    for name, summary in summaries.items():
+        if name not in baselines:
+            print(f"{name}: no baseline, skipping comparison")
+            continue
+        regressions = find_regressions(summary, baselines[name], args.tolerance)
+        for regression in regressions:
+            print(f"{name}: REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,192 @@
+import uuid
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import delete, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.company_invite_request_model import (
+    CompanyInviteRequestModel,
+    InviteStatus,
+    InviteType,
+)
+from app.models.company_model import CompanyModel
+from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+from app.models.question_model import QuestionModel
+from app.models.quiz_answer_model import QuizAnswer
+from app.models.quiz_model import QuizModel
+from app.models.quiz_version_model import QuizVersionModel
+from app.models.results import QuizResults
+from app.models.user_model import UserModel
+from app.utils.jwt_util import create_access_token, password_hash
+
+PASSWORD = "loadtest-password"
+
+
+@dataclass
+class VirtualUser:
+    id: UUID
+    email: str
+    token: str
+
+
+@dataclass
+class LoadDataset:
+    run_id: str
+    members: list[VirtualUser]
+    owners: list[VirtualUser]
+    company_ids: list[UUID]
+    quiz_id: UUID
+    questions: list[tuple[UUID, list[int]]] = field(default_factory=list)
+
+    @property
+    def exam_company_id(self) -> UUID:
+        return self.company_ids[0]
+
+
+def _virtual_user(user: UserModel) -> VirtualUser:
+    return VirtualUser(
+        id=user.id, email=user.email, token=create_access_token({"sub": user.email})
+    )
+
+
+async def build_dataset(
+    members: int = 200, companies: int = 20, questions: int = 10
+) -> LoadDataset:
+    """Create an isolated dataset tagged with a run id, ready for load tests.
+
+    Every member belongs to the first company, which owns the exam quiz.
+    Each company has its own owner and a few pending invites and requests
+    so owner dashboards have something to render.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    hashed = password_hash(PASSWORD)
+
+    def user(kind: str, index: int) -> UserModel:
+        return UserModel(
+            id=uuid.uuid4(),
+            name=f"{kind}-{index}",
+            email=f"lt-{run_id}-{kind}-{index}@loadtest.local",
+            password=hashed,
+            age=30,
+        )
+
+    member_rows = [user("member", i) for i in range(members)]
+    owner_rows = [user("owner", i) for i in range(companies)]
+    company_rows = [
+        CompanyModel(
+            id=uuid.uuid4(),
+            name=f"lt-{run_id}-company-{i}",
+            description="Load test company",
+            is_public=True,
+            owners_count=1,
+            members_count=members if i == 0 else 0,
+        )
+        for i in range(companies)
+    ]
+    roles = [
+        CompanyUserRoleModel(
+            user_id=owner.id, company_id=company.id, role=RoleEnum.OWNER
+        )
+        for owner, company in zip(owner_rows, company_rows)
+    ] + [
+        CompanyUserRoleModel(
+            user_id=member.id, company_id=company_rows[0].id, role=RoleEnum.MEMBER
+        )
+        for member in member_rows
+    ]
+    invites = []
+    for i, (owner, company) in enumerate(zip(owner_rows, company_rows)):
+        if i == 0:
+            continue
+        for member in member_rows[i : i + 5]:
+            invites.append(
+                CompanyInviteRequestModel(
+                    company_id=company.id,
+                    invited_by_id=owner.id,
+                    invited_user_id=member.id,
+                    type=InviteType.INVITE,
+                    status=InviteStatus.PENDING,
+                )
+            )
+        for member in member_rows[i + 5 : i + 10]:
+            invites.append(
+                CompanyInviteRequestModel(
+                    company_id=company.id,
+                    invited_user_id=member.id,
+                    type=InviteType.REQUEST,
+                    status=InviteStatus.PENDING,
+                )
+            )
+
+    quiz = QuizModel(
+        id=uuid.uuid4(),
+        title=f"lt-{run_id}-exam",
+        description="Load test exam",
+        company_id=company_rows[0].id,
+        version=1,
+    )
+    question_rows = [
+        QuestionModel(
+            id=uuid.uuid4(),
+            title=f"Question {i}",
+            options=["a", "b", "c", "d"],
+            correct_answers=[i % 4],
+            quiz_id=quiz.id,
+        )
+        for i in range(questions)
+    ]
+    version = QuizVersionModel(
+        quiz_id=quiz.id, number=1, question_ids=[q.id for q in question_rows]
+    )
+
+    async with AsyncSessionLocal() as session:
+        session.add_all(member_rows + owner_rows + company_rows)
+        await session.flush()
+        session.add_all(roles + invites + [quiz])
+        await session.flush()
+        session.add_all(question_rows + [version])
+        await session.commit()
+
+    return LoadDataset(
+        run_id=run_id,
+        members=[_virtual_user(member) for member in member_rows],
+        owners=[_virtual_user(owner) for owner in owner_rows],
+        company_ids=[company.id for company in company_rows],
+        quiz_id=quiz.id,
+        questions=[(q.id, q.correct_answers) for q in question_rows],
+    )
+
+
+async def drop_dataset(dataset: LoadDataset):
+    user_ids = [user.id for user in dataset.members + dataset.owners]
+    quiz_ids = select(QuizModel.id).where(QuizModel.company_id.in_(dataset.company_ids))
+    result_ids = select(QuizResults.id).where(
+        (QuizResults.user_id.in_(user_ids)) | (QuizResults.quiz_id.in_(quiz_ids))
+    )
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(QuizAnswer).where(QuizAnswer.quiz_result_id.in_(result_ids))
+        )
+        await session.execute(delete(QuizResults).where(QuizResults.id.in_(result_ids)))
+        await session.execute(
+            delete(CompanyInviteRequestModel).where(
+                CompanyInviteRequestModel.company_id.in_(dataset.company_ids)
+                | CompanyInviteRequestModel.invited_user_id.in_(user_ids)
+            )
+        )
+        await session.execute(
+            delete(CompanyUserRoleModel).where(
+                CompanyUserRoleModel.company_id.in_(dataset.company_ids)
+                | CompanyUserRoleModel.user_id.in_(user_ids)
+            )
+        )
+        await session.execute(
+            delete(QuestionModel).where(QuestionModel.quiz_id.in_(quiz_ids))
+        )
+        await session.execute(delete(QuizModel).where(QuizModel.id.in_(quiz_ids)))
+        await session.execute(
+            delete(CompanyModel).where(CompanyModel.id.in_(dataset.company_ids))
+        )
+        await session.execute(delete(UserModel).where(UserModel.id.in_(user_ids)))
+        await session.commit()
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, label: str, elapsed: float, ok: bool):
+        self.latencies[label].append(elapsed)
+        if not ok:
+            self.errors[label] += 1
+
+
+class TimedClient:
+    """httpx client wrapper that times every call under a stable label."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder):
+        self.client = client
+        self.recorder = recorder
+
+    async def request(
+        self,
+        label: str,
+        method: str,
+        url: str,
+        token: str | None = None,
+        expected: tuple[int, ...] = (200,),
+        **kwargs,
+    ) -> httpx.Response | None:
+        if token:
+            kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {token}"
+        started_at = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(label, time.perf_counter() - started_at, ok=False)
+            return None
+        ok = response.status_code in expected
+        self.recorder.record(label, time.perf_counter() - started_at, ok=ok)
+        return response
+
+
+UserFlow = Callable[[TimedClient, Any, int], Awaitable[None]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    flow: UserFlow
+    iterations: int = 1
+
+
+@dataclass
+class ScenarioReport:
+    scenario: str
+    virtual_users: int
+    duration: float
+    recorder: Recorder
+
+    @staticmethod
+    def _stats(latencies: list[float], errors: int, duration: float) -> dict:
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+
+    def summary(self) -> dict:
+        all_latencies = [
+            value for values in self.recorder.latencies.values() for value in values
+        ]
+        return {
+            "virtual_users": self.virtual_users,
+            **self._stats(
+                all_latencies, sum(self.recorder.errors.values()), self.duration
+            ),
+            "endpoints": {
+                label: self._stats(
+                    latencies, self.recorder.errors.get(label, 0), self.duration
+                )
+                for label, latencies in sorted(self.recorder.latencies.items())
+            },
+        }
+
+
+async def run_scenario(
+    scenario: Scenario,
+    client: httpx.AsyncClient,
+    virtual_users: list[Any],
+) -> ScenarioReport:
+    """Release every virtual user at the same instant, like an exam start."""
+    recorder = Recorder()
+    timed = TimedClient(client, recorder)
+    start = asyncio.Event()
+
+    async def user_loop(user: Any, index: int):
+        await start.wait()
+        for _ in range(scenario.iterations):
+            await scenario.flow(timed, user, index)
+
+    tasks = [
+        asyncio.create_task(user_loop(user, index))
+        for index, user in enumerate(virtual_users)
+    ]
+    await asyncio.sleep(0)
+    started_at = time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    return ScenarioReport(
+        scenario=scenario.name,
+        virtual_users=len(virtual_users),
+        duration=time.perf_counter() - started_at,
+        recorder=recorder,
+    )
+
+
+def load_baselines(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baselines(path: Path, summaries: dict[str, dict]):
+    baselines = load_baselines(path)
+    baselines.update(summaries)
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    summary: dict, baseline: dict, tolerance: float = 0.2
+) -> list[str]:
+    """Compare one scenario summary with its baseline.
+
+    Latency percentiles may grow and throughput may drop by ``tolerance``
+    (a fraction) before it counts as a regression; new errors always do.
+    """
+    regressions = []
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if summary[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f"{key} {baseline[key]} -> {summary[key]}")
+    if summary["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(
+            f"throughput_rps {baseline['throughput_rps']} -> {summary['throughput_rps']}"
+        )
+    if summary["errors"] > baseline["errors"]:
+        regressions.append(f"errors {baseline['errors']} -> {summary['errors']}")
+    return regressions
@@ -0,0 +1,146 @@
+from loadtests.dataset import PASSWORD, LoadDataset, VirtualUser
+from loadtests.runner import Scenario, TimedClient
+
+
+def login_storm(dataset: LoadDataset) -> tuple[Scenario, list[VirtualUser]]:
+    async def flow(client: TimedClient, user: VirtualUser, index: int):
+        await client.request(
+            "POST /users/login",
+            "POST",
+            "/users/login",
+            json={"email": user.email, "password": PASSWORD},
+        )
+
+    scenario = Scenario(
+        "login_storm", "Every member logs in at the same moment.", flow, iterations=1
+    )
+    return scenario, dataset.members
+
+
+def exam_start(dataset: LoadDataset) -> tuple[Scenario, list[VirtualUser]]:
+    async def flow(client: TimedClient, user: VirtualUser, index: int):
+        for question_id, correct in dataset.questions:
+            await client.request(
+                "POST /users/me/answer/{quiz_id}/{question_id}",
+                "POST",
+                f"/users/me/answer/{dataset.quiz_id}/{question_id}",
+                token=user.token,
+                json={"selected_options": correct},
+            )
+        await client.request("GET /users/me/stat", "GET", "/users/me/stat", user.token)
+        await client.request(
+            "GET /users/me/stat/{company_id}",
+            "GET",
+            f"/users/me/stat/{dataset.exam_company_id}",
+            user.token,
+        )
+
+    # Answers are one-shot per question, so the burst runs exactly once.
+    scenario = Scenario(
+        "exam_start",
+        "Every member answers the whole exam, then checks their statistics.",
+        flow,
+        iterations=1,
+    )
+    return scenario, dataset.members
+
+
+def owner_dashboard(dataset: LoadDataset) -> tuple[Scenario, list[VirtualUser]]:
+    async def flow(client: TimedClient, user: VirtualUser, index: int):
+        company_id = dataset.company_ids[index]
+        await client.request(
+            "GET /companies/{company_id}/users",
+            "GET",
+            f"/companies/{company_id}/users",
+            user.token,
+        )
+        await client.request(
+            "GET /companies/admins/{company_id}",
+            "GET",
+            f"/companies/admins/{company_id}",
+            user.token,
+        )
+        await client.request(
+            "GET /companies/invites", "GET", "/companies/invites", user.token
+        )
+        await client.request(
+            "GET /companies/requests/pending",
+            "GET",
+            "/companies/requests/pending",
+            user.token,
+        )
+
+    scenario = Scenario(
+        "owner_dashboard",
+        "Every owner refreshes members, admins, invites and pending requests.",
+        flow,
+        iterations=10,
+    )
+    return scenario, dataset.owners
+
+
+def company_listing(dataset: LoadDataset) -> tuple[Scenario, list[VirtualUser]]:
+    async def flow(client: TimedClient, user: VirtualUser, index: int):
+        await client.request(
+            "GET /companies/",
+            "GET",
+            "/companies/",
+            params={"limit": 10, "offset": (index % 5) * 10},
+        )
+        company_id = dataset.company_ids[index % len(dataset.company_ids)]
+        await client.request(
+            "GET /companies/{company_id}", "GET", f"/companies/{company_id}"
+        )
+
+    scenario = Scenario(
+        "company_listing",
+        "Anonymous visitors page through companies and open one.",
+        flow,
+        iterations=5,
+    )
+    return scenario, dataset.members
+
+
+def search(dataset: LoadDataset) -> tuple[Scenario, list[VirtualUser]]:
+    async def flow(client: TimedClient, user: VirtualUser, index: int):
+        response = await client.request(
+            "GET /companies/search",
+            "GET",
+            "/companies/search",
+            params={"q": f"lt-{dataset.run_id}-company", "limit": 5},
+        )
+        # Shed or failed requests are only recorded; there is no page to follow.
+        if response is not None and response.status_code == 200:
+            cursor = response.json()["next_cursor"]
+        else:
+            cursor = None
+        if cursor:
+            await client.request(
+                "GET /companies/search",
+                "GET",
+                "/companies/search",
+                params={"q": f"lt-{dataset.run_id}-company", "cursor": cursor},
+            )
+        await client.request(
+            "GET /users/search",
+            "GET",
+            "/users/search",
+            params={"q": f"lt-{dataset.run_id}", "limit": 20},
+        )
+
+    scenario = Scenario(
+        "search",
+        "Anonymous visitors search companies, open the next page and search users.",
+        flow,
+        iterations=5,
+    )
+    return scenario, dataset.members
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "exam_start": exam_start,
+    "owner_dashboard": owner_dashboard,
+    "company_listing": company_listing,
+    "search": search,
+}
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.models.company_user_role_model import RoleEnum
+from app.repository.in_memory_repository import (
+    InMemoryCompaniesRepository,
+    InMemorySession,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from app.schemas.company_schema import CompanyCreate
+from app.services.companies_service import CompaniesService
+from app.services.users_service import UserService
+from loadtests.runner import percentile
+
+
+async def build(users_count: int, members_per_company: int):
+    store = InMemoryStore()
+    session = InMemorySession()
+    users = UserService(InMemoryUserRepository(store))
+    companies = CompaniesService(InMemoryCompaniesRepository(store))
+    people = [
+        await users.repo.create(
+            session, {"email": f"bench-{i}@example.com", "name": f"Bench {i}"}
+        )
+        for i in range(users_count)
+    ]
+    owner = people[0]
+    company = (
+        await companies.company_create(
+            CompanyCreate(name="Bench", description="bench", is_public=True),
+            session,
+            owner,
+        )
+    )["company"]
+    for person in people[1 : members_per_company + 1]:
+        await companies.repo.add_user_role(
+            session, person.id, company.id, RoleEnum.MEMBER
+        )
+    return store, session, users, companies, owner, company, people
+
+
+async def bench(name: str, iterations: int, call):
+    latencies = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started_at)
+    total = sum(latencies)
+    print(
+        f"{name:<28} {iterations / total:>12,.0f} ops/s"
+        f"  p50={percentile(latencies, 50) * 1e6:.1f}us"
+        f"  p99={percentile(latencies, 99) * 1e6:.1f}us"
+    )
+
+
+async def main(iterations: int, users_count: int, members_per_company: int):
+    store, session, users, companies, owner, company, people = await build(
+        users_count, members_per_company
+    )
+    loaders = store.loaders()
+    await bench(
+        "list_company_users",
+        iterations,
+        lambda: companies.list_company_users(company.id, 20, 0, owner, session),
+    )
+    await bench(
+        "admin_list",
+        iterations,
+        lambda: companies.admin_list(company.id, owner, session),
+    )
+    await bench(
+        "invite_owner_list",
+        iterations,
+        lambda: companies.invite_owner_list(owner, session, loaders),
+    )
+    await bench(
+        "get_my_statistic",
+        iterations,
+        lambda: users.get_my_statistic(session, people[1].id, company.id),
+    )
+    await bench(
+        "get_company",
+        iterations,
+        lambda: companies.get_company(company.id, session),
+    )
+    missing = uuid.uuid4()
+    await bench(
+        "get_user_by_id (miss)",
+        iterations,
+        lambda: _swallow(users.get_user_by_id(session, missing)),
+    )
+
+
+async def _swallow(coro):
+    try:
+        await coro
+    except Exception:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtests.service_bench",
+        description="Micro-benchmark service methods over in-memory repositories.",
+    )
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--members", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.users, args.members))
@@ -2,5 +2,16 @@
 echo "Running Alembic migrations..."
 alembic upgrade head
 
-echo "Main.py is loading..."
-exec python -m app.main
\ No newline at end of file
+# Every worker process writes its metrics here and /metrics merges them.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+echo "Resetting metrics directory..."
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+if [ "$APP_MODE" = "dev" ]; then
+    echo "Starting development server with reload..."
+    exec python -m app.main
+fi
+
+echo "Starting production server..."
+exec python -m app.server
\ No newline at end of file
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+
+from app.db.instrumentation import begin_query_stats, end_query_stats
+
+
+@contextmanager
+def query_budget(max_queries: int | None = None, max_repeats: int | None = None):
+    """Fail when the wrapped block runs more statements than budgeted.
+
+    ``max_repeats`` caps how often one statement shape may run, which is
+    how an N+1 loop shows up even when the total stays under budget.
+    """
+    stats, token = begin_query_stats()
+    try:
+        yield stats
+    finally:
+        end_query_stats(token)
+
+    if max_queries is not None and stats.count > max_queries:
+        shapes = "\n".join(
+            f"  {times}x {shape}" for shape, times in stats.shapes.most_common()
+        )
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {stats.count}:\n{shapes}"
+        )
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            shape, times = repeated[0]
+            raise AssertionError(
+                f"Statement repeated {times} times (limit {max_repeats}): {shape}"
+            )
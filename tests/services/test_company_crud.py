@@ -1,23 +1,45 @@
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.base_exception import (
+from app.core.company_exceptions import (
     CompanyNotFoundError,
-    InvalidInviteStatusError,
-    InviteInvalidOptionError,
     MemberNotFoundError,
+    OwnerAndAdminOnlyActionError,
     OwnerOnlyActionError,
-    PermissionDeniedError,
 )
-from app.models.company_invite_request_model import InviteStatus
+from app.core.invites_exceptions import (
+    InvalidInviteStatusError,
+    InviteInvalidOptionError,
+)
+from app.core.quiz_exceptions import (
+    QuestionNotFoundException,
+    QuizVersionConflictException,
+)
+from app.core.users_exceptions import PermissionDeniedError
+from app.models.company_invite_request_model import (
+    CompanyInviteRequestModel,
+    InviteStatus,
+    InviteType,
+)
 from app.models.company_model import CompanyModel
 from app.models.company_user_role_model import CompanyUserRoleModel, RoleEnum
+from app.models.quiz_model import QuizModel
 from app.models.user_model import UserModel
 from app.repository.companies_repository import CompaniesRepository
-from app.schemas.company_schema import CompanyCreate, CompanyUpdate
+from app.repository.company_access import CompanyAccess
+from app.schemas.company_schema import (
+    BulkInviteSchema,
+    BulkMembersSchema,
+    BulkRequestsSchema,
+    CompanyCreate,
+    CompanyUpdate,
+    QuestionUpdate,
+    QuizUpdate,
+)
 from app.services.companies_service import CompaniesService
 
 
@@ -144,13 +166,36 @@ async def test_company_update_forbidden(
 async def test_company_delete_success(
     service, repo_mock, async_session_mock, user_mock
 ):
-    company_obj = MagicMock(spec=CompanyModel, name="DeleteMe")
+    company_obj = MagicMock(spec=CompanyModel, name="DeleteMe", deleted_at=None)
     repo_mock.get_owner_company.return_value = company_obj
-    repo_mock.delete.return_value = None
 
-    await service.company_delete(uuid4(), async_session_mock, user_mock)
+    with patch("app.services.companies_service.purge_progress", AsyncMock()), patch(
+        "app.services.companies_service.job_queue.enqueue", AsyncMock()
+    ) as enqueue:
+        result = await service.company_delete(uuid4(), async_session_mock, user_mock)
 
-    repo_mock.delete.assert_awaited_once_with(async_session_mock, company_obj)
+    repo_mock.soft_delete_company.assert_awaited_once_with(
+        async_session_mock, company_obj
+    )
+    repo_mock.delete.assert_not_awaited()
+    enqueue.assert_awaited_once_with("purge_company", {"company_id": company_obj.id})
+    assert result["company_id"] == company_obj.id
+
+
+@pytest.mark.asyncio
+async def test_company_delete_retry_only_reschedules_purge(
+    service, repo_mock, async_session_mock, user_mock
+):
+    company_obj = MagicMock(spec=CompanyModel, deleted_at=datetime.now(timezone.utc))
+    repo_mock.get_owner_company.return_value = company_obj
+
+    with patch("app.services.companies_service.purge_progress", AsyncMock()), patch(
+        "app.services.companies_service.job_queue.enqueue", AsyncMock()
+    ) as enqueue:
+        await service.company_delete(uuid4(), async_session_mock, user_mock)
+
+    repo_mock.soft_delete_company.assert_not_awaited()
+    enqueue.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -309,14 +354,30 @@ async def test_invite_owner_list_forbidden(service, mock_repo, fake_user):
 
 @pytest.mark.asyncio
 async def test_pending_requests_list_success(service, mock_repo, fake_user):
-    mock_repo.get_owner_company_ids.return_value = [uuid4()]
-    mock_repo.get_pending_requests.return_value = ["req1"]
+    company = CompanyModel(id=uuid4(), name="Acme", is_public=True)
+    requester = UserModel(id=uuid4(), email="req@test.com", name="Req")
+    request = CompanyInviteRequestModel(
+        id=uuid4(),
+        company_id=company.id,
+        invited_user_id=requester.id,
+        type=InviteType.REQUEST,
+        status=InviteStatus.PENDING,
+    )
+    mock_repo.get_owner_company_ids.return_value = [company.id]
+    mock_repo.get_pending_requests.return_value = [request]
+    loaders = MagicMock()
+    loaders.companies.load_many = AsyncMock(return_value=[company])
+    loaders.users.load_many = AsyncMock(side_effect=[[requester], [None]])
 
     service.repo = mock_repo
 
-    result = await service.pending_requests_list(fake_user, MagicMock())
+    result = await service.pending_requests_list(fake_user, MagicMock(), loaders)
 
-    assert result["requests"] == ["req1"]
+    [details] = result["requests"]
+    assert details.id == request.id
+    assert details.company.name == "Acme"
+    assert details.invited_user.email == "req@test.com"
+    assert details.invited_by is None
 
 
 @pytest.mark.asyncio
@@ -360,7 +421,7 @@ async def test_admin_list_company_not_found(
     service, mock_repo, mock_session, fake_user
 ):
     service.repo = mock_repo
-    mock_repo.get_company_by_id.return_value = None
+    mock_repo.get_company_access.return_value = CompanyAccess(company_exists=False)
 
     with pytest.raises(CompanyNotFoundError):
         await service.admin_list(uuid4(), fake_user, mock_session)
@@ -369,8 +430,9 @@ async def test_admin_list_company_not_found(
 @pytest.mark.asyncio
 async def test_admin_remove_not_owner(service, mock_repo, mock_session, fake_user):
     service.repo = mock_repo
-    mock_repo.get_company_by_id.return_value = {"id": 1}
-    mock_repo.get_owner_company_ids.return_value = []
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.ADMIN
+    )
 
     with pytest.raises(OwnerOnlyActionError):
         await service.admin_role_remove(uuid4(), uuid4(), fake_user, mock_session)
@@ -381,41 +443,229 @@ async def test_admin_remove_member_not_found(
     service, mock_repo, mock_session, fake_user
 ):
     service.repo = mock_repo
-    company_id = uuid4()
-    mock_repo.get_company_by_id.return_value = {"id": 1}
-    mock_repo.get_owner_company_ids.return_value = [company_id]
-    mock_repo.get_user_role.return_value = None
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.OWNER, member=None
+    )
 
     with pytest.raises(MemberNotFoundError):
-        await service.admin_role_remove(uuid4(), company_id, fake_user, mock_session)
+        await service.admin_role_remove(uuid4(), uuid4(), fake_user, mock_session)
 
 
 @pytest.mark.asyncio
 async def test_admin_remove_user_not_admin(service, mock_repo, mock_session, fake_user):
-    role = AsyncMock()
-    role.role = RoleEnum.MEMBER
-    company_id = uuid4()
     service.repo = mock_repo
-    mock_repo.get_company_by_id.return_value = {"id": 1}
-    mock_repo.get_owner_company_ids.return_value = [company_id]
-    mock_repo.get_user_role.return_value = role
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True,
+        role=RoleEnum.OWNER,
+        member=CompanyUserRoleModel(role=RoleEnum.MEMBER),
+    )
 
     with pytest.raises(InvalidInviteStatusError):
-        await service.admin_role_remove(uuid4(), company_id, fake_user, mock_session)
+        await service.admin_role_remove(uuid4(), uuid4(), fake_user, mock_session)
 
 
 @pytest.mark.asyncio
-@pytest.mark.filterwarnings("ignore::RuntimeWarning")
 async def test_admin_remove_success(service, mock_repo, mock_session, fake_user):
-    role = AsyncMock()
-    role.role = RoleEnum.ADMIN
-    company_id = uuid4()
+    role = CompanyUserRoleModel(role=RoleEnum.ADMIN)
     service.repo = mock_repo
-    mock_repo.get_company_by_id.return_value = {"id": 1}
-    mock_repo.get_owner_company_ids.return_value = [company_id]
-    mock_repo.get_user_role.return_value = role
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.OWNER, member=role
+    )
 
-    res = await service.admin_role_remove(uuid4(), company_id, fake_user, mock_session)
+    res = await service.admin_role_remove(uuid4(), uuid4(), fake_user, mock_session)
 
     assert res["message"]
-    assert role.role == RoleEnum.MEMBER
+    mock_repo.get_company_access.assert_awaited_once()
+    mock_repo.change_user_role.assert_awaited_once_with(
+        mock_session, role, RoleEnum.MEMBER
+    )
+
+
+# ===================QUIZ MUTATION TESTS==================
+@pytest.mark.asyncio
+async def test_edit_quiz_one_read_before_write(
+    service, mock_repo, mock_session, fake_user
+):
+    quiz = QuizModel(id=uuid4(), title="Old", description="d")
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.ADMIN, quiz=quiz
+    )
+
+    result = await service.company_edit_quiz(
+        uuid4(), quiz.id, QuizUpdate(title="New"), fake_user, mock_session
+    )
+
+    assert result.title == "New"
+    mock_repo.get_company_access.assert_awaited_once()
+    mock_repo.get_company_by_id.assert_not_called()
+    mock_repo.get_owner_or_admin_company_ids.assert_not_called()
+    mock_repo.update.assert_awaited_once_with(mock_session, quiz)
+
+
+@pytest.mark.asyncio
+async def test_delete_question_member_forbidden(
+    service, mock_repo, mock_session, fake_user
+):
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.MEMBER
+    )
+
+    with pytest.raises(OwnerAndAdminOnlyActionError):
+        await service.company_delete_question(
+            uuid4(), uuid4(), uuid4(), fake_user, mock_session
+        )
+
+
+@pytest.mark.asyncio
+async def test_edit_question_not_found(service, mock_repo, mock_session, fake_user):
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.OWNER, quiz=QuizModel(), question=None
+    )
+
+    with pytest.raises(QuestionNotFoundException):
+        await service.quiz_edit_question(
+            uuid4(),
+            uuid4(),
+            uuid4(),
+            QuestionUpdate(title="t"),
+            fake_user,
+            mock_session,
+        )
+
+
+@pytest.mark.asyncio
+async def test_delete_question_loses_version_race(
+    service, mock_repo, mock_session, fake_user
+):
+    question_id = uuid4()
+    quiz = QuizModel(id=uuid4(), version=1)
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True,
+        role=RoleEnum.OWNER,
+        quiz=quiz,
+        question=MagicMock(id=question_id),
+    )
+    mock_repo.get_quiz_version.return_value = MagicMock(
+        question_ids=[question_id, uuid4(), uuid4()]
+    )
+    # Another edit published version 2 after this one read version 1.
+    mock_repo.create_quiz_version.return_value = None
+
+    with pytest.raises(QuizVersionConflictException):
+        await service.company_delete_question(
+            uuid4(), quiz.id, question_id, fake_user, mock_session
+        )
+
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_called()
+    mock_repo.publish_invalidation.assert_not_called()
+
+
+# ===================BULK MEMBERSHIP TESTS==================
+@pytest.mark.asyncio
+async def test_bulk_invite_reports_each_user(
+    service, mock_repo, mock_session, fake_user
+):
+    company_id = uuid4()
+    new_user, member, invited, missing, raced = (uuid4() for _ in range(5))
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.OWNER
+    )
+    mock_repo.get_bulk_invite_state.return_value = {
+        new_user: MagicMock(is_member=False, has_pending_invite=False),
+        member: MagicMock(is_member=True, has_pending_invite=False),
+        invited: MagicMock(is_member=False, has_pending_invite=True),
+        raced: MagicMock(is_member=False, has_pending_invite=False),
+    }
+    mock_repo.bulk_insert_invites.return_value = [new_user]
+
+    report = await service.bulk_invite_send(
+        BulkInviteSchema(
+            company_id=company_id,
+            user_ids=[new_user, member, invited, missing, raced, new_user],
+        ),
+        fake_user,
+        mock_session,
+    )
+
+    mock_repo.bulk_insert_invites.assert_awaited_once_with(
+        mock_session, company_id, fake_user.id, [new_user, raced]
+    )
+    mock_session.commit.assert_awaited_once()
+    assert report.processed == 5
+    assert report.succeeded == 1
+    assert [r.status for r in report.results] == [
+        "invited",
+        "already_member",
+        "already_invited",
+        "user_not_found",
+        "already_invited",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_accept_requests_adds_members(
+    service, mock_repo, mock_session, fake_user
+):
+    company_id = uuid4()
+    accepted_id, foreign_id = uuid4(), uuid4()
+    requester = uuid4()
+    service.repo = mock_repo
+    mock_repo.get_bulk_requests_state.return_value = {
+        accepted_id: MagicMock(is_owner=True),
+        foreign_id: MagicMock(is_owner=False),
+    }
+    mock_repo.bulk_resolve_requests.return_value = [
+        MagicMock(id=accepted_id, company_id=company_id, invited_user_id=requester)
+    ]
+
+    report = await service.bulk_request_switcher(
+        "accepted",
+        BulkRequestsSchema(request_ids=[accepted_id, foreign_id]),
+        fake_user,
+        mock_session,
+    )
+
+    mock_repo.bulk_add_members.assert_awaited_once_with(
+        mock_session, [(company_id, requester)]
+    )
+    assert [r.status for r in report.results] == ["accepted", "forbidden"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_promote_skips_owners_and_admins(
+    service, mock_repo, mock_session, fake_user
+):
+    company_id = uuid4()
+    member, admin, owner = uuid4(), uuid4(), uuid4()
+    service.repo = mock_repo
+    mock_repo.get_company_access.return_value = CompanyAccess(
+        company_exists=True, role=RoleEnum.OWNER
+    )
+    mock_repo.get_member_roles.return_value = {
+        member: RoleEnum.MEMBER,
+        admin: RoleEnum.ADMIN,
+        owner: RoleEnum.OWNER,
+    }
+    mock_repo.bulk_change_roles.return_value = [member]
+
+    report = await service.bulk_admin_change(
+        "add",
+        BulkMembersSchema(company_id=company_id, user_ids=[member, admin, owner]),
+        fake_user,
+        mock_session,
+    )
+
+    mock_repo.bulk_change_roles.assert_awaited_once_with(
+        mock_session, company_id, [member], RoleEnum.MEMBER, RoleEnum.ADMIN
+    )
+    assert [r.status for r in report.results] == [
+        "promoted",
+        "already_admin",
+        "is_owner",
+    ]
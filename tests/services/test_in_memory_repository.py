@@ -0,0 +1,515 @@
+import json
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.company_exceptions import CompanyNotFoundError, OwnerCannotLeaveError
+from app.core.quiz_exceptions import (
+    AlreadyAnsweredException,
+    FewQuestionsException,
+    QuestionNotFoundException,
+    QuizNotFoundException,
+    QuizVersionNotFoundException,
+)
+from app.models.company_user_role_model import RoleEnum
+from app.repository.in_memory_repository import (
+    InMemoryCompaniesRepository,
+    InMemorySession,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from app.repository.role_counters import ROLE_COUNTER_COLUMNS
+from app.schemas.company_schema import (
+    BulkInviteSchema,
+    BulkMembersSchema,
+    CompanyCreate,
+    QuestionUpdate,
+    QuizCreate,
+    RequestSentSchema,
+)
+from app.schemas.user_schema import AnswerUserSchema
+from app.services.cache_service import question_cache, quiz_cache
+from app.services.companies_service import CompaniesService
+from app.services.users_service import UserService
+from app.utils.import_util import iter_rows
+
+
+@pytest.fixture
+def store():
+    return InMemoryStore()
+
+
+@pytest.fixture
+def session():
+    return InMemorySession()
+
+
+@pytest.fixture
+def users(store):
+    return UserService(InMemoryUserRepository(store))
+
+
+@pytest.fixture
+def companies(store):
+    return CompaniesService(InMemoryCompaniesRepository(store))
+
+
+@pytest.fixture
+def progress():
+    progress = AsyncMock()
+    with patch("app.services.companies_service.purge_progress", progress), patch(
+        "app.services.users_service.purge_progress", progress
+    ):
+        yield progress
+
+
+async def make_user(users, session, n: int):
+    return await users.repo.create(
+        session, {"name": f"user{n}", "email": f"user{n}@example.com", "password": "x"}
+    )
+
+
+async def make_company(companies, session, owner, name="Acme"):
+    result = await companies.company_create(
+        CompanyCreate(name=name, description="d", is_public=True), session, owner
+    )
+    return result["company"]
+
+
+QUESTION_ROW = {"title": "q", "options": ["a", "b", "c"], "correct_answers": [1]}
+
+
+def ndjson_rows(*rows):
+    async def body():
+        yield b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+    return iter_rows(body(), "ndjson")
+
+
+def assert_counters_match_roles(store: InMemoryStore):
+    for company_id, company in store.companies.items():
+        roles = [role.role for role in store.roles_by_company[company_id].values()]
+        for role, column in ROLE_COUNTER_COLUMNS.items():
+            assert getattr(company, column.key) == roles.count(role)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_raises_integrity_error(users, session):
+    await make_user(users, session, 1)
+
+    with pytest.raises(IntegrityError):
+        await make_user(users, session, 1)
+
+
+@pytest.mark.asyncio
+async def test_request_accept_leave_flow(users, companies, store, session):
+    owner = await make_user(users, session, 1)
+    member = await make_user(users, session, 2)
+    company = await make_company(companies, session, owner)
+
+    await users.request_send(RequestSentSchema(company_id=company.id), member, session)
+    pending = await companies.pending_requests_list(owner, session, store.loaders())
+    request_id = pending["requests"][0].id
+    await companies.request_owner_switcher(request_id, "accepted", owner, session)
+
+    listing = await companies.list_company_users(company.id, 10, 0, owner, session)
+    assert listing["total_users"] == 2
+    with pytest.raises(OwnerCannotLeaveError):
+        await users.leave_user(company.id, owner, session)
+    await users.leave_user(company.id, member, session)
+    assert company.members_count == 0
+    assert_counters_match_roles(store)
+
+
+@pytest.mark.asyncio
+async def test_company_delete_hides_company_then_purges_in_chunks(
+    users, companies, store, session, progress
+):
+    owner = await make_user(users, session, 1)
+    people = [await make_user(users, session, n) for n in range(2, 7)]
+    company = await make_company(companies, session, owner)
+    await companies.bulk_invite_send(
+        BulkInviteSchema(company_id=company.id, user_ids=[p.id for p in people]),
+        owner,
+        session,
+    )
+    quiz = await companies.company_create_quiz(
+        company.id,
+        QuizCreate(
+            title="Quiz",
+            description="d",
+            questions=[
+                {"title": "q1", "options": ["a", "b"], "correct_answers": [0]},
+                {"title": "q2", "options": ["a", "b"], "correct_answers": [1]},
+            ],
+        ),
+        owner,
+        session,
+    )
+    q1, _ = store.questions_by_quiz[quiz.id].values()
+    with patch(
+        "app.services.users_service.RedisQuizService.save_quiz_answer", AsyncMock()
+    ):
+        await users.question_answer_by_user(
+            q1.id, quiz.id, AnswerUserSchema(selected_options=[0]), owner, session
+        )
+
+    with patch(
+        "app.services.companies_service.job_queue.enqueue", AsyncMock()
+    ) as enqueue:
+        await companies.company_delete(company.id, session, owner)
+    enqueue.assert_awaited_once_with("purge_company", {"company_id": company.id})
+    with pytest.raises(CompanyNotFoundError):
+        await companies.company_all_quizzes(company.id, session)
+    assert await companies.repo.get_all(session) == []
+    with pytest.raises(QuizNotFoundException):
+        await users.question_answer_by_user(
+            q1.id, quiz.id, AnswerUserSchema(selected_options=[1]), owner, session
+        )
+
+    assert not await companies.company_purge(
+        company.id, session, chunk_size=2, max_chunks=3
+    )
+    assert company.id in store.companies
+    assert await companies.company_purge(company.id, session, chunk_size=2)
+    assert company.id not in store.companies
+    assert not store.quizzes and not store.questions and not store.results
+    assert not store.answers and not store.invites
+    assert not store.roles_by_user[owner.id]
+    assert await companies.company_purge(company.id, session)
+    progress.finish.assert_awaited_once_with("company", company.id)
+
+
+@pytest.mark.asyncio
+async def test_user_delete_deactivates_then_purges_in_chunks(
+    users, companies, store, session, progress
+):
+    owner = await make_user(users, session, 1)
+    user = await make_user(users, session, 2)
+    company = await make_company(companies, session, owner)
+    other = await make_company(companies, session, user, "Other")
+    await companies.bulk_invite_send(
+        BulkInviteSchema(company_id=company.id, user_ids=[user.id]), owner, session
+    )
+    await companies.bulk_invite_send(
+        BulkInviteSchema(company_id=other.id, user_ids=[owner.id]), user, session
+    )
+    await companies.repo.add_user_role(session, user.id, company.id, RoleEnum.ADMIN)
+
+    with patch("app.services.users_service.job_queue.enqueue", AsyncMock()) as enqueue:
+        await users.delete_user(session, user)
+    enqueue.assert_awaited_once_with("purge_user", {"user_id": user.id})
+    progress.schedule.assert_awaited_once_with("user", user.id)
+    assert await users.repo.get(session, user.id) is None
+    assert user not in await users.repo.get_all(session)
+
+    assert not await users.user_purge(user.id, session, chunk_size=1, max_chunks=2)
+    assert await users.user_purge(user.id, session, chunk_size=1)
+    assert user.id not in store.users
+    assert not store.invites_by_user[user.id]
+    (sent,) = store.invites_by_company[other.id]
+    assert sent.invited_by_id is None
+    assert_counters_match_roles(store)
+    recorded = [call.args[2:] for call in progress.record.await_args_list]
+    assert recorded == [
+        ("company_user_roles", 1),
+        ("company_user_roles", 1),
+        ("company_invites", 1),
+        ("company_invites", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_hidden_from_company_members(
+    users, companies, session, progress
+):
+    owner = await make_user(users, session, 1)
+    user = await make_user(users, session, 2)
+    company = await make_company(companies, session, owner)
+    await companies.repo.add_user_role(session, user.id, company.id, RoleEnum.MEMBER)
+
+    with patch("app.services.users_service.job_queue.enqueue", AsyncMock()):
+        await users.delete_user(session, user)
+
+    listing = await companies.list_company_users(company.id, 10, 0, owner, session)
+    assert [member.id for member in listing["users"]] == [owner.id]
+
+
+@pytest.mark.asyncio
+async def test_answers_and_statistics(users, companies, session):
+    owner = await make_user(users, session, 1)
+    company = await make_company(companies, session, owner)
+    quiz = await companies.company_create_quiz(
+        company.id,
+        QuizCreate(
+            title="Quiz",
+            description="d",
+            questions=[
+                {"title": "q1", "options": ["a", "b"], "correct_answers": [0]},
+                {"title": "q2", "options": ["a", "b"], "correct_answers": [1]},
+            ],
+        ),
+        owner,
+        session,
+    )
+    q1, q2 = companies.repo.store.questions_by_quiz[quiz.id].values()
+
+    with patch(
+        "app.services.users_service.RedisQuizService.save_quiz_answer", AsyncMock()
+    ):
+        for question, selected in ((q1, [0]), (q2, [0])):
+            await users.question_answer_by_user(
+                question.id,
+                quiz.id,
+                AnswerUserSchema(selected_options=selected),
+                owner,
+                session,
+            )
+        with pytest.raises(AlreadyAnsweredException):
+            await users.question_answer_by_user(
+                q1.id, quiz.id, AnswerUserSchema(selected_options=[0]), owner, session
+            )
+
+    assert await users.get_my_statistic(session, owner.id) == 50.0
+    assert await users.get_my_statistic(session, owner.id, company.id) == 50.0
+
+    await companies.company_delete_quiz(company.id, quiz.id, owner, session)
+    assert await users.get_my_statistic(session, owner.id) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_quiz_import_copies_questions_in_chunks(users, companies, store, session):
+    owner = await make_user(users, session, 1)
+    company = await make_company(companies, session, owner)
+    rows = [QUESTION_ROW] * 7
+
+    with patch.object(
+        companies.repo, "copy_questions", wraps=companies.repo.copy_questions
+    ) as copy:
+        report = await companies.company_import_quiz(
+            company.id,
+            "Bank",
+            "",
+            ndjson_rows(*rows),
+            owner,
+            session,
+            chunk_size=3,
+        )
+
+    assert report.committed and report.imported == 7 and report.failed == 0
+    assert [len(call.args[1]) for call in copy.call_args_list] == [3, 3, 1]
+    assert len(store.questions_by_quiz[report.quiz_id]) == 7
+    (version,) = store.versions_by_quiz[report.quiz_id].values()
+    assert list(version.question_ids) == list(store.questions_by_quiz[report.quiz_id])
+
+
+@pytest.mark.asyncio
+async def test_quiz_import_with_invalid_rows_rolls_back_unless_skipped(
+    users, companies, session
+):
+    owner = await make_user(users, session, 1)
+    company = await make_company(companies, session, owner)
+    bad = {"title": "q", "options": ["a", "b"], "correct_answers": [5]}
+    rows = [QUESTION_ROW, bad, QUESTION_ROW, {"title": "", "options": ["a"]}]
+
+    session.rollback = AsyncMock()
+    report = await companies.company_import_quiz(
+        company.id, "Bank", "", ndjson_rows(*rows), owner, session
+    )
+    assert not report.committed and report.quiz_id is None
+    assert report.imported == 0 and report.failed == 2
+    assert [error.row for error in report.errors] == [2, 4]
+    session.rollback.assert_awaited_once()
+
+    report = await companies.company_import_quiz(
+        company.id,
+        "Bank",
+        "",
+        ndjson_rows(*rows),
+        owner,
+        session,
+        skip_invalid=True,
+    )
+    assert report.committed and report.imported == 2 and report.failed == 2
+
+
+@pytest.mark.asyncio
+async def test_quiz_import_needs_two_questions(users, companies, session):
+    owner = await make_user(users, session, 1)
+    company = await make_company(companies, session, owner)
+
+    with pytest.raises(FewQuestionsException):
+        await companies.company_import_quiz(
+            company.id,
+            "Bank",
+            "",
+            ndjson_rows(QUESTION_ROW),
+            owner,
+            session,
+        )
+
+
+@pytest.mark.asyncio
+async def test_question_edit_publishes_a_new_quiz_version(users, companies, session):
+    owner = await make_user(users, session, 1)
+    company = await make_company(companies, session, owner)
+    quiz = await companies.company_create_quiz(
+        company.id,
+        QuizCreate(
+            title="Quiz",
+            description="d",
+            questions=[
+                {"title": "q1", "options": ["a", "b"], "correct_answers": [0]},
+                {"title": "q2", "options": ["a", "b"], "correct_answers": [1]},
+            ],
+        ),
+        owner,
+        session,
+    )
+    q1, q2 = companies.repo.store.questions_by_quiz[quiz.id].values()
+    v1 = await companies.company_quiz_version(company.id, quiz.id, 1, session)
+
+    with patch(
+        "app.services.users_service.RedisQuizService.save_quiz_answer", AsyncMock()
+    ):
+        await users.question_answer_by_user(
+            q1.id, quiz.id, AnswerUserSchema(selected_options=[0]), owner, session
+        )
+        assert question_cache.get(q1.id) is q1 and quiz_cache.get(quiz.id) is quiz
+
+        edited = await companies.quiz_edit_question(
+            company.id,
+            quiz.id,
+            q1.id,
+            QuestionUpdate(correct_answers=[1]),
+            owner,
+            session,
+        )
+        assert edited["version"] == quiz.version == 2
+        assert quiz_cache.get(quiz.id) is None
+        assert q1.correct_answers == [0]
+        with pytest.raises(QuestionNotFoundException):
+            await users.question_answer_by_user(
+                q1.id, quiz.id, AnswerUserSchema(selected_options=[1]), owner, session
+            )
+        await users.question_answer_by_user(
+            edited["question_id"],
+            quiz.id,
+            AnswerUserSchema(selected_options=[0]),
+            owner,
+            session,
+        )
+
+    # The first answer is still scored against the question it was given on.
+    assert await users.get_my_statistic(session, owner.id) == 50.0
+    assert await companies.company_quiz_version(company.id, quiz.id, 1, session) == v1
+    v2 = await companies.company_quiz_version(company.id, quiz.id, 2, session)
+    assert [q["id"] for q in v2["questions"]] == [
+        str(edited["question_id"]),
+        str(q2.id),
+    ]
+
+    deleted = await companies.company_delete_question(
+        company.id, quiz.id, q2.id, owner, session
+    )
+    assert deleted["version"] == 3
+    (listed,) = await companies.company_all_quizzes(company.id, session)
+    assert listed["version"] == 3
+    assert [q["id"] for q in listed["questions"]] == [str(edited["question_id"])]
+    with pytest.raises(QuizVersionNotFoundException):
+        await companies.company_quiz_version(company.id, quiz.id, 4, session)
+
+    await companies.company_delete_quiz(company.id, quiz.id, owner, session)
+    assert quiz_cache.get(quiz.id) is None
+
+
+@pytest.mark.asyncio
+async def test_search_skips_hidden_rows_and_pages_by_cursor(users, companies, session):
+    owner = await make_user(users, session, 1)
+    listed = [
+        await make_company(companies, session, owner, f"Acme {n}") for n in range(3)
+    ]
+    hidden = await make_company(companies, session, owner, "Acme hidden")
+    hidden.is_public = False
+    deleted = await make_company(companies, session, owner, "Acme deleted")
+    deleted.deleted_at = deleted.created_at
+    described = await make_company(companies, session, owner, "Globex")
+    described.description = "acme subsidiary"
+
+    first = await companies.search_companies("acme", session, limit=2)
+    second = await companies.search_companies(
+        "acme", session, limit=2, cursor=first.next_cursor
+    )
+
+    assert second.next_cursor is None
+    found = [company.id for company in first.items + second.items]
+    assert sorted(found[:3]) == sorted(company.id for company in listed)
+    assert found[3] == described.id
+
+    inactive = await make_user(users, session, 2)
+    inactive.is_active = False
+    page = await users.search_users("USER", session)
+    assert [user.id for user in page.items] == [owner.id]
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_random_membership_scenarios_keep_counters_consistent(
+    users, companies, store, session
+):
+    rng = random.Random(1234)
+    people = [await make_user(users, session, n) for n in range(60)]
+    owned = [
+        await make_company(companies, session, people[n], f"c{n}") for n in range(6)
+    ]
+
+    for _ in range(2000):
+        company = rng.choice(owned)
+        owner_id = next(
+            user_id
+            for user_id, role in store.roles_by_company[company.id].items()
+            if role.role == RoleEnum.OWNER
+        )
+        owner = store.users[owner_id]
+        sample = [user.id for user in rng.sample(people, 5)]
+        action = rng.randrange(4)
+        if action == 0:
+            await companies.bulk_invite_send(
+                BulkInviteSchema(company_id=company.id, user_ids=sample), owner, session
+            )
+            for invite in list(store.invites_by_company[company.id]):
+                if invite.status == "pending" and rng.random() < 0.5:
+                    await users.invite_user_switcher(
+                        invite.id,
+                        rng.choice(["accepted", "declined"]),
+                        store.users[invite.invited_user_id],
+                        session,
+                    )
+        elif action == 1:
+            await companies.bulk_admin_change(
+                rng.choice(["add", "remove"]),
+                BulkMembersSchema(company_id=company.id, user_ids=sample),
+                owner,
+                session,
+            )
+        elif action == 2:
+            role = store.roles_by_company[company.id].get(rng.choice(sample))
+            if role is not None and role.role == RoleEnum.MEMBER:
+                await companies.remove_user_by_owner(
+                    role.user_id, company.id, owner, session
+                )
+        else:
+            role = store.roles_by_company[company.id].get(rng.choice(sample))
+            if role is not None and role.role != RoleEnum.OWNER:
+                await users.leave_user(company.id, store.users[role.user_id], session)
+
+    assert_counters_match_roles(store)
+    for company in owned:
+        pending = [
+            (invite.invited_user_id, invite.type)
+            for invite in store.invites_by_company[company.id]
+            if invite.status == "pending"
+        ]
+        assert len(pending) == len(set(pending))
@@ -1,20 +1,24 @@
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
-from app.core.base_exception import (
+from app.core.company_exceptions import (
     CompanyNotFoundError,
-    InvalidCredentialsError,
+    NotCompanyMemberError,
+    OwnerCannotLeaveError,
+)
+from app.core.invites_exceptions import (
     InviteInvalidOptionError,
     InviteNotFoundError,
     InvitePermissionDeniedError,
-    NotCompanyMemberError,
-    OwnerCannotLeaveError,
+)
+from app.core.requests_exceptions import (
     RequestPermissionDeniedError,
     RequestWrongTypeError,
 )
+from app.core.users_exceptions import InvalidCredentialsError
 from app.models.company_invite_request_model import InviteStatus, InviteType
 from app.models.company_user_role_model import RoleEnum
 from app.schemas.user_schema import SignInSchema, SignUpSchema, UserUpdateSchema
@@ -37,12 +41,29 @@ async def test_create_user(user_service, mock_repo, mock_session, fake_user):
 @pytest.mark.asyncio
 async def test_delete_user_success(user_service, mock_repo, mock_session, fake_user):
     mock_repo.get.return_value = fake_user
-    mock_repo.delete.return_value = None
     current_user = SimpleNamespace(id=fake_user.id)
 
-    await user_service.delete_user(mock_session, current_user)
+    with patch("app.services.users_service.purge_progress", AsyncMock()), patch(
+        "app.services.users_service.job_queue.enqueue", AsyncMock()
+    ) as enqueue:
+        await user_service.delete_user(mock_session, current_user)
 
-    mock_repo.delete.assert_awaited_once_with(mock_session, fake_user)
+    mock_repo.deactivate_user.assert_awaited_once_with(mock_session, fake_user)
+    mock_repo.delete.assert_not_awaited()
+    enqueue.assert_awaited_once_with("purge_user", {"user_id": fake_user.id})
+
+
+@pytest.mark.asyncio
+async def test_login_rejects_deactivated_user(
+    user_service, mock_repo, mock_session, fake_user
+):
+    fake_user.is_active = False
+    mock_repo.get_by_email.return_value = fake_user
+
+    with pytest.raises(InvalidCredentialsError):
+        await user_service.login_user(
+            {"email": fake_user.email, "password": "123456"}, mock_session
+        )
 
 
 @pytest.mark.asyncio
@@ -271,7 +292,7 @@ async def test_leave_user_success(user_service, mock_repo, mock_session, fake_us
         MagicMock(company_id=uuid4()), fake_user, mock_session
     )
 
-    mock_repo.delete_user_role.assert_called_once()
+    mock_repo.leave_company.assert_called_once()
     assert "successfully left" in result["message"].lower()
 
 
@@ -295,7 +316,7 @@ async def test_leave_user_last_owner_forbidden(
 ):
     mock_repo.get_user_role.return_value = MagicMock(role=RoleEnum.OWNER)
 
-    mock_repo.get_users_with_roles.return_value = [("user", RoleEnum.OWNER)]
+    mock_repo.leave_company.return_value = False
 
     with pytest.raises(OwnerCannotLeaveError) as exc:
         await user_service.leave_user(
@@ -305,3 +326,16 @@ async def test_leave_user_last_owner_forbidden(
         )
 
     assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_leave_user_owner_with_co_owner(
+    user_service, mock_repo, mock_session, fake_user
+):
+    mock_repo.get_user_role.return_value = MagicMock(role=RoleEnum.OWNER)
+    mock_repo.leave_company.return_value = True
+
+    result = await user_service.leave_user(uuid4(), fake_user, mock_session)
+
+    mock_repo.leave_company.assert_awaited_once()
+    assert "successfully left" in result["message"].lower()
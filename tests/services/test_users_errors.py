@@ -3,7 +3,7 @@ from uuid import uuid4
 
 import pytest
 
-from app.core.base_exception import EmailChangeForbiddenError, UserNotFoundError
+from app.core.users_exceptions import EmailChangeForbiddenError, UserNotFoundError
 from app.schemas.user_schema import UserUpdateSchema
 
 
@@ -0,0 +1,226 @@
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.quiz_exceptions import AlreadyAnsweredException
+from app.jobs.answer_buffer import AppendOutcome, BufferedAnswer
+from app.jobs.answer_flusher import AnswerFlusher
+from app.repository.in_memory_repository import (
+    InMemoryCompaniesRepository,
+    InMemorySession,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from app.schemas.company_schema import CompanyCreate, QuizCreate
+from app.schemas.user_schema import AnswerUserSchema
+from app.services.companies_service import CompaniesService
+from app.services.users_service import UserService
+
+
+class FakeBuffer:
+    """In-memory stand-in for AnswerBuffer."""
+
+    def __init__(self, max_buffered: int = 100):
+        self.max_buffered = max_buffered
+        self.pending: list[tuple[str, BufferedAnswer]] = []
+        self.seen: set[tuple] = set()
+        self.acked: list[str] = []
+        self.dead: list[tuple[str, str]] = []
+        self.ids = 0
+
+    async def append(self, answer: BufferedAnswer) -> AppendOutcome:
+        if (answer.user_id, answer.question_id) in self.seen:
+            return AppendOutcome.DUPLICATE
+        if len(self.pending) >= self.max_buffered:
+            return AppendOutcome.FULL
+        self.seen.add((answer.user_id, answer.question_id))
+        self.ids += 1
+        self.pending.append((f"{self.ids}-0", answer))
+        return AppendOutcome.BUFFERED
+
+    async def claim_stale(self, consumer, idle_ms, count):
+        return []
+
+    async def read(self, consumer, count, block_ms):
+        entries, self.pending = self.pending[:count], self.pending[count:]
+        return entries
+
+    async def ack(self, entry_ids):
+        self.acked.extend(entry_ids)
+
+    async def dead_letter(self, entry_id, answer, error):
+        self.seen.discard((answer.user_id, answer.question_id))
+        self.dead.append((entry_id, error))
+
+    async def lag(self):
+        return len(self.pending), 0.0
+
+
+@pytest.fixture
+def store():
+    return InMemoryStore()
+
+
+@pytest.fixture
+def buffer():
+    return FakeBuffer()
+
+
+@pytest.fixture
+def flusher(store, buffer):
+    @asynccontextmanager
+    async def session_factory():
+        yield InMemorySession()
+
+    with patch(
+        "app.jobs.answer_flusher.RedisQuizService.save_quiz_answers", AsyncMock()
+    ):
+        yield AnswerFlusher(
+            buffer, InMemoryUserRepository(store), session_factory, batch_size=10
+        )
+
+
+@pytest.fixture
+def quiz(store):
+    """An owner of a company with a two-question quiz."""
+
+    async def make():
+        session = InMemorySession()
+        users = UserService(InMemoryUserRepository(store))
+        companies = CompaniesService(InMemoryCompaniesRepository(store))
+        owner = await users.repo.create(
+            session, {"name": "owner", "email": "owner@example.com", "password": "x"}
+        )
+        company = (
+            await companies.company_create(
+                CompanyCreate(name="Acme", description="d", is_public=True),
+                session,
+                owner,
+            )
+        )["company"]
+        quiz = await companies.company_create_quiz(
+            company.id,
+            QuizCreate(
+                title="Quiz",
+                description="d",
+                questions=[
+                    {"title": "q1", "options": ["a", "b"], "correct_answers": [0]},
+                    {"title": "q2", "options": ["a", "b"], "correct_answers": [1]},
+                ],
+            ),
+            owner,
+            session,
+        )
+        return users, owner, quiz, list(store.questions_by_quiz[quiz.id].values())
+
+    return make
+
+
+def write_behind(buffer):
+    return (
+        patch("app.services.users_service.answers_settings.ANSWERS_WRITE_BEHIND", True),
+        patch("app.services.users_service.answer_buffer", buffer),
+        patch(
+            "app.services.users_service.RedisQuizService.save_quiz_answer", AsyncMock()
+        ),
+    )
+
+
+async def answer(users, owner, quiz, question, selected):
+    await users.question_answer_by_user(
+        question.id,
+        quiz.id,
+        AnswerUserSchema(selected_options=selected),
+        owner,
+        InMemorySession(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_buffered_answers_are_written_by_the_flusher(
+    store, buffer, flusher, quiz
+):
+    users, owner, quiz, (q1, q2) = await quiz()
+    flag, patched_buffer, cache = write_behind(buffer)
+    with flag, patched_buffer, cache:
+        await answer(users, owner, quiz, q1, [0])
+        await answer(users, owner, quiz, q2, [0])
+        with pytest.raises(AlreadyAnsweredException):
+            await answer(users, owner, quiz, q1, [1])
+
+    assert store.answers_by_user[owner.id] == {}
+    entries = list(buffer.pending)
+
+    assert await flusher.poll() == 2
+
+    assert buffer.acked == [entry_id for entry_id, _ in entries]
+    assert await users.get_my_statistic(InMemorySession(), owner.id) == 50.0
+    # A batch replayed after a crash between commit and ack writes nothing new.
+    await flusher.flush(entries)
+    assert len(store.answers_by_user[owner.id]) == 2
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_falls_back_to_a_direct_write(store, flusher, quiz):
+    users, owner, quiz, (q1, _) = await quiz()
+    full = FakeBuffer(max_buffered=0)
+    flag, patched_buffer, cache = write_behind(full)
+    with flag, patched_buffer, cache:
+        await answer(users, owner, quiz, q1, [0])
+
+    assert full.pending == []
+    assert q1.id in store.answers_by_user[owner.id]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_buffer_falls_back_to_a_direct_write(store, flusher, quiz):
+    users, owner, quiz, (q1, _) = await quiz()
+    down = FakeBuffer()
+    down.append = AsyncMock(side_effect=RedisConnectionError("Connection refused"))
+    flag, patched_buffer, cache = write_behind(down)
+    with flag, patched_buffer, cache as save_quiz_answer:
+        await answer(users, owner, quiz, q1, [0])
+
+    assert q1.id in store.answers_by_user[owner.id]
+    # Redis just failed; the answer is saved, so the cache write is skipped.
+    save_quiz_answer.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unwritable_answer_is_dead_lettered_and_the_rest_flushed(
+    store, buffer, flusher, quiz
+):
+    users, owner, quiz, (q1, q2) = await quiz()
+    flag, patched_buffer, cache = write_behind(buffer)
+    with flag, patched_buffer, cache:
+        await answer(users, owner, quiz, q1, [0])
+        await answer(users, owner, quiz, q2, [1])
+    # The second question disappears before the flush.
+    store.questions.pop(q2.id)
+    repeat = buffer.pending[0][1]
+    buffer.pending.append(("99-0", repeat))
+
+    await flusher.poll()
+
+    assert list(store.answers_by_user[owner.id]) == [q1.id]
+    assert [entry_id for entry_id, _ in buffer.dead] == ["2-0"]
+    assert sorted(buffer.acked) == ["1-0", "99-0"]
+    assert (owner.id, q2.id) not in buffer.seen
+
+
+def test_buffered_answer_json_round_trip():
+    answer = BufferedAnswer(
+        user_id=uuid.uuid4(),
+        company_id=uuid.uuid4(),
+        quiz_id=uuid.uuid4(),
+        version_id=uuid.uuid4(),
+        question_id=uuid.uuid4(),
+        selected_answers=[0, 2],
+        is_correct=False,
+    )
+
+    assert BufferedAnswer.from_json(answer.to_json()) == answer
+    assert answer.answer_row()["quiz_result_id"] == answer.result_row()["id"]
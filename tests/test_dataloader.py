@@ -0,0 +1,116 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.utils.dataloader import DataLoader
+
+
+class RecordingBatch:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.fail:
+            raise RuntimeError("db is down")
+        return {key: f"value-{key}" for key in keys if key != "missing"}
+
+
+@pytest.mark.asyncio
+async def test_loads_in_same_tick_are_batched():
+    batch = RecordingBatch()
+    loader = DataLoader(batch)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert results == ["value-1", "value-2", "value-1"]
+    assert batch.calls == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_per_loader():
+    batch = RecordingBatch()
+    loader = DataLoader(batch)
+
+    await loader.load_many([1, 2])
+    assert await loader.load_many([2, 1, 3]) == ["value-2", "value-1", "value-3"]
+
+    assert batch.calls == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_missing_and_none_keys_resolve_to_none():
+    batch = RecordingBatch()
+    loader = DataLoader(batch)
+
+    assert await loader.load_many(["missing", None]) == [None, None]
+    assert batch.calls == [["missing"]]
+
+
+@pytest.mark.asyncio
+async def test_primed_keys_skip_the_batch():
+    batch = RecordingBatch()
+    loader = DataLoader(batch)
+    loader.prime(1, "primed")
+
+    assert await loader.load(1) == "primed"
+    assert batch.calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_cached():
+    batch = RecordingBatch(fail=True)
+    loader = DataLoader(batch)
+
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+
+    batch.fail = False
+    assert await loader.load(1) == "value-1"
+
+
+@pytest.mark.asyncio
+async def test_pending_dispatch_is_kept_until_done():
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def batch(keys):
+        started.set()
+        await release.wait()
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch)
+    load = asyncio.ensure_future(loader.load(1))
+    await started.wait()
+    gc.collect()
+
+    assert len(loader._dispatches) == 1
+    release.set()
+    assert await load == 1
+    assert not loader._dispatches
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_does_not_break_its_batch():
+    release = asyncio.Event()
+    batch = RecordingBatch()
+
+    async def slow_batch(keys):
+        await release.wait()
+        return await batch(keys)
+
+    loader = DataLoader(slow_batch)
+    cancelled = asyncio.ensure_future(loader.load(1))
+    other = asyncio.ensure_future(loader.load(2))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await asyncio.wait_for(other, timeout=1) == "value-2"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await loader.load(1) == "value-1"
+    assert batch.calls == [[1, 2], [1]]
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import health
+from app.services.health_service import HealthMonitor, ProbeResult
+
+
+async def ok_probe():
+    await asyncio.sleep(0.05)
+
+
+async def slow_probe():
+    await asyncio.sleep(1)
+
+
+async def failing_probe():
+    raise ConnectionError("refused")
+
+
+@pytest.mark.asyncio
+async def test_probes_run_concurrently_with_timeouts():
+    monitor = HealthMonitor(
+        probes={"a": ok_probe, "b": ok_probe, "slow": slow_probe, "bad": failing_probe},
+        timeout=0.2,
+    )
+
+    started_at = time.perf_counter()
+    results = await monitor.probe_once()
+
+    assert time.perf_counter() - started_at < 0.5
+    assert results["a"].ok and results["b"].ok
+    assert "timed out" in results["slow"].error
+    assert "refused" in results["bad"].error
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["a"]["ok"] and not report["slow"]["ok"]
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_first_probe_or_when_stale():
+    monitor = HealthMonitor(probes={"a": ok_probe}, stale_after=10)
+    assert monitor.readiness()[0] is False
+
+    await monitor.probe_once()
+    assert monitor.readiness()[0] is True
+
+    monitor.results["a"] = ProbeResult(
+        ok=True, latency_ms=1, checked_at=time.monotonic() - 60
+    )
+    ready, report = monitor.readiness()
+    assert ready is False
+    assert report["a"]["error"] == "stale result"
+
+
+@pytest.mark.asyncio
+async def test_background_loop_is_live_until_stopped():
+    monitor = HealthMonitor(probes={"a": ok_probe}, interval=0.01)
+    assert not monitor.is_live()
+
+    monitor.start()
+    await asyncio.sleep(0.1)
+    assert monitor.is_live()
+    assert monitor.readiness()[0] is True
+
+    await monitor.stop()
+    assert not monitor.is_live()
+
+
+def test_endpoints_serve_cached_state(monkeypatch):
+    monitor = HealthMonitor(probes={"postgres": ok_probe, "redis": failing_probe})
+    monkeypatch.setattr(health, "health_monitor", monitor)
+    app = FastAPI()
+    app.include_router(health.router)
+    client = TestClient(app)
+
+    assert client.get("/health/live").status_code == 503
+    assert client.get("/health/ready").status_code == 503
+
+    asyncio.run(monitor.probe_once())
+    monitor.results["redis"] = monitor.results["postgres"]
+    monkeypatch.setattr(monitor, "is_live", lambda: True)
+
+    assert client.get("/health/live").status_code == 200
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200
+    assert resp.json()["checks"]["redis"]["ok"] is True
@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core import idempotency_middleware as idempotency
+from app.core.idempotency_middleware import IdempotencyStore
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def make_app(monkeypatch) -> tuple[FastAPI, dict]:
+    monkeypatch.setattr(idempotency, "idempotency_store", IdempotencyStore(FakeRedis()))
+    calls = {"count": 0}
+    app = FastAPI()
+    app.middleware("http")(idempotency.idempotency_middleware)
+
+    @app.post("/users/me/request")
+    async def send_request(payload: dict):
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        if payload.get("fail"):
+            return JSONResponse(status_code=500, content={"detail": "boom"})
+        if payload.get("status"):
+            return JSONResponse(status_code=payload["status"], content={})
+        return {"n": calls["count"], "payload": payload}
+
+    @app.post("/users/login")
+    async def login(payload: dict):
+        calls["count"] += 1
+        return {"n": calls["count"]}
+
+    return app, calls
+
+
+def client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+HEADERS = {"Idempotency-Key": "k1", "Authorization": "Bearer a"}
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(monkeypatch):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        first = await c.post("/users/me/request", json={"x": 1}, headers=HEADERS)
+        second = await c.post("/users/me/request", json={"x": 1}, headers=HEADERS)
+
+    assert calls["count"] == 1
+    assert second.status_code == first.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_the_first(monkeypatch):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        responses = await asyncio.gather(
+            *(
+                c.post("/users/me/request", json={"x": 1}, headers=HEADERS)
+                for _ in range(5)
+            )
+        )
+
+    assert calls["count"] == 1
+    assert {r.json()["n"] for r in responses} == {1}
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_other_body_is_rejected(monkeypatch):
+    app, _ = make_app(monkeypatch)
+    async with client(app) as c:
+        await c.post("/users/me/request", json={"x": 1}, headers=HEADERS)
+        resp = await c.post("/users/me/request", json={"x": 2}, headers=HEADERS)
+
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_other_query_is_rejected(monkeypatch):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        await c.post("/users/me/request?b=2&a=1", json={"x": 1}, headers=HEADERS)
+        same = await c.post("/users/me/request?a=1&b=2", json={"x": 1}, headers=HEADERS)
+        other = await c.post(
+            "/users/me/request?a=1&b=3", json={"x": 1}, headers=HEADERS
+        )
+
+    assert same.headers["Idempotent-Replayed"] == "true"
+    assert other.status_code == 422
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_and_other_callers_are_not_replayed(monkeypatch):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        for _ in range(2):
+            resp = await c.post(
+                "/users/me/request", json={"fail": True}, headers=HEADERS
+            )
+            assert resp.status_code == 500
+        await c.post(
+            "/users/me/request",
+            json={"x": 1},
+            headers={**HEADERS, "Authorization": "Bearer b"},
+        )
+
+    assert calls["count"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [408, 409, 429])
+async def test_transient_client_errors_are_not_replayed(monkeypatch, status):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        for _ in range(2):
+            resp = await c.post(
+                "/users/me/request", json={"status": status}, headers=HEADERS
+            )
+            assert resp.status_code == status
+            assert "Idempotent-Replayed" not in resp.headers
+
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_without_key_or_on_other_routes_pass_through(monkeypatch):
+    app, calls = make_app(monkeypatch)
+    async with client(app) as c:
+        await c.post("/users/me/request", json={"x": 1})
+        await c.post("/users/me/request", json={"x": 1})
+        await c.post("/users/login", json={}, headers=HEADERS)
+        await c.post("/users/login", json={}, headers=HEADERS)
+
+    assert calls["count"] == 4
@@ -0,0 +1,17 @@
+import os
+from pathlib import Path
+
+import app
+from app.scripts.import_time import DEFAULT_BUDGET_MS, measure, total_ms
+
+ROOT = Path(app.__file__).resolve().parents[1]
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+
+def test_app_import_stays_within_budget_and_skips_lazy_modules(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "LOG_FILE": str(tmp_path / "app.log")}
+
+    timings, loaded = measure("app.main", env=env, cwd=str(tmp_path))
+
+    assert loaded == set()
+    assert total_ms(timings, "app.main") < BUDGET_MS
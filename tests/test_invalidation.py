@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from app.db import invalidation
+from app.db.invalidation import (
+    EVERYTHING,
+    InvalidationBus,
+    InvalidationListener,
+    invalidation_payload,
+    publish_invalidation,
+)
+from app.utils.local_cache import LocalCache
+
+
+def make_bus() -> tuple[InvalidationBus, LocalCache, LocalCache]:
+    bus = InvalidationBus()
+    quizzes = bus.register(LocalCache("quiz"))
+    questions = bus.register(LocalCache("question"))
+    for n in range(3):
+        quizzes.set(n, f"quiz{n}")
+        questions.set(n, f"question{n}")
+    return bus, quizzes, questions
+
+
+def test_local_cache_expires_and_stays_bounded(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr("app.utils.local_cache.time.monotonic", lambda: now)
+    cache = LocalCache("t", max_size=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+    now = 111.0
+    assert cache.get("a") is None
+
+
+def test_bus_applies_key_namespace_and_bad_payloads():
+    bus, quizzes, questions = make_bus()
+
+    bus.apply(json.dumps({"ns": "quiz", "keys": ["1"]}))
+    assert quizzes.get(1) is None and quizzes.get(0) == "quiz0"
+
+    bus.apply(json.dumps({"ns": "question", "keys": [EVERYTHING]}))
+    assert len(questions) == 0 and len(quizzes) == 2
+
+    bus.apply("not json")
+    assert len(quizzes) == 0
+
+
+def test_oversized_payload_flushes_the_namespace():
+    payload = json.loads(
+        invalidation_payload("quiz", [str(n) * 40 for n in range(500)])
+    )
+    assert payload == {"ns": "quiz", "keys": [EVERYTHING]}
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+@pytest.mark.asyncio
+async def test_publish_notifies_in_transaction_and_evicts_locally(monkeypatch):
+    bus, quizzes, _ = make_bus()
+    monkeypatch.setattr(invalidation, "invalidation_bus", bus)
+    session = RecordingSession()
+
+    await publish_invalidation(session, "quiz", 2)
+
+    compiled = session.statements[0].compile()
+    assert "pg_notify" in str(compiled)
+    assert json.loads(list(compiled.params.values())[1]) == {
+        "ns": "quiz",
+        "keys": ["2"],
+    }
+    assert quizzes.get(2) is None
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def notify(self, payload):
+        self.listeners[invalidation.CHANNEL](self, 1, invalidation.CHANNEL, payload)
+
+    def terminate(self):
+        self.closed = True
+        self.on_terminate(self)
+
+
+@pytest.mark.asyncio
+async def test_listener_applies_notifications_and_flushes_after_reconnect(
+    monkeypatch,
+):
+    bus, quizzes, _ = make_bus()
+    connections = []
+
+    async def connect(dsn):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(invalidation.asyncpg, "connect", connect)
+    listener = InvalidationListener(
+        "postgresql://x", bus, keepalive=0.01, retry_delay=0.001
+    )
+    listener.start()
+    await asyncio.sleep(0.02)
+
+    assert listener.connected and len(quizzes) == 0
+    quizzes.set(1, "quiz1")
+    quizzes.set(2, "quiz2")
+    connections[0].notify(json.dumps({"ns": "quiz", "keys": ["1"]}))
+    assert quizzes.get(1) is None and quizzes.get(2) == "quiz2"
+
+    connections[0].terminate()
+    await asyncio.sleep(0.02)
+    assert len(connections) == 2
+    assert len(quizzes) == 0
+
+    await listener.stop()
+    assert not listener.connected
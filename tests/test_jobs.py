@@ -0,0 +1,164 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.jobs import tasks
+from app.jobs.queue import Job
+from app.jobs.registry import JobSpec
+from app.jobs.worker import JobWorker, backoff_delay
+
+
+class FakeQueue:
+    """In-memory stand-in for JobQueue: retries are due immediately."""
+
+    def __init__(self):
+        self.pending: list[Job] = []
+        self.acked: list[Job] = []
+        self.retried: list[tuple[Job, float]] = []
+        self.dead: list[tuple[Job, str]] = []
+        self.ids = 0
+
+    async def enqueue(self, name: str, payload: dict) -> str:
+        self.ids += 1
+        self.pending.append(Job(str(self.ids), name, payload, 0, time.time()))
+        return str(self.ids)
+
+    async def ensure_group(self):
+        pass
+
+    async def promote_due(self) -> int:
+        return 0
+
+    async def claim_stale(self, consumer, idle_ms, count):
+        return []
+
+    async def read(self, consumer, count, block_ms):
+        jobs, self.pending = self.pending[:count], self.pending[count:]
+        if not jobs:
+            await asyncio.sleep(block_ms / 1000)
+        return jobs
+
+    async def ack(self, job):
+        self.acked.append(job)
+
+    async def retry(self, job, delay):
+        self.retried.append((job, delay))
+        self.pending.append(
+            Job(job.id, job.name, job.payload, job.attempt + 1, time.time())
+        )
+
+    async def dead_letter(self, job, error):
+        self.dead.append((job, error))
+
+
+async def drain(worker: JobWorker, queue: FakeQueue):
+    while queue.pending or worker.running:
+        await worker.poll()
+
+
+@pytest.mark.asyncio
+async def test_successful_job_receives_payload_and_is_acked():
+    seen = []
+
+    async def greet(name):
+        seen.append(name)
+
+    queue = FakeQueue()
+    worker = JobWorker(queue, {"greet": JobSpec("greet", greet, 3, 1)}, block_ms=1)
+    await queue.enqueue("greet", {"name": "ann"})
+
+    await drain(worker, queue)
+
+    assert seen == ["ann"]
+    assert [job.name for job in queue.acked] == ["greet"]
+
+
+@pytest.mark.asyncio
+async def test_failing_job_retries_with_backoff_then_dead_letters():
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("nope")
+
+    queue = FakeQueue()
+    worker = JobWorker(queue, {"flaky": JobSpec("flaky", flaky, 3, 1)}, block_ms=1)
+    await queue.enqueue("flaky", {})
+
+    await drain(worker, queue)
+
+    assert calls == 3
+    assert [job.attempt for job, _ in queue.retried] == [0, 1]
+    assert all(delay > 0 for _, delay in queue.retried)
+    assert len(queue.dead) == 1 and "nope" in queue.dead[0][1]
+    assert queue.acked == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_timed_out_jobs_fail():
+    async def slow():
+        await asyncio.sleep(1)
+
+    queue = FakeQueue()
+    worker = JobWorker(queue, {"slow": JobSpec("slow", slow, 1, 0.01)}, block_ms=1)
+    await queue.enqueue("slow", {})
+    await queue.enqueue("missing", {})
+
+    await drain(worker, queue)
+
+    assert sorted(job.name for job, _ in queue.dead) == ["missing", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_drain_on_stop():
+    running = peak = done = 0
+
+    async def work():
+        nonlocal running, peak, done
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        done += 1
+
+    queue = FakeQueue()
+    worker = JobWorker(
+        queue, {"work": JobSpec("work", work, 1, 1)}, concurrency=2, block_ms=1
+    )
+    for _ in range(6):
+        await queue.enqueue("work", {})
+
+    stop = asyncio.Event()
+    runner = asyncio.create_task(worker.run(stop))
+    await asyncio.sleep(0.03)
+    stop.set()
+    await runner
+
+    assert peak == 2
+    assert done == len(queue.acked) >= 2
+    assert not worker.running
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    assert 0.5 <= backoff_delay(0, base=1, cap=100) <= 1
+    assert 4 <= backoff_delay(3, base=1, cap=100) <= 8
+    assert backoff_delay(20, base=1, cap=100) <= 100
+
+
+@pytest.mark.asyncio
+async def test_unfinished_purge_enqueues_its_continuation():
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    company_id = "6f1c2b0e-8d3a-4f4e-9b8f-0a1b2c3d4e5f"
+
+    with patch.object(tasks, "AsyncSessionLocal", return_value=session), patch.object(
+        tasks.companies_service, "company_purge", AsyncMock(side_effect=[False, True])
+    ), patch.object(tasks.job_queue, "enqueue", AsyncMock()) as enqueue:
+        await tasks.purge_company(company_id)
+        await tasks.purge_company(company_id)
+
+    enqueue.assert_awaited_once_with("purge_company", {"company_id": company_id})
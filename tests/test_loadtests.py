@@ -0,0 +1,104 @@
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from loadtests.dataset import LoadDataset
+from loadtests.runner import (
+    Scenario,
+    find_regressions,
+    percentile,
+    run_scenario,
+    save_baselines,
+)
+from loadtests.scenarios import search
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0.0
+
+
+def test_find_regressions_respects_tolerance():
+    baseline = {
+        "p50_ms": 10,
+        "p95_ms": 50,
+        "p99_ms": 100,
+        "throughput_rps": 200,
+        "errors": 0,
+    }
+    within = {**baseline, "p99_ms": 115, "throughput_rps": 170}
+    slower = {**baseline, "p95_ms": 70, "throughput_rps": 150, "errors": 2}
+
+    assert find_regressions(within, baseline, tolerance=0.2) == []
+    assert find_regressions(slower, baseline, tolerance=0.2) == [
+        "p95_ms 50 -> 70",
+        "throughput_rps 200 -> 150",
+        "errors 0 -> 2",
+    ]
+
+
+def test_save_baselines_merges_scenarios(tmp_path):
+    path = tmp_path / "baselines.json"
+
+    save_baselines(path, {"login_storm": {"p50_ms": 1}})
+    save_baselines(path, {"exam_start": {"p50_ms": 2}})
+
+    assert path.read_text().count("p50_ms") == 2
+
+
+@pytest.mark.asyncio
+async def test_run_scenario_reports_per_endpoint_stats():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {}
+
+    async def flow(client, user, index):
+        await client.request("GET /ok", "GET", "/ok")
+        await client.request("GET /missing", "GET", "/missing", expected=(404,))
+        await client.request("GET /nope", "GET", "/nope")
+
+    scenario = Scenario("smoke", "", flow, iterations=3)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        report = await run_scenario(scenario, client, users := list(range(4)))
+
+    summary = report.summary()
+    assert summary["virtual_users"] == len(users)
+    assert summary["requests"] == 36
+    assert summary["errors"] == 12
+    assert summary["endpoints"]["GET /ok"]["errors"] == 0
+    assert summary["endpoints"]["GET /nope"]["errors"] == 12
+
+
+@pytest.mark.asyncio
+async def test_search_scenario_survives_shed_requests():
+    app = FastAPI()
+
+    @app.get("/companies/search")
+    async def shed():
+        return PlainTextResponse("Service Unavailable", status_code=503)
+
+    @app.get("/users/search")
+    async def users():
+        return {"items": [], "next_cursor": None}
+
+    dataset = LoadDataset("run", [], [], [uuid.uuid4()], uuid.uuid4())
+    scenario, _ = search(dataset)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        report = await run_scenario(scenario, client, [None, None])
+
+    summary = report.summary()
+    assert summary["endpoints"]["GET /companies/search"]["errors"] == 10
+    assert summary["endpoints"]["GET /users/search"]["errors"] == 0
@@ -0,0 +1,92 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.core.logger import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    configure_logging,
+    request_id_var,
+    stop_logging,
+)
+from app.core.logging_config import LoggingSettings
+
+
+def make_record(level=logging.INFO, name="app.test", msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_captures_request_id_and_renders_message():
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue)
+    token = request_id_var.set("req-1")
+    try:
+        handler.emit(make_record())
+    finally:
+        request_id_var.reset(token)
+
+    record = log_queue.get_nowait()
+    assert record.request_id == "req-1"
+    assert record.msg == "hello world"
+    assert record.args is None
+
+
+def test_queue_handler_drops_instead_of_blocking_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.emit(make_record())
+    handler.emit(make_record())
+
+    assert handler.dropped == 1
+
+
+def test_json_formatter_includes_extra_fields_and_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+    record.request_id = "req-2"
+    record.status = 500
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "failed"
+    assert entry["level"] == "ERROR"
+    assert entry["request_id"] == "req-2"
+    assert entry["status"] == 500
+    assert "ValueError: boom" in entry["exc"]
+
+
+@pytest.mark.parametrize(
+    "level, name, expected",
+    [
+        (logging.INFO, "app.test", False),
+        (logging.WARNING, "app.test", True),
+        (logging.INFO, "app.audit", True),
+    ],
+)
+def test_sampling_filter(level, name, expected):
+    sampler = SamplingFilter(rate=0.0, per_logger={"app.audit": 1.0})
+
+    assert sampler.filter(make_record(level=level, name=name)) is expected
+
+
+def test_without_a_log_file_records_go_to_stdout_and_stop_is_idempotent():
+    root = logging.getLogger()
+    before = list(root.handlers)
+    listener = configure_logging(LoggingSettings(LOG_FILE=""))
+    try:
+        assert [type(handler) for handler in listener.handlers] == [
+            logging.StreamHandler
+        ]
+    finally:
+        stop_logging(listener)
+        stop_logging(listener)
+        for handler in root.handlers[len(before) :]:
+            root.removeHandler(handler)
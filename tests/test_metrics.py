@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.timing_middleware import timing_middleware
+from app.routers.metrics import router as metrics_router
+from app.utils.dataloader import DataLoader
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.middleware("http")(timing_middleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_requests_are_counted_per_route_template(client):
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = sample("http_requests_total", status="200", **labels)
+    before_latency = sample("http_request_duration_seconds_count", **labels)
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert sample("http_requests_total", status="200", **labels) == before + 2
+    assert sample("http_request_duration_seconds_count", **labels) == (
+        before_latency + 2
+    )
+
+
+def test_metrics_endpoint_renders_prometheus_text(client):
+    client.get("/items/1")
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/items/{item_id}"' in resp.text
+    assert "http_requests_in_flight" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_dataloader_reports_cache_hits_and_misses():
+    async def batch(keys):
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch, name="test-loader")
+    hits = sample("cache_requests_total", cache="test-loader", result="hit")
+    misses = sample("cache_requests_total", cache="test-loader", result="miss")
+
+    await loader.load_many([1, 2])
+    await loader.load(1)
+
+    assert sample("cache_requests_total", cache="test-loader", result="hit") == (
+        hits + 1
+    )
+    assert sample("cache_requests_total", cache="test-loader", result="miss") == (
+        misses + 2
+    )
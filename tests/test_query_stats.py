@@ -0,0 +1,78 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.timing_middleware import timing_middleware
+from app.db.instrumentation import install_query_hooks, statement_shape
+from tests.query_budget import query_budget
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_hooks(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO items (id) VALUES (1), (2), (3)"))
+    yield engine
+    engine.dispose()
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape("SELECT *\n  FROM t WHERE id = $1") == statement_shape(
+        "SELECT * FROM t WHERE id = $7"
+    )
+    assert statement_shape("SELECT * FROM t WHERE id IN ($1, $2)") == statement_shape(
+        "SELECT * FROM t WHERE id IN ($1, $2, $3)"
+    )
+
+
+def test_query_budget_counts_statements(engine):
+    with query_budget(max_queries=2) as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM items"))
+            conn.execute(text("SELECT id FROM items WHERE id = :id"), {"id": 1})
+
+    assert stats.count == 2
+    assert stats.duration > 0
+
+
+def test_query_budget_fails_over_budget(engine):
+    with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+        with query_budget(max_queries=1):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+def test_query_budget_detects_repeated_shape(engine):
+    with pytest.raises(AssertionError, match="repeated 3 times"):
+        with query_budget(max_repeats=2):
+            with engine.connect() as conn:
+                for item_id in (1, 2, 3):
+                    conn.execute(
+                        text("SELECT id FROM items WHERE id = :id"), {"id": item_id}
+                    )
+
+
+def test_timing_middleware_reports_queries(engine):
+    app = FastAPI()
+    app.middleware("http")(timing_middleware)
+
+    @app.get("/items")
+    def items():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM items"))
+            conn.execute(text("SELECT count(*) FROM items"))
+        return {}
+
+    resp = TestClient(app).get("/items")
+
+    assert resp.status_code == 200
+    assert 'desc="2 queries"' in resp.headers["Server-Timing"]
@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.import_exceptions import UnsupportedImportFormatError
+from app.utils.import_util import RowError, import_format, iter_lines, iter_rows
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(aiter):
+    return [item async for item in aiter]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks_and_long_lines_become_errors():
+    lines = await collect(
+        iter_lines(stream(b"one\r\ntw", b"o\n" + b"x" * 20, b"xx\nthree"), 10)
+    )
+
+    assert [no for no, _ in lines] == [1, 2, 3, 4]
+    assert lines[0][1] == "one" and lines[1][1] == "two" and lines[3][1] == "three"
+    assert isinstance(lines[2][1], RowError)
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_use_the_header_and_report_bad_lines():
+    body = b'title,options,correct_answers\n"a, b",x|y,0\n\nonly-one\n'
+
+    rows = await collect(iter_rows(stream(body), "csv"))
+
+    assert rows[0] == (2, {"title": "a, b", "options": "x|y", "correct_answers": "0"})
+    assert rows[1][0] == 4 and isinstance(rows[1][1], RowError)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_rows_reject_non_objects_and_bad_json():
+    rows = await collect(iter_rows(stream(b'{"a": 1}\n[1]\n{oops\n'), "ndjson"))
+
+    assert rows[0] == (1, {"a": 1})
+    assert all(isinstance(row, RowError) for _, row in rows[1:])
+
+
+def test_import_format_from_content_type():
+    assert import_format("text/csv; charset=utf-8") == "csv"
+    assert import_format("application/x-ndjson") == "ndjson"
+    with pytest.raises(UnsupportedImportFormatError):
+        import_format("application/json")
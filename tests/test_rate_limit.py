@@ -0,0 +1,111 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import load_shedding_middleware as shedding
+from app.core.rate_limit_config import RateLimitRule
+from app.core.rate_limit_exceptions import TooManyRequestsError
+from app.db.instrumentation import MovingAverage
+from app.main import app
+from app.utils import rate_limit_util
+from app.utils.rate_limit_util import TokenBucketLimiter
+
+RULES = {
+    "login:user": RateLimitRule(capacity=5, refill_per_second=0.1),
+    "login:ip": RateLimitRule(capacity=30, refill_per_second=0.5),
+}
+
+
+def make_limiter(script) -> TokenBucketLimiter:
+    limiter = TokenBucketLimiter(MagicMock(), RULES)
+    limiter.script = script
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_one_atomic_call_covers_user_and_ip_buckets():
+    script = AsyncMock(return_value=[1, "0"])
+
+    await make_limiter(script).hit("login", "10.0.0.1", "a@b.com")
+
+    script.assert_awaited_once_with(
+        keys=["ratelimit:login:user:a@b.com", "ratelimit:login:ip:10.0.0.1"],
+        args=[1, 5, 0.1, 30, 0.5],
+    )
+
+
+@pytest.mark.asyncio
+async def test_empty_bucket_raises_with_retry_after():
+    limiter = make_limiter(AsyncMock(return_value=[0, "2.250"]))
+
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        await limiter.hit("login", "10.0.0.1", "a@b.com")
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "3"}
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_route_and_redis_outage_let_requests_through():
+    script = AsyncMock(side_effect=RedisConnectionError("down"))
+    limiter = make_limiter(script)
+
+    await limiter.hit("answer", "10.0.0.1", "user")
+    script.assert_not_awaited()
+    await limiter.hit("login", "10.0.0.1", "a@b.com")
+    script.assert_awaited_once()
+
+
+def test_login_route_returns_429_with_retry_after(monkeypatch):
+    script = AsyncMock(return_value=[0, "0.4"])
+    monkeypatch.setattr(rate_limit_util.rate_limiter, "script", script)
+
+    resp = TestClient(app).post(
+        "/users/login", json={"email": "A@B.com", "password": "x"}
+    )
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+    assert script.await_args.kwargs["keys"][0] == "ratelimit:login:user:a@b.com"
+
+
+def test_concurrency_limit_shrinks_under_pool_wait_and_recovers():
+    wait = MovingAverage(alpha=1)
+    limiter = shedding.AdaptiveConcurrencyLimiter(
+        min_limit=2, max_limit=10, wait_threshold=0.1, pool_wait=wait
+    )
+
+    assert all(limiter.try_acquire() for _ in range(10))
+    assert not limiter.try_acquire()
+
+    wait.observe(0.5)
+    for _ in range(10):
+        limiter.release()
+    assert limiter.limit < 4
+    for _ in range(20):
+        assert limiter.try_acquire()
+        limiter.release()
+    assert limiter.limit == 2
+
+    wait.observe(0.0)
+    for _ in range(50):
+        assert limiter.try_acquire()
+        limiter.release()
+    assert limiter.limit > 5
+
+
+def test_saturated_worker_sheds_with_503_but_keeps_health(monkeypatch):
+    limiter = shedding.AdaptiveConcurrencyLimiter(
+        min_limit=1, max_limit=1, wait_threshold=0.1, pool_wait=MovingAverage()
+    )
+    limiter.in_flight = 1
+    monkeypatch.setattr(shedding, "concurrency_limiter", limiter)
+    client = TestClient(app)
+
+    resp = client.get("/users/")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert client.get("/health/live").status_code in (200, 503)
+    assert limiter.in_flight == 1
@@ -0,0 +1,19 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.search_exceptions import InvalidCursorError
+from app.utils.search_util import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    id = uuid4()
+
+    assert decode_cursor(encode_cursor(0.75, id)) == (0.75, id)
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(1, uuid4())[:-4]])
+def test_broken_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
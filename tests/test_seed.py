@@ -0,0 +1,63 @@
+from app.scripts.seed import (
+    COLUMNS,
+    PRESETS,
+    company_children,
+    company_rows,
+    seeded_uuid,
+    user_rows,
+)
+
+PRESET = PRESETS["tiny"]
+
+
+def test_generation_is_deterministic():
+    assert company_children(7, PRESET, 0, 10) == company_children(7, PRESET, 0, 10)
+    assert list(user_rows(7, "hash", 0, 5)) == list(user_rows(7, "hash", 0, 5))
+    assert company_children(7, PRESET, 0, 10) != company_children(8, PRESET, 0, 10)
+
+
+def test_rows_match_copy_columns():
+    tables = company_children(1, PRESET, 0, 10)
+    tables["users"] = list(user_rows(1, "hash", 0, 10))
+    tables["companies"] = list(company_rows(1, PRESET, 0, 10))
+
+    for table, rows in tables.items():
+        assert rows, table
+        assert all(len(row) == len(COLUMNS[table]) for row in rows), table
+
+
+def test_rows_respect_unique_constraints():
+    children = company_children(1, PRESET, 0, PRESET.companies)
+
+    roles = children["company_user_roles"]
+    assert len({(company_id, user_id) for _, user_id, company_id, _ in roles}) == len(
+        roles
+    )
+    pending = [
+        (row[1], row[3], row[4])
+        for row in children["company_invites"]
+        if row[5] == "pending"
+    ]
+    assert len(set(pending)) == len(pending)
+
+
+def test_company_counters_match_roles():
+    companies = list(company_rows(1, PRESET, 0, PRESET.companies))
+    roles = company_children(1, PRESET, 0, PRESET.companies)["company_user_roles"]
+
+    for company in companies:
+        company_roles = [
+            role for _, _, company_id, role in roles if company_id == company[0]
+        ]
+        assert company[4:7] == (
+            company_roles.count("owner"),
+            company_roles.count("admin"),
+            company_roles.count("member"),
+        )
+
+
+def test_role_users_reference_generated_users():
+    user_ids = {seeded_uuid(1, "user", i) for i in range(PRESET.users)}
+    roles = company_children(1, PRESET, 0, PRESET.companies)["company_user_roles"]
+
+    assert {user_id for _, user_id, _, _ in roles} <= user_ids
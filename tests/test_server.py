@@ -0,0 +1,31 @@
+import os
+
+from app.core.app_config import AppConfig
+from app.server import server_options, worker_environ
+
+
+def test_workers_default_to_cpu_count():
+    options = server_options(AppConfig(WORKERS=None))
+
+    assert options["workers"] == (os.cpu_count() or 1)
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "httptools"
+    assert "reload" not in options
+
+
+def test_explicit_server_settings_are_passed_through():
+    options = server_options(
+        AppConfig(
+            WORKERS=3, BACKLOG=128, KEEP_ALIVE_TIMEOUT=15, GRACEFUL_SHUTDOWN_TIMEOUT=7
+        )
+    )
+
+    assert options["workers"] == 3
+    assert options["backlog"] == 128
+    assert options["timeout_keep_alive"] == 15
+    assert options["timeout_graceful_shutdown"] == 7
+
+
+def test_several_workers_log_to_stdout_instead_of_one_shared_file():
+    assert worker_environ(1) == {}
+    assert worker_environ(4) == {"LOG_FILE": "", "LOG_STDOUT": "true"}
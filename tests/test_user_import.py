@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.schemas.user_schema import UserImportReport
+from app.scripts.import_users import batches, hash_passwords, read_chunks, valid_rows
+from app.utils.import_util import iter_rows
+from app.utils.jwt_util import verify_password
+
+CSV = b"""name,email,password,age
+Ann,ann@example.com,secret1,30
+Bob,not-an-email,secret2,31
+Ann again,ann@example.com,secret3,32
+Cid,cid@example.com,short,33
+Dee,dee@example.com,secret4,34
+"""
+
+
+async def collect(aiter):
+    return [item async for item in aiter]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_validated_and_deduplicated_by_email(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_bytes(CSV)
+    report = UserImportReport()
+
+    users = await collect(
+        valid_rows(iter_rows(read_chunks(path, size=7), "csv"), report)
+    )
+
+    assert [user.email for user in users] == ["ann@example.com", "dee@example.com"]
+    assert [error.row for error in report.errors] == [3, 5]
+    assert report.failed == 2 and report.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_keep_every_row():
+    async def numbers():
+        for n in range(7):
+            yield n
+
+    assert await collect(batches(numbers(), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+@pytest.mark.asyncio
+async def test_hash_passwords_keeps_input_order():
+    passwords = [f"password{n}" for n in range(5)]
+
+    with ThreadPoolExecutor(2) as pool:
+        hashed = await hash_passwords(pool, passwords, 2)
+        assert await hash_passwords(pool, [], 2) == []
+
+    assert len(hashed) == 5
+    assert all(map(verify_password, passwords, hashed))
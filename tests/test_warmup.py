@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db import warmup
+from app.main import app
+
+
+class FakeEngine:
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        await asyncio.sleep(0.01)
+        try:
+            yield self
+        finally:
+            self.open -= 1
+
+
+@pytest.mark.asyncio
+async def test_prefill_holds_every_connection_open_together():
+    engine = FakeEngine()
+    warm = AsyncMock()
+
+    await warmup.prefill_db_pool(engine, 4, warm)
+
+    assert engine.peak == 4
+    assert engine.open == 0
+    assert warm.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_prefill_releases_connections_when_one_fails():
+    engine = FakeEngine()
+    calls = 0
+
+    async def warm(conn):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(warmup.prefill_db_pool(engine, 3, warm), 1)
+    await asyncio.sleep(0.05)
+    assert engine.open == 0
+
+
+def test_startup_opens_and_warms_the_configured_connections(monkeypatch):
+    engine = FakeEngine()
+    warm = AsyncMock()
+    monkeypatch.setattr(warmup, "engine", engine)
+    monkeypatch.setattr(warmup, "warm_statements", warm)
+    monkeypatch.setattr(warmup, "prefill_redis_pool", AsyncMock())
+    monkeypatch.setattr("app.main.close_pools", AsyncMock())
+
+    with TestClient(app):
+        expected = min(settings.db.DB_POOL_PREFILL, settings.db.DB_POOL_SIZE)
+        assert engine.peak == expected
+        assert warm.await_count == expected
+        assert {call.args[0] for call in warm.await_args_list} == {engine}